@@ -16,6 +16,7 @@ import binascii
 import cherrypy
 import yaml
 from flask import Response, jsonify, request
+from flexget.utils.requests import http_stats
 from flexget.utils.tools import get_latest_flexget_version_number
 from pyparsing import (
     Word, Keyword, Group, Forward, Suppress, OneOrMore, oneOf, White, restOfLine, ParseException, Combine
@@ -108,6 +109,20 @@ class ObjectsContainer(object):
         }
     }
 
+    http_stats = {
+        'type': 'object',
+        'additionalProperties': {
+            'type': 'object',
+            'properties': {
+                'requests': {'type': 'integer'},
+                'connections': {'type': 'integer'},
+                'reuse_ratio': {'type': 'number'},
+                'waits': {'type': 'integer'},
+                'wait_time': {'type': 'number'}
+            }
+        }
+    }
+
 
 yaml_error_schema = api.schema_model('yaml_error_schema', ObjectsContainer.yaml_error_response)
 config_validation_schema = api.schema_model('config_validation_schema', ObjectsContainer.config_validation_error)
@@ -117,6 +132,7 @@ version_schema = api.schema_model('server.version', ObjectsContainer.version_obj
 dump_threads_schema = api.schema_model('server.dump_threads', ObjectsContainer.dump_threads_object)
 server_manage_schema = api.schema_model('server.manage', ObjectsContainer.server_manage)
 crash_logs_schema = api.schema_model('server.crash_logs', ObjectsContainer.crash_logs)
+http_stats_schema = api.schema_model('server.http_stats', ObjectsContainer.http_stats)
 
 
 @server_api.route('/manage/')
@@ -245,6 +261,14 @@ class ServerVersionAPI(APIResource):
                         'latest_version': latest})
 
 
+@server_api.route('/http_stats/')
+class ServerHTTPStatsAPI(APIResource):
+    @api.response(200, description='HTTP client counters per domain', model=http_stats_schema)
+    def get(self, session=None):
+        """ Get counters of the shared HTTP client """
+        return jsonify(http_stats.snapshot())
+
+
 @server_api.route('/dump_threads/', doc=False)
 class ServerDumpThreads(APIResource):
     @api.response(200, description='Flexget threads dump', model=dump_threads_schema)
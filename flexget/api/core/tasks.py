@@ -319,10 +319,8 @@ class TaskQueueAPI(APIResource):
     @api.response(200, model=task_api_queue_schema)
     def get(self, session=None):
         """ List task(s) in queue for execution """
-        tasks = [_task_info_dict(task) for task in self.manager.task_queue.run_queue.queue]
-
-        if self.manager.task_queue.current_task:
-            tasks.insert(0, _task_info_dict(self.manager.task_queue.current_task))
+        task_queue = self.manager.task_queue
+        tasks = [_task_info_dict(task) for task in task_queue.running_tasks + task_queue.waiting_tasks]
 
         return jsonify(tasks)
 
@@ -27,7 +27,24 @@ class ObjectsContainer(object):
             },
             'connected_channels': {'type': 'array', 'items': {'type': 'string'}},
             'port': {'type': 'integer'},
-            'server': {'type': 'string'}
+            'server': {'type': 'string'},
+            'announce_latency': {
+                'type': 'object',
+                'properties': {
+                    'count': {'type': 'integer'},
+                    'mean': {'type': 'number'},
+                    'max': {'type': 'number'},
+                    'buckets': {
+                        'type': 'array', 'items': {
+                            'type': 'object',
+                            'properties': {
+                                'le': {'type': ['number', 'null']},
+                                'count': {'type': 'integer'}
+                            }
+                        }
+                    }
+                }
+            }
         }
     }
 
@@ -9,7 +9,8 @@ from flask import jsonify, request
 from flask_restplus import inputs
 from flexget.api.app import NotFoundError, etag, pagination_headers, api, APIResource
 from flexget.api.core.tasks import tasks_api
-from flexget.plugins.operate.status import StatusTask, TaskExecution, get_executions_by_task_id, get_status_tasks
+from flexget.plugins.operate.status import StatusTask, TaskExecution, get_executions_by_task_id, get_status_tasks, \
+    get_plugin_timings
 from sqlalchemy.orm.exc import NoResultFound
 
 log = logging.getLogger('status_api')
@@ -51,10 +52,32 @@ class ObjectsContainer(object):
 
     task_status_list_schema = {'type': 'array', 'items': task_status_schema}
 
+    plugin_timing_schema = {
+        'type': 'object',
+        'properties': {
+            'task_id': {'type': 'integer'},
+            'task': {'type': ['string', 'null']},
+            'phase': {'type': 'string'},
+            'plugin': {'type': 'string'},
+            'runs': {'type': 'integer'},
+            'total_time': {'type': 'number'},
+            'mean': {'type': 'number'},
+            'p50': {'type': 'number'},
+            'p95': {'type': 'number'},
+            'max': {'type': 'number'},
+            'queries': {'type': 'integer'},
+            'requests': {'type': 'integer'}
+        },
+        'additionalProperties': False
+    }
+
+    plugin_timings_list = {'type': 'array', 'items': plugin_timing_schema}
+
 
 task_status = api.schema_model('tasks.tasks_status', ObjectsContainer.task_status_schema)
 task_status_list = api.schema_model('tasks.tasks_status_list', ObjectsContainer.task_status_list_schema)
 task_executions = api.schema_model('tasks.tasks_executions_list', ObjectsContainer.executions_list)
+plugin_timings = api.schema_model('tasks.plugin_timings_list', ObjectsContainer.plugin_timings_list)
 
 sort_choices = ('last_execution_time', 'name', 'id')
 tasks_parser = api.pagination_parser(sort_choices=sort_choices)
@@ -243,3 +266,33 @@ class TaskStatusExecutionsAPI(APIResource):
         # Add link header to response
         rsp.headers.extend(pagination)
         return rsp
+
+
+timings_parser = api.parser()
+timings_parser.add_argument('window', type=int, default=24, help='Number of hours of timings to include')
+
+
+@status_api.route('/timings/')
+@api.doc(parser=timings_parser)
+class StatusTimingsAPI(APIResource):
+    @etag
+    @api.response(200, model=plugin_timings)
+    def get(self, session=None):
+        """Get run time percentiles, query and request counts of every plugin in every task"""
+        args = timings_parser.parse_args()
+        return jsonify(get_plugin_timings(window=args['window'], session=session))
+
+
+@tasks_api.route('/status/<int:task_id>/timings/')
+@status_api.route('/<int:task_id>/timings/')
+@api.doc(parser=timings_parser, params={'task_id': 'ID of the status task'})
+class TaskStatusTimingsAPI(APIResource):
+    @etag
+    @api.response(200, model=plugin_timings)
+    @api.response(NotFoundError)
+    def get(self, task_id, session=None):
+        """Get run time percentiles, query and request counts of the plugins in a task"""
+        if not session.query(StatusTask).filter(StatusTask.id == task_id).first():
+            raise NotFoundError('task status with id %d not found' % task_id)
+        args = timings_parser.parse_args()
+        return jsonify(get_plugin_timings(task_id=task_id, window=args['window'], session=session))
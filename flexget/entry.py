@@ -5,13 +5,26 @@ from future.utils import PY2, native_str, text_type
 import copy
 import functools
 import logging
+import weakref
 
 from flexget.plugin import PluginError
-from flexget.utils.lazy_dict import LazyDict, LazyLookup
+from flexget.utils.lazy_dict import LazyDict, LazyLookup, CopyOnWriteStore, IMMUTABLE_TYPES
 from flexget.utils.template import render_from_entry, FlexGetTemplate
 
 log = logging.getLogger('entry')
 
+# Actions hooks can be registered for with :meth:`Entry.add_hook`
+HOOK_ACTIONS = ('accept', 'reject', 'fail', 'complete')
+# Fields EntryContainers keep lookup indexes for
+INDEXED_FIELDS = ('title', 'url', 'original_url')
+
+if PY2:
+    # Field names are unicode on python 2, which can't be interned
+    def intern(key):
+        return key
+else:
+    from sys import intern
+
 
 class EntryUnicodeError(Exception):
     """This exception is thrown when trying to set non-unicode compatible field value to entry."""
@@ -38,13 +51,18 @@ class Entry(LazyDict):
     and trigger :meth:`~flexget.task.Task.abort`.
     """
 
+    # Entries are created in large numbers, keep them small. Traces, snapshots and hooks are only allocated when used.
+    __slots__ = ('_traces', '_snapshots', '_entry_state', '_hooks', 'task', '_containers')
+
     def __init__(self, *args, **kwargs):
         super(Entry, self).__init__()
-        self.traces = []
-        self.snapshots = {}
-        self._state = 'undecided'
-        self._hooks = {'accept': [], 'reject': [], 'fail': [], 'complete': []}
+        self._traces = None
+        self._snapshots = None
+        self._entry_state = 'undecided'
+        self._hooks = None
         self.task = None
+        # Weak references to the EntryContainers holding this entry, they index entries by state and some fields
+        self._containers = ()
 
         if len(args) == 2:
             kwargs['title'] = args[0]
@@ -54,6 +72,67 @@ class Entry(LazyDict):
         # Make sure constructor does not escape our __setitem__ enforcement
         self.update(*args, **kwargs)
 
+    @property
+    def traces(self):
+        """List of (plugin, operation, message) tuples added with :meth:`trace`."""
+        if self._traces is None:
+            self._traces = []
+        return self._traces
+
+    @traces.setter
+    def traces(self, value):
+        self._traces = value
+
+    @property
+    def snapshots(self):
+        """Dict of snapshots taken with :meth:`take_snapshot` by name."""
+        if self._snapshots is None:
+            self._snapshots = {}
+        return self._snapshots
+
+    @snapshots.setter
+    def snapshots(self, value):
+        self._snapshots = value
+
+    @property
+    def _state(self):
+        return self._entry_state
+
+    @_state.setter
+    def _state(self, state):
+        old_state = self._entry_state
+        self._entry_state = state
+        if old_state != state:
+            for container in self._get_containers():
+                container._entry_state_changed(self, old_state, state)
+
+    def _get_containers(self):
+        return [container for container in (ref() for ref in self._containers) if container is not None]
+
+    def _added_to(self, container):
+        self._containers += (weakref.ref(container),)
+
+    def _removed_from(self, container):
+        self._containers = tuple(ref for ref in self._containers if ref() is not container and ref() is not None)
+
+    def __getstate__(self):
+        state = dict((slot, getattr(self, slot)) for slot in ('store', ) + Entry.__slots__ if slot != '_containers')
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        # Entries pickled before slots were used store traces and snapshots under their public names
+        state = dict(state)
+        state.setdefault('_traces', state.pop('traces', None))
+        state.setdefault('_snapshots', state.pop('snapshots', None))
+        state.setdefault('_entry_state', state.pop('_state', 'undecided'))
+        state.setdefault('_hooks', None)
+        state.setdefault('task', None)
+        state.pop('_containers', None)
+        self._containers = ()
+        for key, value in state.items():
+            setattr(self, key, value)
+
     def trace(self, message, operation=None, plugin=None):
         """
         Adds trace message to the entry which should contain useful information about why
@@ -76,7 +155,11 @@ class Entry(LazyDict):
         :param action: Name of action to run hooks for
         :param kwargs: Keyword arguments that should be passed to the registered functions
         """
-        for func in self._hooks[action]:
+        if action not in HOOK_ACTIONS:
+            raise KeyError(action)
+        if not self._hooks:
+            return
+        for func in self._hooks.get(action, []):
             func(self, **kwargs)
 
     def add_hook(self, action, func, **kwargs):
@@ -88,10 +171,11 @@ class Entry(LazyDict):
         :param kwargs: Keyword arguments that should be passed to ``func``
         :raises: ValueError when given an invalid ``action``
         """
-        try:
-            self._hooks[action].append(functools.partial(func, **kwargs))
-        except KeyError:
+        if action not in HOOK_ACTIONS:
             raise ValueError('`%s` is not a valid entry action' % action)
+        if self._hooks is None:
+            self._hooks = {}
+        self._hooks.setdefault(action, []).append(functools.partial(func, **kwargs))
 
     def on_accept(self, func, **kwargs):
         """
@@ -216,7 +300,16 @@ class Entry(LazyDict):
         except Exception as e:
             log.debug('trying to debug key `%s` value threw exception: %s' % (key, e))
 
-        super(Entry, self).__setitem__(key, value)
+        super(Entry, self).__setitem__(intern(key) if type(key) is str else key, value)
+        if self._containers and key in INDEXED_FIELDS:
+            for container in self._get_containers():
+                container._entry_field_changed(self, key)
+
+    def __delitem__(self, key):
+        super(Entry, self).__delitem__(key)
+        if self._containers and key in INDEXED_FIELDS:
+            for container in self._get_containers():
+                container._entry_field_changed(self, key)
 
     def safe_str(self):
         return '%s | %s' % (self['title'], self['url'])
@@ -301,3 +394,52 @@ class Entry(LazyDict):
 
     def __repr__(self):
         return '<Entry(title=%s,state=%s)>' % (self['title'], self._state)
+
+
+class FrozenEntry(object):
+    """
+    A read only snapshot of an :class:`Entry`, which can be turned back into any number of independent entries.
+
+    Restoring an entry is a shallow copy of the fields, values of mutable types are only copied from the snapshot
+    when they are first accessed on the restored entry. Changes to restored entries never affect the snapshot.
+    """
+
+    def __init__(self, entry, copy_values=True):
+        """
+        :param Entry entry: Entry to take the snapshot of.
+        :param bool copy_values: Copy mutable field values. May be disabled if `entry` will not be used afterwards.
+        """
+        self._entry = None
+        if any(isinstance(value, LazyLookup) for value in entry.store.values()):
+            # Lazy lookups are bound to the entry they belong to, such entries can only be copied as a whole
+            self._entry = copy.deepcopy(entry)
+            return
+        self._fields = {}
+        self._shared = []
+        for key, value in entry.store.items():
+            if not isinstance(value, IMMUTABLE_TYPES):
+                self._shared.append(key)
+                if copy_values:
+                    value = copy.deepcopy(value)
+            self._fields[key] = value
+        self._state = entry.state
+        self._traces = list(entry._traces or [])
+        self._hooks = dict((action, list(funcs)) for action, funcs in (entry._hooks or {}).items())
+        self._snapshots = copy.deepcopy(entry._snapshots) if copy_values else entry._snapshots
+
+    def thaw(self):
+        """
+        :return: A new :class:`Entry` with the fields and state of the snapshot.
+        """
+        if self._entry is not None:
+            return copy.deepcopy(self._entry)
+        entry = Entry()
+        entry.store = CopyOnWriteStore(self._fields, self._shared)
+        entry._state = self._state
+        if self._traces:
+            entry._traces = list(self._traces)
+        if self._hooks:
+            entry._hooks = dict((action, list(funcs)) for action, funcs in self._hooks.items())
+        if self._snapshots:
+            entry._snapshots = copy.deepcopy(self._snapshots)
+        return entry
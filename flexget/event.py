@@ -87,9 +87,9 @@ def remove_event_handlers(name):
 
 def remove_event_handler(name, func):
     """Remove `func` from the handlers for event `name`."""
-    for e in list(_events.get(name, [])):
-        if e.func is func:
-            _events[name].remove(e)
+    if name in _events:
+        # Events compare equal by priority, so list.remove could drop another handler
+        _events[name] = [e for e in _events[name] if e.func is not func]
 
 
 def fire_event(name, *args, **kwargs):
@@ -52,6 +52,17 @@ def task_logging(task):
         local_context.task = old_task
 
 
+@contextlib.contextmanager
+def suppress_logging(level=logging.WARNING):
+    """Context manager which drops the messages below `level` logged by the current thread while in scope."""
+    old_level = getattr(local_context, 'min_level', None)
+    local_context.min_level = get_level_no(level)
+    try:
+        yield
+    finally:
+        local_context.min_level = old_level
+
+
 class SessionFilter(logging.Filter):
     def __init__(self, session_id):
         self.session_id = session_id
@@ -124,6 +135,12 @@ class FlexGetLogger(logging.Logger):
 
         return logging.Logger.makeRecord(self, name, level, fn, lno, msg, args, exc_info, func, extra, *exargs)
 
+    def handle(self, record):
+        min_level = getattr(local_context, 'min_level', None)
+        if min_level is not None and record.levelno < min_level:
+            return
+        logging.Logger.handle(self, record)
+
     def trace(self, msg, *args, **kwargs):
         """Log at TRACE level (more detailed than DEBUG)."""
         self.log(TRACE, msg, *args, **kwargs)
@@ -41,6 +41,7 @@ from flexget.options import CoreArgumentParser, get_parser, manager_parser, Pars
 from flexget.task import Task  # noqa
 from flexget.task_queue import TaskQueue  # noqa
 from flexget.utils.tools import pid_exists, get_current_flexget_version, io_encoding  # noqa
+from flexget.utils.profiler import start_profiler, stop_profiler  # noqa
 from flexget.terminal import console  # noqa
 
 log = logging.getLogger('manager')
@@ -408,7 +409,7 @@ class Manager(object):
             if not self.task_queue.is_alive():
                 log.error('Task queue has died unexpectedly. Restarting it. Please open an issue on Github and include'
                           ' any previous error logs.')
-                self.task_queue = TaskQueue()
+                self.task_queue = TaskQueue(max_workers=self.config.get('max_concurrent_tasks', 1))
                 self.task_queue.start()
             if len(self.task_queue):
                 log.verbose('There is a task already running, execution queued.')
@@ -462,7 +463,7 @@ class Manager(object):
             self.ipc_server.start()
             self.task_queue.wait()
             fire_event('manager.daemon.completed', self)
-        elif options.action in ['stop', 'reload-config', 'status']:
+        elif options.action in ['stop', 'reload-config', 'status', 'profile']:
             if not self.is_daemon:
                 log.error('There does not appear to be a daemon running.')
                 return
@@ -480,6 +481,23 @@ class Manager(object):
                     log.error('Error loading config: %s' % e.args[0])
                 else:
                     log.info('Config successfully reloaded from disk.')
+            elif options.action == 'profile':
+                self.profile_command(options)
+
+    def profile_command(self, options):
+        """Starts or stops the sampling profiler of the running daemon."""
+        if options.profile_action == 'start':
+            if start_profiler(options.interval / 1000):
+                log.info('Profiler started. Use `flexget daemon profile stop` to write the results.')
+            else:
+                log.error('Profiler is already running.')
+        else:
+            directory = options.output or os.path.join(self.config_base, 'profiles')
+            paths = stop_profiler(directory, options.profile_formats or ['collapsed', 'speedscope'])
+            if paths is None:
+                log.error('Profiler is not running.')
+            else:
+                log.info('Profiler stopped. Results written to %s', ', '.join(paths))
 
     def _handle_sigterm(self, signum, frame):
         log.info('Got SIGTERM. Shutting down.')
@@ -747,10 +765,15 @@ class Manager(object):
 
         # fire up the engine
         log.debug('Connecting to: %s' % self.database_uri)
+        engine_args = {}
+        if self.database_uri.endswith(':memory:'):
+            # In memory databases only exist within one connection, share it so all threads see the same database
+            engine_args['poolclass'] = sqlalchemy.pool.StaticPool
         try:
             self.engine = sqlalchemy.create_engine(self.database_uri,
                                                    echo=self.options.debug_sql,
-                                                   connect_args={'check_same_thread': False, 'timeout': 10})
+                                                   connect_args={'check_same_thread': False, 'timeout': 10},
+                                                   **engine_args)
         except ImportError as e:
             print('FATAL: Unable to use SQLite. Are you running Python 2.7, 3.3 or newer ?\n'
                   'Python should normally have SQLite support built in.\n'
@@ -456,6 +456,18 @@ class CoreArgumentParser(ArgumentParser):
                                  help='wait for all queued tasks to finish before stopping daemon')
         daemon_parser.add_subparser('status', help='check if a daemon is running')
         daemon_parser.add_subparser('reload-config', help='causes a running daemon to reload the config from disk')
+        profile_parser = daemon_parser.add_subparser('profile', help='sample the stacks of running tasks, to find '
+                                                                     'out which code is slow')
+        profile_parser.add_argument('profile_action', choices=['start', 'stop'], metavar='<start|stop>',
+                                    help='start sampling, or stop and write the results')
+        profile_parser.add_argument('--interval', type=float, default=10, metavar='MS',
+                                    help='milliseconds between samples (default: %(default)s)')
+        profile_parser.add_argument('--format', choices=['collapsed', 'speedscope'], action='append',
+                                    dest='profile_formats', help='format to write when stopping, can be given more '
+                                                                 'than once (default: both)')
+        profile_parser.add_argument('--output', metavar='DIR',
+                                    help='directory to write the results to (default: profiles in the config '
+                                         'directory)')
 
     def add_subparsers(self, **kwargs):
         # The subparsers should not be CoreArgumentParsers
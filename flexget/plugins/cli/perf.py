@@ -0,0 +1,276 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import io
+import logging
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+import sqlalchemy
+from sqlalchemy import event as sqlalchemy_event
+
+from flexget import options
+from flexget import __version__ as flexget_version
+from flexget.event import event
+from flexget.logger import suppress_logging
+from flexget.manager import Base, Session
+from flexget.task import Task
+from flexget.terminal import console
+from flexget.utils import json
+from flexget.utils.requests import http_stats
+from flexget.utils.simple_persistence import SimplePersistence
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+log = logging.getLogger('perf')
+
+WORDS = ['the', 'show', 'night', 'city', 'blue', 'house', 'life', 'star', 'doctor', 'game', 'code', 'dark', 'river',
+         'king', 'west', 'lost', 'fire', 'road', 'last', 'wild']
+QUALITIES = ['720p.HDTV.x264', '1080p.WEB-DL.DD5.1.H.264', 'HDTV.XviD', '2160p.WEBRip.x265', '480p.DVDRip.XviD',
+             '1080p.BluRay.x264']
+
+
+class SyntheticData(object):
+    """Deterministic rss feed and directory tree with episode releases of `shows` made up shows."""
+
+    def __init__(self, directory, entries, shows, seed=0):
+        rand = random.Random(seed)
+        self.shows = ['%s %s %s' % (rand.choice(WORDS).title(), rand.choice(WORDS).title(), i) for i in range(shows)]
+        self.titles = []
+        for _ in range(entries):
+            self.titles.append('%s.S%02dE%02d.%s-%s' % (rand.choice(self.shows).replace(' ', '.'), rand.randint(1, 9),
+                                                        rand.randint(1, 24), rand.choice(QUALITIES),
+                                                        rand.choice(['FlexGet', 'LOL', 'DIMENSION', 'NTb'])))
+
+        self.rss = os.path.join(directory, 'feed.rss')
+        items = ['<item><title>%s</title><link>http://example.com/torrents/%s.torrent</link>'
+                 '<guid>%s</guid><description>Release %s</description></item>' % (escape(title), i, i, i)
+                 for i, title in enumerate(self.titles)]
+        with io.open(self.rss, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel><title>perf</title>'
+                    '<link>http://example.com/</link><description>perf</description>%s</channel></rss>' %
+                    ''.join(items))
+
+        # Every other release is already in the library, split into directories by show
+        self.library = os.path.join(directory, 'library')
+        for title in self.titles[::2]:
+            show_dir = os.path.join(self.library, title.split('.S')[0])
+            if not os.path.isdir(show_dir):
+                os.makedirs(show_dir)
+            open(os.path.join(show_dir, title + '.mkv'), 'a').close()
+
+
+def series_config(data):
+    return {'rss': data.rss, 'series': data.shows}
+
+
+def regexp_config(data):
+    return {
+        'rss': data.rss,
+        'regexp': {
+            'accept': [name.replace(' ', '.') for name in data.shows[::10]],
+            'reject': ['xvid', 'dvdrip', r'\bcam\b']
+        }
+    }
+
+
+def seen_config(data):
+    return {'rss': data.rss, 'accept_all': True}
+
+
+def quality_config(data):
+    return {'rss': data.rss, 'quality': '720p-1080p', 'accept_all': True}
+
+
+def backlog_config(data):
+    return {'rss': data.rss, 'backlog': '1 day', 'quality': '1080p', 'accept_all': True}
+
+
+def crossmatch_config(data):
+    return {
+        'rss': data.rss,
+        'crossmatch': {
+            'from': [{'filesystem': {'path': data.library, 'recursive': True, 'retrieve': 'files'}}],
+            'fields': ['title'],
+            'action': 'reject'
+        },
+        'accept_all': True
+    }
+
+
+def filesystem_config(data):
+    return {'filesystem': {'path': data.library, 'recursive': True, 'retrieve': 'files'}, 'accept_all': True}
+
+
+#: Name: (function returning the task config, number of unmeasured runs before the measured one)
+BENCHMARKS = {
+    'series': (series_config, 0),
+    'regexp': (regexp_config, 0),
+    # The measured run finds every entry in the database
+    'seen': (seen_config, 1),
+    'quality': (quality_config, 0),
+    # The measured run also injects the entries stored by the first one
+    'backlog': (backlog_config, 1),
+    'crossmatch': (crossmatch_config, 0),
+    'filesystem': (filesystem_config, 0),
+}
+
+
+@contextmanager
+def temporary_database(manager, directory):
+    """
+    Points the manager and all sessions to an empty database in `directory`, counting the queries run.
+
+    Plugins use the global `Session`, so this affects everything using the database in the process. It must not be
+    used while other tasks may run, see :func:`do_cli`.
+    """
+    engine = sqlalchemy.create_engine('sqlite:///%s' % os.path.join(directory, 'perf.sqlite'),
+                                      connect_args={'check_same_thread': False, 'timeout': 10})
+    Base.metadata.create_all(bind=engine)
+    queries = [0]
+
+    def count_query(*args):
+        queries[0] += 1
+
+    sqlalchemy_event.listen(engine, 'after_cursor_execute', count_query)
+    original = manager.engine
+    manager.engine = engine
+    Session.configure(bind=engine)
+    try:
+        yield queries
+    finally:
+        Session.configure(bind=original)
+        manager.engine = original
+        sqlalchemy_event.remove(engine, 'after_cursor_execute', count_query)
+        engine.dispose()
+
+
+def run_benchmark(manager, name, data, directory, trace_memory=False):
+    """
+    Runs benchmark `name` against a new database.
+
+    :return: Dict with the measurements of the last run.
+    """
+    make_config, warmup = BENCHMARKS[name]
+    task_name = 'perf_%s' % name
+    db_dir = tempfile.mkdtemp(dir=directory)
+    try:
+        with temporary_database(manager, db_dir) as queries:
+            for run in range(warmup + 1):
+                config = make_config(data)
+                errors = Task.validate_config(config)
+                if errors:
+                    raise ValueError('invalid config for benchmark %s: %s' % (name, errors[0].message))
+                task = Task(manager, task_name, config=config, options={'allow_manual': True})
+                measured = run == warmup
+                if measured:
+                    query_start = queries[0]
+                    requests_start = http_stats.thread_requests()
+                    if trace_memory:
+                        tracemalloc.start()
+                    start = time.time()
+                task.execute()
+                if measured:
+                    took = time.time() - start
+                    peak = None
+                    if trace_memory:
+                        peak = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                    result = {
+                        'entries': len(task.all_entries),
+                        'accepted': len(task.accepted),
+                        'seconds': took,
+                        'entries_per_second': len(task.all_entries) / took if took else None,
+                        'queries': queries[0] - query_start,
+                        'http_requests': http_stats.thread_requests() - requests_start,
+                        'peak_memory': peak
+                    }
+                if task.aborted:
+                    raise ValueError('benchmark %s aborted: %s' % (name, task.abort_reason))
+    finally:
+        SimplePersistence.class_store.pop(task_name, None)
+        shutil.rmtree(db_dir, ignore_errors=True)
+    return result
+
+
+def run_benchmarks(manager, names, entries=1000, shows=500, repeat=3, seed=0, memory=True):
+    """
+    Runs the benchmarks in `names` on synthetic data, each against its own temporary database.
+
+    The fastest of `repeat` runs is reported. Peak memory is measured in one extra run, as tracing allocations slows
+    down the code a lot.
+
+    :return: Dict with the environment, parameters and the results per benchmark.
+    """
+    directory = tempfile.mkdtemp(prefix='flexget-perf-')
+    results = {}
+    try:
+        data = SyntheticData(directory, entries, shows, seed)
+        # Task logging is not part of what is measured, and would flood the console
+        with suppress_logging(logging.WARNING):
+            for name in names:
+                runs = [run_benchmark(manager, name, data, directory) for _ in range(repeat)]
+                result = min(runs, key=lambda r: r['seconds'])
+                result['runs'] = [r['seconds'] for r in runs]
+                if memory and tracemalloc is not None:
+                    result['peak_memory'] = run_benchmark(manager, name, data, directory,
+                                                          trace_memory=True)['peak_memory']
+                results[name] = result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'flexget_version': flexget_version,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.now().isoformat(),
+        'parameters': {'entries': entries, 'shows': shows, 'repeat': repeat, 'seed': seed},
+        'benchmarks': results
+    }
+
+
+def do_cli(manager, options):
+    if manager.is_daemon or manager.task_queue.is_alive():
+        # The benchmarks swap the database of the whole process, running tasks would write to the wrong one
+        console('Benchmarks can not run in a process which runs tasks. Stop the daemon and run them again.')
+        return
+    names = options.benchmarks or sorted(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        console('Unknown benchmarks: %s. Available: %s' % (', '.join(unknown), ', '.join(sorted(BENCHMARKS))))
+        return
+    results = run_benchmarks(manager, names, entries=options.entries, shows=options.shows, repeat=options.repeat,
+                             seed=options.seed, memory=not options.no_memory)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if options.output:
+        with io.open(options.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        console('Results written to %s' % options.output)
+    else:
+        console(output)
+
+
+@event('options.register')
+def register_parser_arguments():
+    parser = options.register_command('perf', do_cli, help='run offline benchmarks of common task configs and report '
+                                                           'the results as json')
+    parser.add_argument('benchmarks', nargs='*', metavar='<benchmark>',
+                        help='benchmarks to run: %s (default: all)' % ', '.join(sorted(BENCHMARKS)))
+    parser.add_argument('--entries', type=int, default=1000, metavar='NUM',
+                        help='number of entries in the synthetic inputs (default: %(default)s)')
+    parser.add_argument('--shows', type=int, default=500, metavar='NUM',
+                        help='number of different shows in the synthetic inputs (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, metavar='NUM',
+                        help='runs of each benchmark, the fastest is reported (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating the synthetic inputs')
+    parser.add_argument('--no-memory', action='store_true', help='skip the extra run measuring peak memory')
+    parser.add_argument('--output', metavar='FILE', help='write the json results to %(metavar)s')
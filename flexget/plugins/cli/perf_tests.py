@@ -10,7 +10,7 @@ from flexget.manager import Session
 
 log = logging.getLogger('perftests')
 
-TESTS = ['imdb_query']
+TESTS = ['imdb_query', 'series_parse', 'entry_memory']
 
 
 def cli_perf_test(manager, options):
@@ -21,6 +21,10 @@ def cli_perf_test(manager, options):
     try:
         if options.test_name == 'imdb_query':
             imdb_query(session)
+        elif options.test_name == 'series_parse':
+            series_parse()
+        elif options.test_name == 'entry_memory':
+            entry_memory()
     finally:
         session.close()
 
@@ -73,6 +77,82 @@ def imdb_query(session):
     log.debug('Took %.2f seconds to query %i movies' % (took, len(imdb_urls)))
 
 
+def series_parse(series_count=600, title_count=2000):
+    """Compares per title parse time of SeriesParser with cold and with cached parser profiles."""
+    import random
+    import time
+    from flexget.utils.titles.series import SeriesParser, SeriesParserProfile
+
+    rand = random.Random(0)
+    words = ['the', 'show', 'night', 'city', 'blue', 'house', 'life', 'star', 'doctor', 'game', 'code', 'dark']
+    names = ['%s %s %s' % (rand.choice(words), rand.choice(words), i) for i in range(series_count)]
+    titles = [('%s.S%02dE%02d.720p.HDTV.x264-FlexGet' % (name.replace(' ', '.'), rand.randint(1, 9),
+                                                         rand.randint(1, 24)), name)
+              for name in (rand.choice(names) for _ in range(title_count))]
+
+    def run(cold):
+        start_time = time.time()
+        for title, name in titles:
+            if cold:
+                SeriesParserProfile._cache.clear()
+            SeriesParser(name=name, ep_regexps=[r'(\d{2})x(\d{2})']).parse(title)
+        return (time.time() - start_time) / len(titles) * 1000000
+
+    cold = run(cold=True)
+    # Once to fill the cache
+    run(cold=False)
+    warm = run(cold=False)
+    console('%s titles, %s series' % (len(titles), series_count))
+    console('per title parse time with cold profiles: %.1f us' % cold)
+    console('per title parse time with cached profiles: %.1f us' % warm)
+
+
+def entry_memory(entry_count=20000):
+    """Measures memory used per entry with fields typical for the rss and filesystem inputs."""
+    import time
+    from datetime import datetime
+    try:
+        import tracemalloc
+    except ImportError:
+        console('entry_memory test requires python 3.4+')
+        return
+    from flexget.entry import Entry
+
+    now = datetime.now()
+
+    def rss_entry(i):
+        # Field names are built at runtime like the ones coming from feeds or the database
+        entry = Entry()
+        entry['title'] = 'Some.Show.S01E%02d.720p.HDTV.x264-FlexGet' % (i % 100)
+        entry['url'] = 'http://example.com/torrents/%s.torrent' % i
+        for field, value in [('description', 'Episode %s of some show' % i), ('rss_pubdate', now),
+                             ('size', 1024 * i), ('type', 'application/x-bittorrent'), ('filename', '%s.torrent' % i)]:
+            entry[''.join(field)] = value
+        return entry
+
+    def filesystem_entry(i):
+        entry = Entry()
+        location = '/media/library/Some Show/Season 1/Some.Show.S01E%02d.%s.mkv' % (i % 100, i)
+        entry['location'] = location
+        entry['url'] = 'file://' + location
+        entry['filename'] = location.rsplit('/', 1)[-1]
+        entry['title'] = entry['filename'][:-4]
+        for field in ('timestamp', 'accessed', 'modified', 'created'):
+            entry[''.join(field)] = now
+        return entry
+
+    for name, factory in [('rss', rss_entry), ('filesystem', filesystem_entry)]:
+        tracemalloc.start()
+        start_time = time.time()
+        entries = [factory(i) for i in range(entry_count)]
+        took = time.time() - start_time
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        console('%s: %s entries, %.0f bytes per entry, created in %.1f us per entry' %
+                (name, len(entries), size / len(entries), took / len(entries) * 1000000))
+        del entries
+
+
 @event('options.register')
 def register_parser_arguments():
     perf_parser = options.register_command('perf-test', cli_perf_test)
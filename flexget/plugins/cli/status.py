@@ -8,7 +8,7 @@ from colorclass.toggles import disable_all_colors
 from flexget import options
 from flexget.event import event
 from flexget.manager import Session
-from flexget.plugins.operate.status import StatusTask, TaskExecution
+from flexget.plugins.operate.status import StatusTask, TaskExecution, get_plugin_timings
 from flexget.terminal import TerminalTable, TerminalTableError, table_parser, colorize, console
 from sqlalchemy import desc
 from sqlalchemy.orm.exc import NoResultFound
@@ -17,7 +17,9 @@ from sqlalchemy.orm.exc import NoResultFound
 def do_cli(manager, options):
     if options.table_type == 'porcelain':
         disable_all_colors()
-    if options.task:
+    if options.timings:
+        do_cli_timings(manager, options)
+    elif options.task:
         do_cli_task(manager, options)
     else:
         do_cli_summary(manager, options)
@@ -63,6 +65,38 @@ def do_cli_task(manager, options):
         console('ERROR: %s' % str(e))
 
 
+def do_cli_timings(manager, options):
+    header = ['Task', 'Phase', 'Plugin', 'Runs', 'p50', 'p95', 'Max', 'Total', 'Queries', 'Requests']
+    table_data = [header]
+    with Session() as session:
+        task_id = None
+        if options.task:
+            task = session.query(StatusTask).filter(StatusTask.name == options.task).first()
+            if not task:
+                console('Task name `%s` does not exists or does not have any records' % options.task)
+                return
+            task_id = task.id
+        for timing in get_plugin_timings(task_id=task_id, window=options.window, session=session)[:options.limit]:
+            table_data.append([
+                timing['task'],
+                timing['phase'],
+                timing['plugin'],
+                timing['runs'],
+                '%.2fs' % timing['p50'],
+                '%.2fs' % timing['p95'],
+                '%.2fs' % timing['max'],
+                '%.2fs' % timing['total_time'],
+                timing['queries'],
+                timing['requests']
+            ])
+
+    try:
+        table = TerminalTable(options.table_type, table_data)
+        console(table.output)
+    except TerminalTableError as e:
+        console('ERROR: %s' % str(e))
+
+
 def do_cli_summary(manager, options):
     header = ['Task', 'Last execution', 'Last success', 'Produced', 'Accepted', 'Rejected', 'Failed', 'Duration']
     table_data = [header]
@@ -115,3 +149,7 @@ def register_parser_arguments():
     parser.add_argument('--task', action='store', metavar='TASK', help='Limit to results in specified %(metavar)s')
     parser.add_argument('--limit', action='store', type=int, metavar='NUM', default=50,
                         help='Limit to %(metavar)s results')
+    parser.add_argument('--timings', action='store_true',
+                        help='Show run time percentiles, database queries and http requests of each plugin')
+    parser.add_argument('--window', action='store', type=int, metavar='HOURS', default=24,
+                        help='Include plugin timings of the last %(metavar)s hours (default: %(default)s)')
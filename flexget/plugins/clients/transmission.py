@@ -8,6 +8,7 @@ import os
 import logging
 import base64
 import re
+import threading
 import time
 from datetime import datetime
 from datetime import timedelta
@@ -33,6 +34,10 @@ except ImportError:
 
 log = logging.getLogger('transmission')
 
+# Rpc clients are kept between tasks and daemon runs, keyed by connection details
+rpc_clients = {}
+rpc_clients_lock = threading.Lock()
+
 
 class TransmissionBase(object):
 
@@ -87,6 +92,27 @@ class TransmissionBase(object):
                 raise plugin.PluginError("Error connecting to transmission: %s" % e.message)
         return cli
 
+    def _client_key(self, config):
+        return config['host'], config['port'], config.get('username'), config.get('password')
+
+    def get_rpc_client(self, config):
+        """Returns a cached rpc client for the connection in `config`, connecting if there is none yet."""
+        key = self._client_key(config)
+        with rpc_clients_lock:
+            cli = rpc_clients.get(key)
+            if cli is None:
+                cli = rpc_clients[key] = self.create_rpc_client(config)
+        return cli
+
+    def reconnect_rpc_client(self, config):
+        """Discards the cached rpc client for `config` and connects again."""
+        with rpc_clients_lock:
+            rpc_clients.pop(self._client_key(config), None)
+        return self.get_rpc_client(config)
+
+    def is_connection_error(self, error):
+        return isinstance(getattr(error, 'original', None), HTTPHandlerError)
+
     def torrent_info(self, torrent, config):
         done = torrent.totalSize > 0
         vloc = None
@@ -131,14 +157,14 @@ class TransmissionBase(object):
         if [int(part) for part in transmissionrpc.__version__.split('.')] < [0, 11]:
             raise plugin.PluginError('Transmissionrpc module version 0.11 or higher required, please upgrade', log)
 
-        # Mark rpc client for garbage collector so every task can start
-        # a fresh new according its own config - fix to bug #2804
+        # Every task picks the client matching its own config - fix to bug #2804
+        # Clients are cached, so connecting only happens once per connection or after an error
         self.client = None
         config = self.prepare_config(config)
         if config['enabled']:
             if task.options.test:
                 log.info('Trying to connect to transmission...')
-                self.client = self.create_rpc_client(config)
+                self.client = self.reconnect_rpc_client(config)
                 if self.client:
                     log.info('Successfully connected to transmission.')
                 else:
@@ -167,7 +193,7 @@ class PluginTransmissionInput(TransmissionBase):
             return
 
         if not self.client:
-            self.client = self.create_rpc_client(config)
+            self.client = self.get_rpc_client(config)
         entries = []
 
         # Hack/Workaround for http://flexget.com/ticket/2002
@@ -294,7 +320,7 @@ class PluginTransmission(TransmissionBase):
         if not task.accepted:
             return
         if self.client is None:
-            self.client = self.create_rpc_client(config)
+            self.client = self.get_rpc_client(config)
             if self.client:
                 log.debug('Successfully connected to transmission.')
             else:
@@ -383,7 +409,13 @@ class PluginTransmission(TransmissionBase):
         return options
 
     def add_to_transmission(self, cli, task, config):
-        """Adds accepted entries to transmission """
+        """
+        Adds accepted entries to transmission.
+
+        Torrents are added first, then magnets which need their file list are polled together, and the torrents are
+        started or stopped with one call at the end, so adding many entries costs few extra round trips.
+        """
+        added = []
         for entry in task.accepted:
             if task.options.test:
                 log.info('Would add %s to transmission' % entry['url'])
@@ -406,165 +438,48 @@ class PluginTransmission(TransmissionBase):
                 continue
 
             try:
-                if downloaded:
-                    with open(entry['file'], 'rb') as f:
-                        filedump = base64.b64encode(f.read()).decode('utf-8')
-                    r = cli.add_torrent(filedump, 30, **options['add'])
+                try:
+                    r = self._add_torrent(cli, entry, options, downloaded)
+                except TransmissionError as e:
+                    if not self.is_connection_error(e):
+                        raise
+                    log.verbose('Lost connection to transmission, reconnecting')
+                    cli = self.client = self.reconnect_rpc_client(config)
+                    r = self._add_torrent(cli, entry, options, downloaded)
+            except TransmissionError as e:
+                self._fail_entry(entry, options, e)
+                continue
+            log.info('"%s" torrent added to transmission', entry['title'])
+            added.append((entry, options, r, downloaded))
+
+        if not added:
+            return
+
+        session = {}
+
+        def get_session():
+            # Session settings are only fetched once, and only if needed
+            if 'session' not in session:
+                session['session'] = cli.get_session()
+            return session['session']
+
+        try:
+            files, sizes = self._get_files(cli, added)
+        except TransmissionError as e:
+            # The torrents are in transmission, only the ones which need their files can not be set up
+            remaining = []
+            for entry, options, r, downloaded in added:
+                if self._needs_files(options):
+                    self._fail_entry(entry, options, e)
                 else:
-                    # we need to set paused to false so the magnetization begins immediately
-                    options['add']['paused'] = False
-                    r = cli.add_torrent(entry['url'], timeout=30, **options['add'])
-
-                log.info('"%s" torrent added to transmission', entry['title'])
-
-                total_size = cli.get_torrent(r.id, ['id', 'totalSize']).totalSize
-
-                def _filter_list(list):
-                    for item in list:
-                        if not isinstance(item, basestring):
-                            list.remove(item)
-                    return list
-
-                def _find_matches(name, list):
-                    for mask in list:
-                        if fnmatch(name, mask):
-                            return True
-                    return False
-
-                def _wait_for_files(cli, r, timeout):
-                    from time import sleep
-                    while timeout > 0:
-                        sleep(1)
-                        fl = cli.get_files(r.id)
-                        if len(fl[r.id]) > 0:
-                            return fl
-                        else:
-                            timeout -= 1
-                    return fl
-
-                skip_files = False
-                # Filter list because "set" plugin doesn't validate based on schema
-                # Skip files only used if we have no main file
-                if 'skip_files' in options['post']:
-                    skip_files = True
-                    options['post']['skip_files'] = _filter_list(options['post']['skip_files'])
-
-                main_id = None
-                find_main_file = options['post'].get('main_file_only') or 'content_filename' in options['post']
-                # We need to index the files if any of the following are defined
-                if find_main_file or skip_files:
-                    fl = cli.get_files(r.id)
-
-                    if ('magnetization_timeout' in options['post'] and
-                        options['post']['magnetization_timeout'] > 0 and
-                            not downloaded and
-                            len(fl[r.id]) == 0):
-                        log.debug('Waiting %d seconds for "%s" to magnetize', options['post']['magnetization_timeout'],
-                                  entry['title'])
-                        fl = _wait_for_files(cli, r, options['post']['magnetization_timeout'])
-                        if len(fl[r.id]) == 0:
-                            log.warning('"%s" did not magnetize before the timeout elapsed, '
-                                        'file list unavailable for processing.', entry['title'])
-                        else:
-                            total_size = cli.get_torrent(r.id, ['id', 'totalSize']).totalSize
-
-                    # Find files based on config
-                    dl_list = []
-                    skip_list = []
-                    main_list = []
-                    full_list = []
-                    ext_list = ['*.srt', '*.sub', '*.idx', '*.ssa', '*.ass']
-
-                    main_ratio = config['main_file_ratio']
-                    if 'main_file_ratio' in options['post']:
-                        main_ratio = options['post']['main_file_ratio']
-
-                    if 'include_files' in options['post']:
-                        options['post']['include_files'] = _filter_list(options['post']['include_files'])
-
-                    for f in fl[r.id]:
-                        full_list.append(f)
-                        # No need to set main_id if we're not going to need it
-                        if find_main_file and fl[r.id][f]['size'] > total_size * main_ratio:
-                            main_id = f
-
-                        if 'include_files' in options['post']:
-                            if _find_matches(fl[r.id][f]['name'], options['post']['include_files']):
-                                dl_list.append(f)
-                            elif options['post'].get('include_subs') and _find_matches(fl[r.id][f]['name'], ext_list):
-                                dl_list.append(f)
-
-                        if skip_files:
-                            if _find_matches(fl[r.id][f]['name'], options['post']['skip_files']):
-                                skip_list.append(f)
-
-                    if main_id is not None:
-
-                        # Look for files matching main ID title but with a different extension
-                        if options['post'].get('rename_like_files'):
-                            for f in fl[r.id]:
-                                # if this filename matches main filename we want to rename it as well
-                                fs = os.path.splitext(fl[r.id][f]['name'])
-                                if fs[0] == os.path.splitext(fl[r.id][main_id]['name'])[0]:
-                                    main_list.append(f)
-                        else:
-                            main_list = [main_id]
-
-                        if main_id not in dl_list:
-                            dl_list.append(main_id)
-                    elif find_main_file:
-                        log.warning('No files in "%s" are > %d%% of content size, no files renamed.',
-                            entry['title'], main_ratio * 100)
-
-                    # If we have a main file and want to rename it and associated files
-                    if 'content_filename' in options['post'] and main_id is not None:
-                        if 'download_dir' not in options['add']:
-                            download_dir = cli.get_session().download_dir
-                        else:
-                            download_dir = options['add']['download_dir']
-
-                        # Get new filename without ext
-                        file_ext = os.path.splitext(fl[r.id][main_id]['name'])[1]
-                        file_path = os.path.dirname(os.path.join(download_dir, fl[r.id][main_id]['name']))
-                        filename = options['post']['content_filename']
-                        if config['host'] == 'localhost' or config['host'] == '127.0.0.1':
-                            counter = 1
-                            while os.path.exists(os.path.join(file_path, filename + file_ext)):
-                                # Try appending a (#) suffix till a unique filename is found
-                                filename = '%s(%s)' % (options['post']['content_filename'], counter)
-                                counter += 1
-                        else:
-                            log.debug('Cannot ensure content_filename is unique '
-                                      'when adding to a remote transmission daemon.')
-
-                        for index in main_list:
-                            file_ext = os.path.splitext(fl[r.id][index]['name'])[1]
-                            log.debug('File %s renamed to %s' % (fl[r.id][index]['name'], filename + file_ext))
-                            # change to below when set_files will allow setting name, more efficient to have one call
-                            # fl[r.id][index]['name'] = os.path.basename(pathscrub(filename + file_ext).encode('utf-8'))
-                            try:
-                                cli.rename_torrent_path(r.id, fl[r.id][index]['name'],
-                                                        os.path.basename(str(pathscrub(filename + file_ext))))
-                            except TransmissionError:
-                                log.error('content_filename only supported with transmission 2.8+')
-
-                    if options['post'].get('main_file_only') and main_id is not None:
-                        # Set Unwanted Files
-                        options['change']['files_unwanted'] = [x for x in full_list if x not in dl_list]
-                        options['change']['files_wanted'] = dl_list
-                        log.debug('Downloading %s of %s files in torrent.',
-                                  len(options['change']['files_wanted']), len(full_list))
-                    elif (not options['post'].get('main_file_only') or main_id is None) and skip_files:
-                        # If no main file and we want to skip files
-
-                        if len(skip_list) >= len(full_list):
-                            log.debug('skip_files filter would cause no files to be downloaded; '
-                                      'including all files in torrent.')
-                        else:
-                            options['change']['files_unwanted'] = skip_list
-                            options['change']['files_wanted'] = [x for x in full_list if x not in skip_list]
-                            log.debug('Downloading %s of %s files in torrent.',
-                                      len(options['change']['files_wanted']), len(full_list))
+                    remaining.append((entry, options, r, downloaded))
+            added = remaining
+            files, sizes = {}, {}
+
+        start, stop = [], []
+        for entry, options, r, downloaded in added:
+            try:
+                self._set_files(cli, config, entry, options, r, files, sizes, get_session)
 
                 # Set any changed file properties
                 if list(options['change'].keys()):
@@ -573,20 +488,212 @@ class PluginTransmission(TransmissionBase):
                 # if addpaused was defined and set to False start the torrent;
                 # prevents downloading data before we set what files we want
                 if ('paused' in options['post'] and not options['post']['paused'] or
-                        'paused' not in options['post'] and cli.get_session().start_added_torrents):
-                    cli.start_torrent(r.id)
+                        'paused' not in options['post'] and get_session().start_added_torrents):
+                    start.append((entry, options, r))
                 elif options['post'].get('paused'):
-                    log.debug('sleeping 5s to stop the torrent...')
-                    time.sleep(5)
-                    cli.stop_torrent(r.id)
+                    stop.append((entry, options, r))
+            except TransmissionError as e:
+                self._fail_entry(entry, options, e)
+
+        try:
+            if start:
+                cli.start_torrent([r.id for entry, options, r in start])
+        except TransmissionError as e:
+            for entry, options, r in start:
+                self._fail_entry(entry, options, e)
+        try:
+            if stop:
+                log.debug('sleeping 5s to stop the torrents...')
+                time.sleep(5)
+                cli.stop_torrent([r.id for entry, options, r in stop])
+                for entry, options, r in stop:
                     log.info('Torrent "%s" stopped because of addpaused=yes', entry['title'])
+        except TransmissionError as e:
+            for entry, options, r in stop:
+                self._fail_entry(entry, options, e)
+
+    def _add_torrent(self, cli, entry, options, downloaded):
+        if downloaded:
+            with open(entry['file'], 'rb') as f:
+                filedump = base64.b64encode(f.read()).decode('utf-8')
+            return cli.add_torrent(filedump, 30, **options['add'])
+        # we need to set paused to false so the magnetization begins immediately
+        options['add']['paused'] = False
+        return cli.add_torrent(entry['url'], timeout=30, **options['add'])
+
+    def _fail_entry(self, entry, options, error):
+        log.debug('TransmissionError', exc_info=True)
+        log.debug('Failed options dict: %s', options)
+        msg = 'TransmissionError: %s' % error.message or 'N/A'
+        log.error(msg)
+        entry.fail(msg)
+
+    def _needs_files(self, options):
+        # We need to index the files if any of the following are defined
+        return options['post'].get('main_file_only') or 'content_filename' in options['post'] or \
+            'skip_files' in options['post']
+
+    def _get_files(self, cli, added):
+        """
+        Gets the file lists and total sizes of the added torrents which need them. Magnets which have no files yet are
+        polled together until they magnetize or their `magnetization_timeout` elapses.
 
-            except TransmissionError as e:
-                log.debug('TransmissionError', exc_info=True)
-                log.debug('Failed options dict: %s', options)
-                msg = 'TransmissionError: %s' % e.message or 'N/A'
-                log.error(msg)
-                entry.fail(msg)
+        :return: Tuple of dicts from torrent id to file list, and from torrent id to total size
+        """
+        ids = [r.id for entry, options, r, downloaded in added if self._needs_files(options)]
+        if not ids:
+            return {}, {}
+        files = cli.get_files(ids)
+
+        waiting = {}
+        for entry, options, r, downloaded in added:
+            timeout = options['post'].get('magnetization_timeout', 0)
+            if r.id in ids and timeout > 0 and not downloaded and len(files[r.id]) == 0:
+                log.debug('Waiting %d seconds for "%s" to magnetize', timeout, entry['title'])
+                waiting[r.id] = (entry, timeout)
+        while waiting:
+            time.sleep(1)
+            polled = cli.get_files(list(waiting))
+            for torrent_id, (entry, timeout) in list(waiting.items()):
+                if len(polled[torrent_id]) > 0:
+                    files[torrent_id] = polled[torrent_id]
+                    del waiting[torrent_id]
+                elif timeout <= 1:
+                    log.warning('"%s" did not magnetize before the timeout elapsed, '
+                                'file list unavailable for processing.', entry['title'])
+                    del waiting[torrent_id]
+                else:
+                    waiting[torrent_id] = (entry, timeout - 1)
+
+        sizes = dict((torrent.id, torrent.totalSize) for torrent in cli.get_torrents(ids, ['id', 'totalSize']))
+        return files, sizes
+
+    def _set_files(self, cli, config, entry, options, r, files, sizes, get_session):
+        """Selects the wanted files and renames the main file of an added torrent, according to the options."""
+
+        def _filter_list(list):
+            for item in list:
+                if not isinstance(item, basestring):
+                    list.remove(item)
+            return list
+
+        def _find_matches(name, list):
+            for mask in list:
+                if fnmatch(name, mask):
+                    return True
+            return False
+
+        skip_files = False
+        # Filter list because "set" plugin doesn't validate based on schema
+        # Skip files only used if we have no main file
+        if 'skip_files' in options['post']:
+            skip_files = True
+            options['post']['skip_files'] = _filter_list(options['post']['skip_files'])
+
+        main_id = None
+        find_main_file = options['post'].get('main_file_only') or 'content_filename' in options['post']
+        if not (find_main_file or skip_files):
+            return
+        fl = files
+        total_size = sizes[r.id]
+
+        # Find files based on config
+        dl_list = []
+        skip_list = []
+        main_list = []
+        full_list = []
+        ext_list = ['*.srt', '*.sub', '*.idx', '*.ssa', '*.ass']
+
+        main_ratio = config['main_file_ratio']
+        if 'main_file_ratio' in options['post']:
+            main_ratio = options['post']['main_file_ratio']
+
+        if 'include_files' in options['post']:
+            options['post']['include_files'] = _filter_list(options['post']['include_files'])
+
+        for f in fl[r.id]:
+            full_list.append(f)
+            # No need to set main_id if we're not going to need it
+            if find_main_file and fl[r.id][f]['size'] > total_size * main_ratio:
+                main_id = f
+
+            if 'include_files' in options['post']:
+                if _find_matches(fl[r.id][f]['name'], options['post']['include_files']):
+                    dl_list.append(f)
+                elif options['post'].get('include_subs') and _find_matches(fl[r.id][f]['name'], ext_list):
+                    dl_list.append(f)
+
+            if skip_files:
+                if _find_matches(fl[r.id][f]['name'], options['post']['skip_files']):
+                    skip_list.append(f)
+
+        if main_id is not None:
+
+            # Look for files matching main ID title but with a different extension
+            if options['post'].get('rename_like_files'):
+                for f in fl[r.id]:
+                    # if this filename matches main filename we want to rename it as well
+                    fs = os.path.splitext(fl[r.id][f]['name'])
+                    if fs[0] == os.path.splitext(fl[r.id][main_id]['name'])[0]:
+                        main_list.append(f)
+            else:
+                main_list = [main_id]
+
+            if main_id not in dl_list:
+                dl_list.append(main_id)
+        elif find_main_file:
+            log.warning('No files in "%s" are > %d%% of content size, no files renamed.',
+                        entry['title'], main_ratio * 100)
+
+        # If we have a main file and want to rename it and associated files
+        if 'content_filename' in options['post'] and main_id is not None:
+            if 'download_dir' not in options['add']:
+                download_dir = get_session().download_dir
+            else:
+                download_dir = options['add']['download_dir']
+
+            # Get new filename without ext
+            file_ext = os.path.splitext(fl[r.id][main_id]['name'])[1]
+            file_path = os.path.dirname(os.path.join(download_dir, fl[r.id][main_id]['name']))
+            filename = options['post']['content_filename']
+            if config['host'] == 'localhost' or config['host'] == '127.0.0.1':
+                counter = 1
+                while os.path.exists(os.path.join(file_path, filename + file_ext)):
+                    # Try appending a (#) suffix till a unique filename is found
+                    filename = '%s(%s)' % (options['post']['content_filename'], counter)
+                    counter += 1
+            else:
+                log.debug('Cannot ensure content_filename is unique '
+                          'when adding to a remote transmission daemon.')
+
+            for index in main_list:
+                file_ext = os.path.splitext(fl[r.id][index]['name'])[1]
+                log.debug('File %s renamed to %s' % (fl[r.id][index]['name'], filename + file_ext))
+                # change to below when set_files will allow setting name, more efficient to have one call
+                # fl[r.id][index]['name'] = os.path.basename(pathscrub(filename + file_ext).encode('utf-8'))
+                try:
+                    cli.rename_torrent_path(r.id, fl[r.id][index]['name'],
+                                            os.path.basename(str(pathscrub(filename + file_ext))))
+                except TransmissionError:
+                    log.error('content_filename only supported with transmission 2.8+')
+
+        if options['post'].get('main_file_only') and main_id is not None:
+            # Set Unwanted Files
+            options['change']['files_unwanted'] = [x for x in full_list if x not in dl_list]
+            options['change']['files_wanted'] = dl_list
+            log.debug('Downloading %s of %s files in torrent.',
+                      len(options['change']['files_wanted']), len(full_list))
+        elif (not options['post'].get('main_file_only') or main_id is None) and skip_files:
+            # If no main file and we want to skip files
+
+            if len(skip_list) >= len(full_list):
+                log.debug('skip_files filter would cause no files to be downloaded; '
+                          'including all files in torrent.')
+            else:
+                options['change']['files_unwanted'] = skip_list
+                options['change']['files_wanted'] = [x for x in full_list if x not in skip_list]
+                log.debug('Downloading %s of %s files in torrent.',
+                          len(options['change']['files_wanted']), len(full_list))
 
     def on_task_learn(self, task, config):
         """ Make sure all temp files are cleaned up when entries are learned """
@@ -648,7 +755,7 @@ class PluginTransmissionClean(TransmissionBase):
         if not config['enabled'] or task.options.learn:
             return
         if not self.client:
-            self.client = self.create_rpc_client(config)
+            self.client = self.get_rpc_client(config)
         nrat = float(config['min_ratio']) if 'min_ratio' in config else None
         nfor = parse_timedelta(config['finished_for']) if 'finished_for' in config else None
         delete_files = bool(config['delete_files']) if 'delete_files' in config else False
@@ -657,7 +764,14 @@ class PluginTransmissionClean(TransmissionBase):
         preserve_tracker_re = re.compile(config['preserve_tracker'], re.IGNORECASE) if 'preserve_tracker' in config else None
         directories_re = config.get('directories')
 
-        session = self.client.get_session()
+        try:
+            session = self.client.get_session()
+        except TransmissionError as e:
+            if not self.is_connection_error(e):
+                raise
+            log.verbose('Lost connection to transmission, reconnecting')
+            self.client = self.reconnect_rpc_client(config)
+            session = self.client.get_session()
 
         remove_ids = []
         for torrent in self.client.get_torrents():
@@ -19,7 +19,7 @@ from flexget.event import event
 from flexget.manager import manager
 from flexget.config_schema import one_or_more
 from flexget.utils import requests
-from flexget.utils.tools import get_config_hash
+from flexget.utils.tools import get_config_hash, LatencyHistogram
 
 try:
     from irc_bot.simple_irc_bot import SimpleIRCBot, partial
@@ -68,7 +68,7 @@ schema = {
                                     'items': {
                                         'type': 'object',
                                         'properties': {
-                                            'regexp': {'type': 'string'},
+                                            'regexp': {'type': 'string', 'format': 'regex'},
                                             'field': {'type': 'string'}
                                         },
                                         'required': ['regexp', 'field'],
@@ -82,6 +82,7 @@ schema = {
                         }
                     },
                     'queue_size': {'type': 'integer', 'default': 1},
+                    'queue_timeout': {'type': 'integer', 'minimum': 1},
                     'use_ssl': {'type': 'boolean', 'default': False},
                     'task_delay': {'type': 'integer'},
                 },
@@ -109,6 +110,9 @@ irc_connections = {}
 irc_manager = None
 # To avoid having to restart the connections whenever the config updated event is fired (which is apparently a lot)
 config_hash = {}
+# Time from announce until the entry made it through the output phase of its task, per connection name.
+# Kept here so the counts survive reconnects.
+announce_latency = {}
 
 
 def create_thread(name, conn):
@@ -122,6 +126,40 @@ def create_thread(name, conn):
     return thread
 
 
+def compile_task_routes(tasks_re):
+    """
+    Compiles the `task_re` config of a connection once, instead of for every announced entry.
+
+    :param tasks_re: List of dicts with task name and patterns
+    :return: List of (task name, [(field, compiled regexp), ...]) tuples
+    """
+    return [(task_config['task'], [(pattern['field'], re.compile(pattern['regexp'], re.IGNORECASE))
+                                   for pattern in task_config['patterns']])
+            for task_config in tasks_re]
+
+
+def route_entries(routes, entries):
+    """
+    Maps entries to the tasks whose patterns all match them.
+
+    :param routes: Task routes from :func:`compile_task_routes`
+    :param entries: Entries to route
+    :return: Dict of task names to lists of entries
+    """
+    tasks_entry_map = {}
+    for entry in entries:
+        matched = False
+        for task, patterns in routes:
+            # the entry is added to the task map if all of the defined regex matched
+            if all(rx.search(entry.get(field, '')) for field, rx in patterns):
+                matched = True
+                tasks_entry_map.setdefault(task, []).append(entry)
+
+        if not matched:
+            log.debug('Entry "%s" did not match any task regexp.', entry['title'])
+    return tasks_entry_map
+
+
 def irc_prefix(var):
     """
     Prefix a string with the irc_
@@ -158,6 +196,7 @@ class MissingConfigOption(Exception):
 class IRCConnection(SimpleIRCBot):
     def __init__(self, config, config_name):
         self.config = config
+        self.config_name = config_name
         self.connection_name = config_name
         self.tracker_config = None
         self.server_list = []
@@ -250,6 +289,10 @@ class IRCConnection(SimpleIRCBot):
 
         self.inject_before_shutdown = False
         self.entry_queue = []
+        # Incremented every time the queue is emptied, so a queue timeout can tell whether its batch is still queued
+        self.batch_number = 0
+        self.run_pending = False
+        self.task_routes = compile_task_routes(config.get('task_re', []))
         self.line_cache = {}
         self.processing_message = False  # if set to True, it means there's a message processing queued
         self.thread = create_thread(self.connection_name, self)
@@ -376,55 +419,57 @@ class IRCConnection(SimpleIRCBot):
         Passes entries to the target task(s) configured for this connection
         :return:
         """
+        self.run_pending = False
+        if not self.entry_queue:
+            return
+        entries, self.entry_queue = self.entry_queue, []
+        self.batch_number += 1
         tasks = self.config.get('task')
-        tasks_re = self.config.get('task_re')
         if tasks:
             if isinstance(tasks, basestring):
                 tasks = [tasks]
-            log.debug('Injecting %d entries into tasks %s', len(self.entry_queue), ', '.join(tasks))
-            options = {'tasks': tasks, 'cron': True, 'inject': self.entry_queue, 'allow_manual': True}
+            log.debug('Injecting %d entries into tasks %s', len(entries), ', '.join(tasks))
+            options = {'tasks': tasks, 'cron': True, 'inject': entries, 'allow_manual': True}
             manager.execute(options=options, priority=5, suppress_warnings=['input'])
 
-        if tasks_re:
-            tasks_entry_map = {}
-            for entry in self.entry_queue:
-                matched = False
-                for task_config in tasks_re:
-                    pattern_match = 0
-                    for pattern in task_config.get('patterns'):
-                        if re.search(pattern['regexp'], entry.get(pattern['field'], ''), re.IGNORECASE):
-                            pattern_match += 1
-
-                    # the entry is added to the task map if all of the defined regex matched
-                    if len(task_config.get('patterns')) == pattern_match:
-                        matched = True
-                        if not tasks_entry_map.get(task_config.get('task')):
-                            tasks_entry_map[task_config.get('task')] = []
-                        tasks_entry_map[task_config.get('task')].append(entry)
-
-                if not matched:
-                    log.debug('Entry "%s" did not match any task regexp.', entry['title'])
-
-            for task, entries in tasks_entry_map.items():
-                log.debug('Injecting %d entries into task "%s"', len(entries), task)
-                options = {'tasks': [task], 'cron': True, 'inject': entries, 'allow_manual': True}
+        if self.task_routes:
+            for task, task_entries in route_entries(self.task_routes, entries).items():
+                log.debug('Injecting %d entries into task "%s"', len(task_entries), task)
+                options = {'tasks': [task], 'cron': True, 'inject': task_entries, 'allow_manual': True}
                 manager.execute(options=options, priority=5, suppress_warnings=['input'])
 
-        self.entry_queue = []
+    def submit_queue(self):
+        """Runs the tasks for the queued entries, after `task_delay` if one is configured."""
+        if self.config.get('task_delay'):
+            if not self.run_pending:
+                self.run_pending = True
+                self.schedule.queue_command(self.config['task_delay'], self.run_tasks, unique=False)
+        else:
+            self.run_tasks()
+
+    def queue_timeout(self, batch_number):
+        """Submits the queue if the batch started when this timeout was scheduled has not been submitted yet."""
+        if batch_number == self.batch_number and self.entry_queue:
+            log.debug('Queue timeout reached, submitting %d entries', len(self.entry_queue))
+            self.submit_queue()
 
     def queue_entry(self, entry):
         """
-        Stores an entry in the connection entry queue, if the queue is over the size limit then submit them
+        Stores an entry in the connection entry queue, if the queue is over the size limit then submit them.
+        If `queue_timeout` is configured, a partial queue is submitted once that many seconds have passed since its
+        first entry was queued.
         :param entry: Entry to be queued
         :return:
         """
+        entry['irc_announce_time'] = time.time()
+        entry['irc_connection'] = self.config_name
         self.entry_queue.append(entry)
         log.debug('Entry: %s', entry)
         if len(self.entry_queue) >= self.config['queue_size']:
-            if self.config.get('task_delay'):
-                self.schedule.queue_command(self.config['task_delay'], self.run_tasks, unique=False)
-            else:
-                self.run_tasks()
+            self.submit_queue()
+        elif len(self.entry_queue) == 1 and self.config.get('queue_timeout'):
+            self.schedule.queue_command(self.config['queue_timeout'], partial(self.queue_timeout, self.batch_number),
+                                        unique=False)
 
     def match_message_patterns(self, patterns, msg):
         """
@@ -945,6 +990,7 @@ class IRCConnectionManager(object):
         status[name]['connected_channels'] = connection.connected_channels
         status[name]['server'] = connection.servers[0]
         status[name]['port'] = connection.port
+        status[name]['announce_latency'] = announce_latency.setdefault(name, LatencyHistogram()).to_dict()
 
         return status
 
@@ -1017,6 +1063,17 @@ def irc_update_config(manager):
         irc_manager = IRCConnectionManager(config)
 
 
+@event('task.execute.completed')
+def record_announce_latency(task):
+    """Records how long announced entries took to make it through the output phase of their task."""
+    now = time.time()
+    for entry in task.accepted:
+        announced = entry.get('irc_announce_time')
+        if announced:
+            histogram = announce_latency.setdefault(entry.get('irc_connection'), LatencyHistogram())
+            histogram.add(now - announced)
+
+
 @event('manager.shutdown_requested')
 def shutdown_requested(manager):
     stop_irc(manager, wait=True)
@@ -9,6 +9,119 @@ from flexget.utils.tools import aggregate_inputs
 
 log = logging.getLogger('crossmatch')
 
+#: Length of the substrings strings are indexed by for non exact matching
+NGRAM_SIZE = 3
+
+
+def values_intersect(v1, v2, exact=True):
+    """True if `v1` equals `v2`, or when not `exact` either one contains the other."""
+    try:
+        return v1 == v2 or not exact and (v2 in v1 or v1 in v2)
+    except TypeError as e:
+        # argument of type <type> is not iterable
+        log.trace('error matching fields: %s', str(e))
+        return False
+
+
+def ngrams(text):
+    return set(text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1))
+
+
+class FieldIndex(object):
+    """
+    Values of one field of many entries, indexed to find the ones intersecting with a value without comparing it to
+    each of them.
+
+    Hashable values are looked up by equality. When not matching exactly, strings are indexed by their n-grams
+    instead: a string can only contain another one if it has all of its n-grams. Other values are compared one by one.
+    """
+
+    def __init__(self, values, exact=True, reverse=False):
+        """
+        :param values: List of (position, value) pairs
+        :param bool exact: Only match equal values, not ones containing each other
+        :param bool reverse: True if the indexed values are the first argument to :func:`values_intersect`
+        """
+        self.values = values
+        self.exact = exact
+        self.reverse = reverse
+        self.comparisons = 0
+        # Value to indexes in `values`, for hashable values
+        self.equal = {}
+        # Indexes of the values which are compared one by one
+        self.others = []
+        # Indexes of strings by the rarest of their n-grams, and of strings too short to have one
+        self.keyed = {}
+        self.short = []
+        # N-gram to indexes of the strings which have it
+        self.postings = {}
+        self.string_count = 0
+
+        string_grams = []
+        for i, (_, value) in enumerate(values):
+            kind = self._kind(value)
+            if kind == 'string':
+                self.string_count += 1
+                grams = ngrams(value)
+                if not grams:
+                    self.short.append(i)
+                    continue
+                string_grams.append((i, grams))
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(i)
+            elif kind == 'hashable':
+                self.equal.setdefault(value, []).append(i)
+            else:
+                self.others.append(i)
+        for i, grams in string_grams:
+            rarest = min(grams, key=lambda gram: len(self.postings[gram]))
+            self.keyed.setdefault(rarest, []).append(i)
+
+    def _kind(self, value):
+        if not self.exact and isinstance(value, str):
+            return 'string'
+        try:
+            hash(value)
+        except TypeError:
+            return 'other'
+        # Values which can contain others have to be compared one by one when not matching exactly
+        if self.exact or not (hasattr(value, '__contains__') or hasattr(value, '__iter__')):
+            return 'hashable'
+        return 'other'
+
+    def _strings(self, value):
+        """Indexes of the strings which may contain `value` or be contained in it."""
+        grams = ngrams(value)
+        # Strings contained in value have their rarest n-gram in it
+        found = set(self.short)
+        for gram in grams:
+            found.update(self.keyed.get(gram, ()))
+        # Strings containing value have all of its n-grams
+        if not grams:
+            found.update(i for i, (_, v) in enumerate(self.values) if isinstance(v, str))
+        elif all(gram in self.postings for gram in grams):
+            found.update(min((self.postings[gram] for gram in grams), key=len))
+        return found
+
+    def matching(self, value):
+        """Yields the positions of the indexed values intersecting with `value`."""
+        kind = self._kind(value)
+        if kind == 'string':
+            candidates = self._strings(value).union(self.others)
+        elif kind == 'hashable':
+            candidates = set(self.equal.get(value, ())).union(self.others)
+        else:
+            candidates = range(len(self.values))
+        for i in sorted(candidates):
+            position, indexed_value = self.values[i]
+            self.comparisons += 1
+            if self.reverse:
+                intersect = values_intersect(indexed_value, value, self.exact)
+            else:
+                intersect = values_intersect(value, indexed_value, self.exact)
+            if intersect:
+                yield position
+
 
 class CrossMatch(object):
     """
@@ -42,25 +155,71 @@ class CrossMatch(object):
     def on_task_filter(self, task, config):
 
         fields = config['fields']
-        action = config['action']
-        all_fields = config['all_fields']
+        exact = config.get('exact')
 
         match_entries = aggregate_inputs(task, config['from'])
+        entries = list(task.entries)
+        matches = self.find_matches(entries, match_entries, fields, exact)
 
         # perform action on intersecting entries
-        for entry in task.entries:
-            for generated_entry in match_entries:
-                log.trace('checking if %s matches %s', entry['title'], generated_entry['title'])
-                common = self.entry_intersects(entry, generated_entry, fields, config.get('exact'))
-                if common and (not all_fields or len(common) == len(fields)):
-                    msg = 'intersects with %s on field(s) %s' % (generated_entry['title'], ', '.join(common))
-                    for key in generated_entry:
-                        if key not in entry:
-                            entry[key] = generated_entry[key]
-                    if action == 'reject':
-                        entry.reject(msg)
-                    if action == 'accept':
-                        entry.accept(msg)
+        for position, entry in enumerate(entries):
+            matching = matches.get(position, {})
+            for match_position in sorted(matching):
+                common = [field for field in fields if field in matching[match_position]]
+                if self.apply_match(entry, match_entries[match_position], common, config):
+                    # A compared field was copied from the generated entry, compare the next ones with its new value
+                    for generated_entry in match_entries[match_position + 1:]:
+                        common = self.entry_intersects(entry, generated_entry, fields, exact)
+                        self.apply_match(entry, generated_entry, common, config)
+                    break
+
+    def find_matches(self, entries, match_entries, fields, exact=True):
+        """
+        Finds the pairs of entries with fields in common, by indexing the fields of the smaller list and looking up
+        the values of the other one.
+
+        :return: Dict from position in `entries` to dicts from position in `match_entries` to the set of fields in
+            common.
+        """
+        reverse = len(entries) < len(match_entries)
+        indexed, probing = (entries, match_entries) if reverse else (match_entries, entries)
+        matches = {}
+        comparisons = 0
+        for field in set(fields):
+            # Doesn't really make sense to match if field is not in both entries
+            index = FieldIndex([(i, e[field]) for i, e in enumerate(indexed) if field in e], exact, reverse)
+            for probe_position, probe in enumerate(probing):
+                if field not in probe:
+                    continue
+                for indexed_position in index.matching(probe[field]):
+                    position, match_position = ((indexed_position, probe_position) if reverse else
+                                                (probe_position, indexed_position))
+                    matches.setdefault(position, {}).setdefault(match_position, set()).add(field)
+            comparisons += index.comparisons
+        total = len(entries) * len(match_entries) * len(set(fields))
+        log.debug('Compared %s field values, saved %s of %s comparisons', comparisons, total - comparisons, total)
+        return matches
+
+    def apply_match(self, entry, generated_entry, common, config):
+        """
+        Runs the configured action on `entry` if it has enough fields in `common` with `generated_entry`, and copies
+        the fields it does not have yet from it.
+
+        :return: True if one of the compared fields was copied.
+        """
+        if not common or config['all_fields'] and len(common) != len(config['fields']):
+            return False
+        msg = 'intersects with %s on field(s) %s' % (generated_entry['title'], ', '.join(common))
+        copied = False
+        for key in generated_entry:
+            if key not in entry:
+                entry[key] = generated_entry[key]
+                copied = copied or key in config['fields']
+        if config['action'] == 'reject':
+            entry.reject(msg)
+        if config['action'] == 'accept':
+            entry.accept(msg)
+        return copied
 
     def entry_intersects(self, e1, e2, fields=None, exact=True):
         """
@@ -81,17 +240,10 @@ class CrossMatch(object):
                 log.trace('field %s is not in both entries', field)
                 continue
 
-            v1 = e1[field]
-            v2 = e2[field]
-
-            try:
-                if v1 == v2 or not exact and (v2 in v1 or v1 in v2):
-                    common_fields.append(field)
-                else:
-                    log.trace('not matching')
-            except TypeError as e:
-                # argument of type <type> is not iterable
-                log.trace('error matching fields: %s', str(e))
+            if values_intersect(e1[field], e2[field], exact):
+                common_fields.append(field)
+            else:
+                log.trace('not matching')
 
         return common_fields
 
@@ -31,17 +31,51 @@ class Duplicates(object):
     def on_task_filter(self, task, config):
         field = config['field']
         action = config['action']
-        for entry in task.entries:
-            for prospect in task.entries:
-                if entry == prospect:
+        entries = list(task.entries)
+        # Entries by value of the field in task order, unhashable values are compared one by one
+        groups = {}
+        unhashable = []
+        for entry in entries:
+            value = entry.get(field)
+            if value is None:
+                continue
+            try:
+                groups.setdefault(value, []).append(entry)
+            except TypeError:
+                unhashable.append(entry)
+        # Position of the first entry in each group which may still be in task.entries
+        starts = {}
+        comparisons = 0
+        for entry in entries:
+            value = entry.get(field)
+            if value is None or not (entry.undecided or entry.accepted):
+                continue
+            try:
+                group = groups[value]
+            except TypeError:
+                group = unhashable
+                start = 0
+            else:
+                # Rejected and failed entries do not come back, skip them for good
+                start = starts.get(value, 0)
+                while start < len(group) and not (group[start].undecided or group[start].accepted):
+                    start += 1
+                starts[value] = start
+            for prospect in group[start:]:
+                comparisons += 1
+                if entry == prospect or not (prospect.undecided or prospect.accepted):
                     continue
-                if entry.get(field) is not None and entry[field] == prospect.get(field):
+                if entry[field] == prospect.get(field):
                     msg = 'Field {} value {} equals on {} and {}'.format(
                         field, entry[field], entry['title'], prospect['title'])
                     if action == 'accept':
                         entry.accept(msg)
                     else:
                         entry.reject(msg)
+                    # Accepting or rejecting again would not change anything
+                    break
+        log.debug('Compared %s entries, saved %s of %s comparisons', comparisons, len(entries) ** 2 - comparisons,
+                  len(entries) ** 2)
 
 
 @event('plugin.register')
@@ -11,6 +11,9 @@ from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.event import event
 from flexget.plugin import get_plugin_by_name
+from flexget.plugins.parsers.plugin_parsing import default_parsers, selected_parsers
+from flexget.utils.dir_index import index, DIR, FILE
+from flexget.utils.qualities import Quality
 from flexget.utils.tools import TimedDict
 
 log = logging.getLogger('exists_movie')
@@ -52,6 +55,11 @@ class FilterExistsMovie(object):
     def __init__(self):
         self.cache = TimedDict(cache_time='1 hour')
 
+    @staticmethod
+    def parse(name):
+        movie = get_plugin_by_name('parsing').instance.parse_movie(name)
+        return [movie.name, movie.year, str(movie.quality)]
+
     def prepare_config(self, config):
         # if config is not a dict, assign value to 'path' key
         if not isinstance(config, dict):
@@ -82,55 +90,65 @@ class FilterExistsMovie(object):
         # list of imdb ids gathered from paths / cache
         qualities = {}
 
+        parser_name = selected_parsers.get('movie') or default_parsers['movie']
         for folder in config['path']:
             folder = Path(folder).expanduser()
-            # see if this path has already been scanned
-            cached_qualities = self.cache.get(folder, None)
-            if cached_qualities:
+            if not folder.isdir():
+                log.critical('Path %s does not exist' % folder)
+                continue
+
+            scanned = index.scan(folder)
+            # see if this path has already been scanned, and nothing in it changed since
+            signature = [(directory.path, directory.mtime) for directory, _ in scanned]
+            cache_key = (folder, config['type'], config.get('lookup'))
+            cached = self.cache.get(cache_key, None)
+            if cached and cached[0] == signature:
                 log.verbose('Using cached scan for %s ...' % folder)
-                qualities.update(cached_qualities)
+                qualities.update(cached[1])
                 continue
 
             path_ids = {}
 
-            if not folder.isdir():
-                log.critical('Path %s does not exist' % folder)
-                continue
-
             log.verbose('Scanning path %s ...' % folder)
 
             # Help debugging by removing a lot of noise
             # logging.getLogger('movieparser').setLevel(logging.WARNING)
             # logging.getLogger('imdb_lookup').setLevel(logging.WARNING)
 
+            # names are only parsed again in directories which changed since the last scan
+            flags = DIR if config.get('type') == 'dirs' else FILE
+            parsed = {}
+            for directory, _ in scanned:
+                parsed.update(index.parsed(directory, 'movie|%s' % parser_name, self.parse, flags))
+
             # scan through
             items = []
-            if config.get('type') == 'dirs':
-                for d in folder.walkdirs(errors='ignore'):
-                    if self.dir_pattern.search(d.name):
+            for path, path_flags in index.walk(folder, scanned=scanned):
+                if not path_flags & flags:
+                    continue
+                if config.get('type') == 'dirs':
+                    if self.dir_pattern.search(path.name):
                         continue
-                    log.debug('detected dir with name %s, adding to check list' % d.name)
-                    items.append(d.name)
-            elif config.get('type') == 'files':
-                for f in folder.walkfiles(errors='ignore'):
-                    if not self.file_pattern.search(f.name):
+                    log.debug('detected dir with name %s, adding to check list' % path.name)
+                elif config.get('type') == 'files':
+                    if not self.file_pattern.search(path.name):
                         continue
-                    log.debug('detected file with name %s, adding to check list' % f.name)
-                    items.append(f.name)
+                    log.debug('detected file with name %s, adding to check list' % path.name)
+                items.append((path.name, parsed[path.name]))
 
             if not items:
                 log.verbose('No items with type %s were found in %s' % (config.get('type'), folder))
                 continue
 
-            for item in items:
+            for item, (movie_name, movie_year, movie_quality) in items:
                 count_files += 1
 
-                movie = get_plugin_by_name('parsing').instance.parse_movie(item)
+                movie_quality = Quality(movie_quality)
 
                 if config.get('lookup') == 'imdb':
                     try:
-                        imdb_id = imdb_lookup.imdb_id_lookup(movie_title=movie.name,
-                                                             movie_year=movie.year,
+                        imdb_id = imdb_lookup.imdb_id_lookup(movie_title=movie_name,
+                                                             movie_year=movie_year,
                                                              raw_title=item,
                                                              session=task.session)
                         if imdb_id in path_ids:
@@ -138,16 +156,16 @@ class FilterExistsMovie(object):
                             continue
                         if imdb_id is not None:
                             log.trace('adding: %s' % imdb_id)
-                            path_ids[imdb_id] = movie.quality
+                            path_ids[imdb_id] = movie_quality
                     except plugin.PluginError as e:
                         log.trace('%s lookup failed (%s)' % (item, e.value))
                         incompatible_files += 1
                 else:
-                    path_ids[movie.name] = movie.quality
-                    log.trace('adding: %s' % movie.name)
+                    path_ids[movie_name] = movie_quality
+                    log.trace('adding: %s' % movie_name)
 
             # store to cache and extend to found list
-            self.cache[folder] = path_ids
+            self.cache[cache_key] = (signature, path_ids)
             qualities.update(path_ids)
 
         log.debug('-- Start filtering entries ----------------------------------')
@@ -9,9 +9,14 @@ from path import Path
 from flexget import plugin
 from flexget.event import event
 from flexget.config_schema import one_or_more
+from flexget.utils import qualities
+from flexget.utils.dir_index import index
 from flexget.utils.log import log_once
 from flexget.utils.template import RenderError
+from flexget.utils.titles.series import SeriesParserProfile
+from flexget.plugins.filter.series import normalize_series_name
 from flexget.plugins.parsers import ParseWarning
+from flexget.plugins.parsers.plugin_parsing import default_parsers, selected_parsers
 from flexget.plugin import get_plugin_by_name
 
 log = logging.getLogger('exists_series')
@@ -50,18 +55,36 @@ class FilterExistsSeries(object):
             config['path'] = [config['path']]
         return config
 
+    @staticmethod
+    def parse(filename, name=None):
+        """
+        :param name: Name of the series to look for, guessed from `filename` if not given.
+        :return: Normalized series name, identifier, quality and proper count of an episode in `filename`, or None.
+        """
+        kwargs = {'name': name} if name else {}
+        try:
+            disk_parser = get_plugin_by_name('parsing').instance.parse_series(data=filename, **kwargs)
+        except ParseWarning as pw:
+            disk_parser = pw.parsed
+            log_once(pw.value, logger=log)
+        if not disk_parser.valid:
+            return None
+        return [normalize_series_name(disk_parser.name), disk_parser.identifier, str(disk_parser.quality),
+                disk_parser.proper_count]
+
     @plugin.priority(-1)
     def on_task_filter(self, task, config):
         if not task.accepted:
             log.debug('Scanning not needed')
             return
         config = self.prepare_config(config)
+        # Accepted entries by normalized series name
         accepted_series = {}
         paths = set()
         for entry in task.accepted:
             if 'series_parser' in entry:
                 if entry['series_parser'].valid:
-                    accepted_series.setdefault(entry['series_parser'].name, []).append(entry)
+                    accepted_series.setdefault(normalize_series_name(entry['series_parser'].name), []).append(entry)
                     for folder in config['path']:
                         try:
                             paths.add(entry.render(folder))
@@ -73,52 +96,65 @@ class FilterExistsSeries(object):
             log.warning('No accepted entries have series information. exists_series cannot filter them')
             return
 
-        # scan through
         # For speed, only test accepted entries since our priority should be after everything is accepted.
-        for series in accepted_series:
-            # make new parser from parser in entry
-            series_parser = accepted_series[series][0]['series_parser']
-            for folder in paths:
-                folder = Path(folder).expanduser()
-                if not folder.isdir():
-                    log.warning('Directory %s does not exist', folder)
+        directories = []
+        for folder in paths:
+            folder = Path(folder).expanduser()
+            if not folder.isdir():
+                log.warning('Directory %s does not exist', folder)
+                continue
+            directories.extend(directory for directory, _ in index.scan(folder))
+
+        # Names are matched with the same regexps the series parser uses, years and country codes are optional in them
+        names = dict((series, entries[0]['series_parser'].name) for series, entries in accepted_series.items())
+        name_regexps = dict((series, SeriesParserProfile.get(name).name_regexps) for series, name in names.items())
+
+        # Each name is parsed once for all series, the results are stored in the index
+        key = 'series|%s' % selected_parsers.get('series', default_parsers.get('series'))
+        for directory in directories:
+            for filename, guessed in index.parsed(directory, key, self.parse).items():
+                for series, entries in accepted_series.items():
+                    parsed = guessed
+                    if parsed is None or parsed[0] != series:
+                        if not any(name_re.search(filename) for name_re in name_regexps[series]):
+                            continue
+                        # The guessed name is different, e.g. it has a year the series name does not have
+                        parsed = self.parse(filename, names[series])
+                        if parsed is None:
+                            continue
+                    self.reject_existing(config, entries, filename, parsed)
+
+    @staticmethod
+    def reject_existing(config, entries, filename, parsed):
+        """Rejects the `entries` of a series which are the episode in `filename` or a worse version of it."""
+        series, identifier, quality, proper_count = parsed
+        quality = qualities.Quality(quality)
+        log.debug('name %s is same series as %s', filename, series)
+        log.debug('disk_parser.identifier = %s', identifier)
+        log.debug('disk_parser.quality = %s', quality)
+        log.debug('disk_parser.proper_count = %s', proper_count)
+
+        for entry in entries:
+            log.debug('series_parser.identifier = %s', entry['series_parser'].identifier)
+            if identifier != entry['series_parser'].identifier:
+                log.trace('wrong identifier')
+                continue
+            log.debug('series_parser.quality = %s', entry['series_parser'].quality)
+            if config.get('allow_different_qualities') == 'better':
+                if entry['series_parser'].quality > quality:
+                    log.trace('better quality')
                     continue
-
-                for filename in folder.walk(errors='ignore'):
-                    # run parser on filename data
-                    try:
-                        disk_parser = get_plugin_by_name('parsing').instance.parse_series(data=filename.name,
-                                                                                          name=series_parser.name)
-                    except ParseWarning as pw:
-                        disk_parser = pw.parsed
-                        log_once(pw.value, logger=log)
-                    if disk_parser.valid:
-                        log.debug('name %s is same series as %s', filename.name, series)
-                        log.debug('disk_parser.identifier = %s', disk_parser.identifier)
-                        log.debug('disk_parser.quality = %s', disk_parser.quality)
-                        log.debug('disk_parser.proper_count = %s', disk_parser.proper_count)
-
-                        for entry in accepted_series[series]:
-                            log.debug('series_parser.identifier = %s', entry['series_parser'].identifier)
-                            if disk_parser.identifier != entry['series_parser'].identifier:
-                                log.trace('wrong identifier')
-                                continue
-                            log.debug('series_parser.quality = %s', entry['series_parser'].quality)
-                            if config.get('allow_different_qualities') == 'better':
-                                if entry['series_parser'].quality > disk_parser.quality:
-                                    log.trace('better quality')
-                                    continue
-                            elif config.get('allow_different_qualities'):
-                                if disk_parser.quality != entry['series_parser'].quality:
-                                    log.trace('wrong quality')
-                                    continue
-                            log.debug('entry parser.proper_count = %s', entry['series_parser'].proper_count)
-                            if disk_parser.proper_count >= entry['series_parser'].proper_count:
-                                entry.reject('episode already exists')
-                                continue
-                            else:
-                                log.trace('new one is better proper, allowing')
-                                continue
+            elif config.get('allow_different_qualities'):
+                if quality != entry['series_parser'].quality:
+                    log.trace('wrong quality')
+                    continue
+            log.debug('entry parser.proper_count = %s', entry['series_parser'].proper_count)
+            if proper_count >= entry['series_parser'].proper_count:
+                entry.reject('episode already exists')
+                continue
+            else:
+                log.trace('new one is better proper, allowing')
+                continue
 
 
 @event('plugin.register')
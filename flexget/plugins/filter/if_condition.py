@@ -4,15 +4,15 @@ from future.moves import builtins
 
 import logging
 import datetime
-from copy import copy
 
-from jinja2 import UndefinedError
+from jinja2 import UndefinedError, TemplateSyntaxError, meta
 
 from flexget import plugin
 from flexget.event import event
 from flexget.task import Task
 from flexget.entry import Entry
-from flexget.utils.template import evaluate_expression
+from flexget.utils import template
+from flexget.utils.template import compile_expression, evaluate_expression, RenderContext
 
 log = logging.getLogger('if')
 
@@ -35,27 +35,50 @@ class FilterIf(object):
         }
     }
 
+    def prefetch_fields(self, config):
+        """Entry fields used in the conditions, see `prefetch` plugin."""
+        fields = set()
+        for item in config:
+            for condition in item:
+                try:
+                    fields |= meta.find_undeclared_variables(template.environment.parse('{{ %s }}' % condition))
+                except TemplateSyntaxError:
+                    continue
+        # Names added to the namespace by `matching_entries`
+        return fields - {'has_field', 'timedelta', 'utcnow', 'now'}
+
     def check_condition(self, condition, entry):
         """Checks if a given `entry` passes `condition`"""
-        # Make entry fields and other utilities available in the eval namespace
-        # We need our namespace to be an Entry instance for lazy loading to work
-        eval_locals = copy(entry)
-        eval_locals.update({'has_field': lambda f: f in entry,
-                            'timedelta': datetime.timedelta,
-                            'utcnow': datetime.datetime.utcnow(),
-                            'now': datetime.datetime.now()})
+        return bool(list(self.matching_entries(condition, [entry])))
+
+    def matching_entries(self, condition, entries):
+        """Yields the `entries` which pass `condition`."""
         try:
-            # Restrict eval namespace to have no globals and locals only from eval_locals
-            passed = evaluate_expression(condition, eval_locals)
-            if passed:
-                log.debug('%s matched requirement %s' % (entry['title'], condition))
-            return passed
-        except UndefinedError as e:
-            # Extract the name that did not exist
-            missing_field = e.args[0].split('\'')[1]
-            log.debug('%s does not contain the field %s' % (entry['title'], missing_field))
+            compiled = compile_expression(condition)
         except Exception as e:
             log.error('Error occurred while evaluating statement `%s`. (%s)' % (condition, e))
+            return
+        # Utilities available in the eval namespace, the same for all entries
+        helpers = {'timedelta': datetime.timedelta,
+                   'utcnow': datetime.datetime.utcnow(),
+                   'now': datetime.datetime.now()}
+        for entry in entries:
+            # Entry fields are looked up in the entry itself, so that lazy fields only load when they are used
+            eval_locals = RenderContext({'has_field': entry.__contains__}, helpers, entry.store)
+            try:
+                # Restrict eval namespace to have no globals and locals only from eval_locals
+                passed = evaluate_expression(compiled, eval_locals)
+            except UndefinedError as e:
+                # Extract the name that did not exist
+                missing_field = e.args[0].split('\'')[1]
+                log.debug('%s does not contain the field %s' % (entry['title'], missing_field))
+                continue
+            except Exception as e:
+                log.error('Error occurred while evaluating statement `%s`. (%s)' % (condition, e))
+                continue
+            if passed:
+                log.debug('%s matched requirement %s' % (entry['title'], condition))
+                yield entry
 
     def __getattr__(self, item):
         """Provides handlers for all phases."""
@@ -72,7 +95,7 @@ class FilterIf(object):
                 'fail': Entry.fail}
             for item in config:
                 requirement, action = list(item.items())[0]
-                passed_entries = (e for e in task.entries if self.check_condition(requirement, e))
+                passed_entries = self.matching_entries(requirement, task.entries)
                 if isinstance(action, str):
                     if not phase == 'filter':
                         continue
@@ -105,6 +105,21 @@ class FilterImdb(object):
         'additionalProperties': False
     }
 
+    # Fields read for each option
+    option_fields = {
+        'min_year': 'imdb_year', 'max_year': 'imdb_year', 'min_votes': 'imdb_votes',
+        'min_meta_score': 'imdb_meta_score', 'min_score': 'imdb_score',
+        'accept_genres': 'imdb_genres', 'reject_genres': 'imdb_genres',
+        'reject_languages': 'imdb_languages', 'accept_languages': 'imdb_languages',
+        'reject_actors': 'imdb_actors', 'accept_actors': 'imdb_actors',
+        'reject_directors': 'imdb_directors', 'accept_directors': 'imdb_directors',
+        'reject_writers': 'imdb_writers', 'accept_writers': 'imdb_writers',
+        'reject_mpaa_ratings': 'imdb_mpaa_rating', 'accept_mpaa_ratings': 'imdb_mpaa_rating'}
+
+    def prefetch_fields(self, config):
+        """Fields this filter reads with given config, see `prefetch` plugin."""
+        return set(self.option_fields[option] for option in config if option in self.option_fields)
+
     # Run later to avoid unnecessary lookups
     @plugin.priority(120)
     def on_task_filter(self, task, config):
@@ -14,6 +14,116 @@ from future.moves.urllib.parse import unquote
 
 log = logging.getLogger('regexp')
 
+UNQUOTE_FIELDS = ['url']
+
+
+class EntryFields(object):
+    """Values of the fields of an entry as strings to search from, prepared once for all regexps."""
+
+    def __init__(self, entry):
+        self.entry = entry
+        self._values = {}
+        self._searchable = {}
+        self._excluded = {}
+
+    def values(self, field, eval_lazy):
+        key = (field, bool(eval_lazy))
+        if key not in self._values:
+            values = []
+            # Only evaluate lazy fields if find_from has been explicitly specified
+            if self.entry.get(field, eval_lazy=eval_lazy):
+                # Make all fields into lists for search purposes
+                values = self.entry[field]
+                if not isinstance(values, list):
+                    values = [values]
+                values = [value if isinstance(value, basestring) else str(value) for value in values]
+                if field in UNQUOTE_FIELDS:
+                    values = [unquote(value) for value in values]
+            self._values[key] = values
+        return self._values[key]
+
+    def searchable(self, options):
+        """Pairs of field name and values to search from for regexps with `options`."""
+        if options.eval_lazy:
+            # Lazy fields are only loaded when a regexp did not match any of the previous fields
+            return ((field, self.values(field, True)) for field in options.find_from)
+        if options not in self._searchable:
+            self._searchable[options] = [(field, self.values(field, False)) for field in options.find_from]
+        return self._searchable[options]
+
+    def excluded(self, field, options):
+        """True if any of the `not` regexps of `options` match `field`."""
+        key = (field, options)
+        if key not in self._excluded:
+            self._excluded[key] = False
+            for not_regexp in options.not_regexps:
+                if any(not_regexp.search(value) for value in self.values(field, True)):
+                    self.entry.trace('Configured not_regexp %s matched, ignored' % not_regexp)
+                    self._excluded[key] = True
+                    break
+        return self._excluded[key]
+
+
+class MatchOptions(object):
+    """The `from` and `not` options of a regexp, shared by all regexps configured with the same ones."""
+
+    def __init__(self, find_from, not_regexps):
+        self.find_from = find_from or ['title', 'description']
+        self.eval_lazy = bool(find_from)
+        self.not_regexps = not_regexps or []
+
+
+class CompiledRegexps(object):
+    """All the regexps of one operation, prepared for matching them to many entries."""
+
+    def __init__(self, regexps):
+        """:param regexps: list of {compiled_regexp: options} dictionaries"""
+        self.regexps = []
+        by_options = {}
+        for regexp_opts in regexps:
+            regexp, opts = list(regexp_opts.items())[0]
+            key = (tuple(opts.get('from') or []), tuple(not_regexp.pattern for not_regexp in opts.get('not') or []))
+            if key not in by_options:
+                by_options[key] = MatchOptions(opts.get('from'), opts.get('not'))
+            self.regexps.append((regexp, opts, by_options[key]))
+
+    def __len__(self):
+        return len(self.regexps)
+
+    def matches(self, entry):
+        """
+        Yields the first field each configured regexp matches in `entry`, or None if it does not match, in order.
+        """
+        fields = EntryFields(entry)
+        for regexp, _, options in self.regexps:
+            yield self._match(regexp.search, options, fields)
+
+    @staticmethod
+    def _match(search, options, fields):
+        for field, values in fields.searchable(options):
+            for value in values:
+                if search(value):
+                    # Make sure the not_regexps do not match for this field
+                    if not fields.excluded(field, options):
+                        return field
+                    break
+
+    def first_match(self, entry):
+        """
+        :return: Tuple of the index of the first configured regexp matching `entry` and the field it matched, or None.
+        """
+        for index, field in enumerate(self.matches(entry)):
+            if field:
+                return index, field
+
+    def first_mismatch(self, entry):
+        """
+        :return: Index of the first configured regexp not matching `entry`, or None if all of them match.
+        """
+        for index, field in enumerate(self.matches(entry)):
+            if not field:
+                return index
+
 
 class FilterRegexp(object):
     """
@@ -154,7 +264,8 @@ class FilterRegexp(object):
                 rest = leftovers
             else:
                 # If there is already something in rest, take the intersection with r (entries no operations matched)
-                rest = [entry for entry in leftovers if entry in rest]
+                rest_ids = set(id(entry) for entry in rest)
+                rest = [entry for entry in leftovers if id(entry) in rest_ids]
 
         if 'rest' in config:
             rest_method = Entry.accept if config['rest'] == 'accept' else Entry.reject
@@ -162,40 +273,6 @@ class FilterRegexp(object):
                 log.debug('Rest method %s for %s' % (config['rest'], entry['title']))
                 rest_method(entry, 'regexp `rest`')
 
-    def matches(self, entry, regexp, find_from=None, not_regexps=None):
-        """
-        Check if :entry: has any string fields or strings in a list field that match :regexp:
-
-        :param entry: Entry instance
-        :param regexp: Compiled regexp
-        :param find_from: None or a list of fields to search from
-        :param not_regexps: None or list of regexps that can NOT match
-        :return: Field matching
-        """
-        unquote_fields = ['url']
-        for field in find_from or ['title', 'description']:
-            # Only evaluate lazy fields if find_from has been explicitly specified
-            if not entry.get(field, eval_lazy=find_from):
-                continue
-            # Make all fields into lists for search purposes
-            values = entry[field]
-            if not isinstance(values, list):
-                values = [values]
-            for value in values:
-                if not isinstance(value, basestring):
-                    value = str(value)
-                if field in unquote_fields:
-                    value = unquote(value)
-                    # If none of the not_regexps match
-                if regexp.search(value):
-                    # Make sure the not_regexps do not match for this field
-                    for not_regexp in not_regexps or []:
-                        if self.matches(entry, not_regexp, find_from=[field]):
-                            entry.trace('Configured not_regexp %s matched, ignored' % not_regexp)
-                            break
-                    else:  # None of the not_regexps matched
-                        return field
-
     def filter(self, task, operation, regexps):
         """
         :param task: Task instance
@@ -208,31 +285,31 @@ class FilterRegexp(object):
         rest = []
         method = Entry.accept if 'accept' in operation else Entry.reject
         match_mode = 'excluding' not in operation
+        compiled = CompiledRegexps(regexps)
         for entry in task.entries:
-            log.trace('testing %i regexps to %s' % (len(regexps), entry['title']))
-            for regexp_opts in regexps:
-                regexp, opts = list(regexp_opts.items())[0]
-
-                # check if entry matches given regexp configuration
-                field = self.matches(entry, regexp, opts.get('from'), opts.get('not'))
-
-                # Run if we are in match mode and have a hit, or are in non-match mode and don't have a hit
-                if match_mode == bool(field):
-                    # Creates the string with the reason for the hit
-                    matchtext = 'regexp \'%s\' ' % regexp.pattern + ('matched field \'%s\'' %
-                                                                     field if match_mode else 'didn\'t match')
-                    log.debug('%s for %s' % (matchtext, entry['title']))
-                    # apply settings to entry and run the method on it
-                    if opts.get('path'):
-                        entry['path'] = opts['path']
-                    if opts.get('set'):
-                        # invoke set plugin with given configuration
-                        log.debug('adding set: info to entry:"%s" %s' % (entry['title'], opts['set']))
-                        set = plugin.get_plugin_by_name('set')
-                        set.instance.modify(entry, opts['set'])
-                    method(entry, matchtext)
-                    # We had a match so break out of the regexp loop.
-                    break
+            log.trace('testing %i regexps to %s' % (len(compiled), entry['title']))
+            if match_mode:
+                found = compiled.first_match(entry)
+                index, field = found if found else (None, None)
+            else:
+                index, field = compiled.first_mismatch(entry), None
+
+            # Run if we are in match mode and have a hit, or are in non-match mode and don't have a hit
+            if index is not None:
+                regexp, opts, _ = compiled.regexps[index]
+                # Creates the string with the reason for the hit
+                matchtext = 'regexp \'%s\' ' % regexp.pattern + ('matched field \'%s\'' %
+                                                                 field if match_mode else 'didn\'t match')
+                log.debug('%s for %s' % (matchtext, entry['title']))
+                # apply settings to entry and run the method on it
+                if opts.get('path'):
+                    entry['path'] = opts['path']
+                if opts.get('set'):
+                    # invoke set plugin with given configuration
+                    log.debug('adding set: info to entry:"%s" %s' % (entry['title'], opts['set']))
+                    set = plugin.get_plugin_by_name('set')
+                    set.instance.modify(entry, opts['set'])
+                method(entry, matchtext)
             else:
                 # We didn't run method for any of the regexps, add this entry to rest
                 entry.trace('None of configured %s regexps matched' % operation)
@@ -22,6 +22,10 @@ class FilterRequireField(object):
 
     schema = one_or_more({'type': 'string'})
 
+    def prefetch_fields(self, config):
+        """Fields this filter reads with given config, see `prefetch` plugin."""
+        return set([config] if isinstance(config, basestring) else config)
+
     @plugin.priority(32)
     def on_task_filter(self, task, config):
         if isinstance(config, basestring):
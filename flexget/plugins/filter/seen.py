@@ -15,7 +15,7 @@ import logging
 from datetime import datetime
 
 from sqlalchemy import Column, Integer, DateTime, Unicode, Boolean, or_, select, update, Index
-from sqlalchemy.orm import relation
+from sqlalchemy.orm import relation, contains_eager
 from sqlalchemy.schema import ForeignKey
 
 from flexget import db_schema, plugin
@@ -24,6 +24,7 @@ from flexget.manager import Session
 from flexget.utils.database import with_session
 from flexget.utils.imdb import extract_id
 from flexget.utils.sqlalchemy_utils import table_schema, table_add_column
+from flexget.utils.tools import chunked
 
 log = logging.getLogger('seen')
 Base = db_schema.versioned_base('seen', 4)
@@ -189,6 +190,30 @@ def search_by_field_values(field_value_list, task_name, local=False, session=Non
     return found.first()
 
 
+@with_session
+def search_by_field_values_many(field_values, task_name, local=False, session=None):
+    """
+    Batched version of :func:`search_by_field_values`, looks up all given values with a few queries.
+
+    :param field_values: Iterable of field values to match
+    :param task_name: Name of task to compare to in case local flag is sent
+    :param local: Local flag
+    :param session: Current session
+    :return: Dict mapping each matched value to the first SeenField having it, with `seen_entry` already loaded
+    """
+    found = {}
+    for chunk in chunked(list(set(field_values))):
+        query = (session.query(SeenField).join(SeenEntry).options(contains_eager(SeenField.seen_entry)).
+                 filter(SeenField.value.in_(chunk)))
+        if local:
+            query = query.filter(SeenEntry.task == task_name)
+        else:
+            query = query.filter(or_(SeenEntry.local == False, SeenEntry.local == None))
+        for seen_field in query.order_by(SeenField.id):
+            found.setdefault(seen_field.value, seen_field)
+    return found
+
+
 class FilterSeen(object):
     """
         Remembers previously downloaded content and rejects them in
@@ -244,8 +269,9 @@ class FilterSeen(object):
         fields = config.get('fields')
         local = config.get('local')
 
+        # construct list of values looked for each entry
+        entry_values = []
         for entry in task.entries:
-            # construct list of values looked
             values = []
             for field in fields:
                 if field not in entry:
@@ -253,16 +279,26 @@ class FilterSeen(object):
                 if entry[field] not in values and entry[field]:
                     values.append(str(entry[field]))
             if values:
-                log.trace('querying for: %s' % ', '.join(values))
-                # check if SeenField.value is any of the values
-                found = search_by_field_values(field_value_list=values, task_name=task.name, local=local,
-                                               session=task.session)
-                if found:
-                    log.debug("Rejecting '%s' '%s' because of seen '%s'" % (entry['url'], entry['title'], found.value))
-                    se = task.session.query(SeenEntry).filter(SeenEntry.id == found.seen_entry_id).one()
-                    entry.reject('Entry with %s `%s` is already marked seen in the task %s at %s' %
-                                 (found.field, found.value, se.task, se.added.strftime('%Y-%m-%d %H:%M')),
-                                 remember=remember_rejected)
+                entry_values.append((entry, values))
+        if not entry_values:
+            return
+
+        # check which SeenField.values are any of the values, for all entries at once
+        all_values = [value for _, values in entry_values for value in values]
+        log.trace('querying for %s values', len(all_values))
+        seen_fields = search_by_field_values_many(all_values, task_name=task.name, local=local,
+                                                  session=task.session)
+        for entry, values in entry_values:
+            matches = [seen_fields[value] for value in values if value in seen_fields]
+            if not matches:
+                continue
+            # The single entry lookup picked the oldest matching field, keep doing that
+            found = min(matches, key=lambda seen_field: seen_field.id)
+            log.debug("Rejecting '%s' '%s' because of seen '%s'" % (entry['url'], entry['title'], found.value))
+            se = found.seen_entry
+            entry.reject('Entry with %s `%s` is already marked seen in the task %s at %s' %
+                         (found.field, found.value, se.task, se.added.strftime('%Y-%m-%d %H:%M')),
+                         remember=remember_rejected)
 
     def on_task_learn(self, task, config):
         """Remember succeeded entries"""
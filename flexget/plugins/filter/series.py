@@ -32,7 +32,8 @@ from flexget.utils.sqlalchemy_utils import (
     table_columns, table_exists, drop_tables, table_schema, table_add_column, create_index
 )
 from flexget.utils.tools import (
-    merge_dict_from_to, parse_timedelta, parse_episode_identifier, get_config_as_array, chunked
+    merge_dict_from_to, parse_timedelta, parse_episode_identifier, get_config_as_array, chunked, get_config_hash,
+    LRUCache
 )
 
 SCHEMA_VER = 14
@@ -46,6 +47,9 @@ try:
 except AttributeError:
     preferred_clock = time.clock
 
+# Compiled SeriesMatchers, keyed on the hash of the series config they were built for
+series_matchers = LRUCache(max_size=20)
+
 
 @db_schema.upgrade('series')
 def upgrade(ver, session):
@@ -1353,6 +1357,69 @@ def populate_entry_fields(entry, parser, config):
             set.instance.modify(entry, config.get('set'))
 
 
+class SeriesMatcher(object):
+    """
+    Finds the configured series a title could belong to in a single pass over the title, without parsing it.
+
+    Names are compared the way regexps generated by `name_to_re` match them: case insensitive, ignoring non-word
+    characters and treating `&` the same as `and`. Every series the parser would match a title to is a candidate, but
+    not every candidate is a match. Series with a custom `name_regexp` are candidates for all titles.
+    """
+
+    # Length of the name prefixes indexed for lookups, shorter names are checked against every title
+    key_length = 3
+
+    def __init__(self, config):
+        """
+        :param list config: Series config as returned by :meth:`FilterSeries.prepare_config`
+        """
+        self.always = set()
+        self.short = []
+        self.index = defaultdict(list)
+        for position, series_item in enumerate(config):
+            series_name, series_config = list(series_item.items())[0]
+            if series_config.get('name_regexp'):
+                self.always.add(position)
+                continue
+            for name in [str(series_name)] + get_config_as_array(series_config, 'alternate_name'):
+                key = self.normalize(self.strip_parenthetical(str(name)))
+                if not key:
+                    self.always.add(position)
+                elif len(key) < self.key_length:
+                    self.short.append((key, position))
+                else:
+                    self.index[key[:self.key_length]].append((key, position))
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r'[^\w&]|_', '', text.lower(), flags=re.UNICODE).replace('&', 'and')
+
+    @staticmethod
+    def strip_parenthetical(name):
+        """Remove a parenthetical from the end of the name, it's optional for `name_to_re` regexps."""
+        if name.endswith(')'):
+            p_start = name.rfind('(')
+            if p_start != -1:
+                name = name[:p_start - 1]
+        return name
+
+    def candidates(self, title):
+        """
+        :param title: Title to match
+        :return: Set of positions in config of the series `title` could belong to
+        """
+        text = self.normalize(title)
+        found = set(self.always)
+        for key, position in self.short:
+            if key in text:
+                found.add(position)
+        for start in range(len(text) - self.key_length + 1):
+            for key, position in self.index.get(text[start:start + self.key_length], ()):
+                if text.startswith(key, start):
+                    found.add(position)
+        return found
+
+
 class FilterSeriesBase(object):
     """
     Class that contains helper methods for both filter.series as well as plugins that configure it,
@@ -1610,21 +1677,17 @@ class FilterSeries(FilterSeriesBase):
         config = self.prepare_config(config)
         self.auto_exact(config)
 
-        parser = get_plugin_by_name('parsing').instance
-
         start_time = preferred_clock()
 
-        # Sort Entries into data model similar to https://en.wikipedia.org/wiki/Trie
-        # Only process series if both the entry title and series title first letter match
+        # Find the series each entry could belong to, the parser will only be ran for those
+        config_hash = get_config_hash(config)
+        matcher = series_matchers.get(config_hash)
+        if not matcher:
+            matcher = series_matchers[config_hash] = SeriesMatcher(config)
         entries_map = defaultdict(list)
         for entry in task.entries:
-            parsed = parser.parse_series(entry['title'])
-            if parsed.name:
-                entries_map[parsed.name[:1].lower()].append(entry)
-            else:
-                # If parsing failed, use first char of each word in the entry title
-                for word in entry['title'].replace(' ', '.').split('.'):
-                    entries_map[word[:1].lower()].append(entry)
+            for position in matcher.candidates(entry['title']):
+                entries_map[position].append(entry)
 
         with Session() as session:
             # Preload series
@@ -1643,14 +1706,11 @@ class FilterSeries(FilterSeriesBase):
 
             existing_db_series = {s.name_normalized: s for s in existing_db_series}
 
-            for series_item in config:
+            for position, series_item in enumerate(config):
                 series_name, series_config = list(series_item.items())[0]
-                alt_names = get_config_as_array(series_config, 'alternate_name')
                 db_series = existing_db_series.get(normalize_series_name(series_name))
                 db_identified_by = db_series.identified_by if db_series else None
-                letters = set([series_name[:1].lower()] + [normalize_series_name(series_name)[:1].lower()] +
-                              [alt[:1].lower() for alt in alt_names])
-                entries = set([entry for letter in letters for entry in entries_map.get(letter, [])])
+                entries = entries_map.get(position)
                 if entries:
                     self.parse_series(entries, series_name, series_config, db_identified_by)
 
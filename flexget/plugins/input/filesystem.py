@@ -13,6 +13,7 @@ from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.event import event
 from flexget.entry import Entry
+from flexget.utils.dir_index import index, DIR, FILE, SYMLINK
 
 log = logging.getLogger('filesystem')
 
@@ -151,22 +152,33 @@ class Filesystem(object):
             return base_depth + recursion
 
     def get_folder_objects(self, folder, recursion):
+        """
+        :return: Pairs of the paths under `folder` and their :mod:`flexget.utils.dir_index` flags, from the index of
+            the directory tree, which only lists directories again when they changed.
+        """
         if recursion is False:
-            return folder.listdir()
+            return index.walk(folder, max_depth=0)
+        elif recursion is True:
+            return index.walk(folder)
         else:
-            return folder.walk(errors='ignore')
+            return index.walk(folder, max_depth=recursion - 1)
 
     def get_entries_from_path(self, path_list, match, recursion, test_mode, get_files, get_dirs, get_symlinks):
         entries = []
+        # Entries hash on title and url like they compare, keeps checking for duplicates cheap
+        seen = set()
 
         for folder in path_list:
             log.verbose('Scanning folder %s. Recursion is set to %s.' % (folder, recursion))
             folder = Path(folder).expanduser()
+            if not folder.isdir():
+                log.warning('Path %s does not exist' % folder)
+                continue
             log.debug('Scanning %s' % folder)
             base_depth = len(folder.splitall())
             max_depth = self.get_max_depth(recursion, base_depth)
             folder_objects = self.get_folder_objects(folder, recursion)
-            for path_object in folder_objects:
+            for path_object, flags in folder_objects:
                 log.debug('Checking if %s qualifies to be added as an entry.' % path_object)
                 try:
                     path_object.exists()
@@ -178,13 +190,13 @@ class Filesystem(object):
                 object_depth = len(path_object.splitall())
                 if object_depth <= max_depth:
                     if match(path_object):
-                        if (path_object.isdir() and get_dirs) or (
-                                path_object.islink() and get_symlinks) or (
-                                path_object.isfile() and not path_object.islink() and get_files):
+                        if (flags & DIR and get_dirs) or (flags & SYMLINK and get_symlinks) or (
+                                flags & FILE and not flags & SYMLINK and get_files):
                             entry = self.create_entry(path_object, test_mode)
                         else:
                             log.debug("Path object's %s type doesn't match requested object types." % path_object)
-                        if entry and entry not in entries:
+                        if entry and entry not in seen:
+                            seen.add(entry)
                             entries.append(entry)
 
         return entries
@@ -8,14 +8,14 @@ from flexget.manager import Session
 from sqlalchemy import Table, Column, Integer, String, Float, Unicode, Boolean, DateTime, Date, func, or_
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.schema import ForeignKey
-from sqlalchemy.orm import relation
+from sqlalchemy.orm import relation, joinedload, subqueryload
 from dateutil.parser import parse as dateutil_parse
 
 from flexget import db_schema, plugin
 from flexget.event import event
 from flexget.plugin import get_plugin_by_name
 from flexget.utils import requests
-from flexget.utils.database import year_property, with_session, json_synonym
+from flexget.utils.database import year_property, with_session, json_synonym, query_in_chunks, CacheLookupResult
 
 log = logging.getLogger('api_tmdb')
 Base = db_schema.versioned_base('api_tmdb', 6)
@@ -147,6 +147,19 @@ class TMDBMovie(Base):
         self._genres = [TMDBGenre(**g) for g in movie['genres']]
         self.updated = datetime.now()
 
+    @property
+    def expired(self):
+        """Recently released movies are refreshed daily, older ones less often the older they get."""
+        refresh_time = timedelta(days=2)
+        if self.released:
+            if self.released > datetime.now().date() - timedelta(days=7):
+                # Movie is less than a week old, expire after 1 day
+                refresh_time = timedelta(days=1)
+            else:
+                age_in_years = (datetime.now().date() - self.released).days / 365
+                refresh_time += timedelta(days=age_in_years * 5)
+        return self.updated < datetime.now() - refresh_time
+
     def get_images(self):
         log.debug('images for movie %s not found in DB, fetching from TMDB', self.name)
         try:
@@ -319,15 +332,7 @@ class ApiTmdb(object):
                     movie = found.movie
         if movie:
             # Movie found in cache, check if cache has expired.
-            refresh_time = timedelta(days=2)
-            if movie.released:
-                if movie.released > datetime.now().date() - timedelta(days=7):
-                    # Movie is less than a week old, expire after 1 day
-                    refresh_time = timedelta(days=1)
-                else:
-                    age_in_years = (datetime.now().date() - movie.released).days / 365
-                    refresh_time += timedelta(days=age_in_years * 5)
-            if movie.updated < datetime.now() - refresh_time and not only_cached:
+            if movie.expired and not only_cached:
                 log.debug('Cache has expired for %s, attempting to refresh from TMDb.', movie.name)
                 try:
                     updated_movie = TMDBMovie(id=movie.id, language=language)
@@ -370,6 +375,53 @@ class ApiTmdb(object):
 
         return movie
 
+    @staticmethod
+    @with_session
+    def lookup_many(tmdb_ids=None, imdb_ids=None, titles=None, session=None):
+        """
+        Look up many movies from the cache at once. No online lookups are made, expired movies are returned as they
+        are.
+
+        :param tmdb_ids: tmdb_ids of desired movies
+        :param imdb_ids: imdb_ids of desired movies
+        :param titles: titles of desired movies, matched case insensitively against movie names and previous searches
+        :param session: sqlalchemy Session in which to do the lookups. If not supplied, a session will be created
+            automatically.
+
+        :return: :class:`CacheLookupResult` keyed by `('tmdb_id', id)`, `('imdb_id', id)` and `('title', title)`
+        """
+        tmdb_ids = tmdb_ids or []
+        imdb_ids = imdb_ids or []
+        titles = titles or []
+        result = CacheLookupResult([('tmdb_id', i) for i in tmdb_ids] + [('imdb_id', i) for i in imdb_ids] +
+                                   [('title', title) for title in titles])
+        query = session.query(TMDBMovie).options(joinedload(TMDBMovie._genres), subqueryload(TMDBMovie._posters),
+                                                 subqueryload(TMDBMovie._backdrops))
+        for movie in query_in_chunks(query, TMDBMovie.id, set(tmdb_ids)):
+            result.add(('tmdb_id', movie.id), movie, movie.expired)
+        for movie in query_in_chunks(query, TMDBMovie.imdb_id, set(imdb_ids)):
+            result.add(('imdb_id', movie.imdb_id), movie, movie.expired)
+
+        wanted = {}
+        for title in titles:
+            wanted.setdefault(title.lower(), []).append(title)
+
+        def found(search, movie):
+            for title in wanted.pop(search, []):
+                result.add(('title', title), movie, movie.expired)
+
+        for movie in query_in_chunks(query, func.lower(TMDBMovie.name), list(wanted)):
+            found(movie.name.lower(), movie)
+        movie_load = joinedload(TMDBSearchResult.movie)
+        searches = session.query(TMDBSearchResult).options(movie_load.joinedload(TMDBMovie._genres),
+                                                           movie_load.subqueryload(TMDBMovie._posters),
+                                                           movie_load.subqueryload(TMDBMovie._backdrops))
+        for search in query_in_chunks(searches, TMDBSearchResult.search, list(wanted)):
+            if search.movie:
+                found(search.search, search.movie)
+        log.debug('bulk movie lookup: %s', result)
+        return result
+
 
 @event('plugin.register')
 def register_plugin():
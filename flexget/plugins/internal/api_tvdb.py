@@ -6,13 +6,14 @@ from datetime import datetime, timedelta
 
 from sqlalchemy import Table, Column, Integer, Float, Unicode, Boolean, DateTime, Text
 from sqlalchemy.ext.associationproxy import association_proxy
-from sqlalchemy.orm import relation
+from sqlalchemy.orm import relation, joinedload
 from sqlalchemy.schema import ForeignKey
 
 from flexget import db_schema
 from flexget.utils import requests
 from flexget.utils.tools import split_title_year, chunked
-from flexget.utils.database import with_session, text_date_synonym, json_synonym, Session
+from flexget.utils.database import with_session, text_date_synonym, json_synonym, Session, query_in_chunks, \
+    CacheLookupResult
 from flexget.utils.simple_persistence import SimplePersistence
 
 log = logging.getLogger('api_tvdb')
@@ -559,6 +560,41 @@ def lookup_series(name=None, tvdb_id=None, only_cached=False, session=None, lang
     return series
 
 
+@with_session
+def lookup_series_many(names=None, tvdb_ids=None, language=None, session=None):
+    """
+    Look up many series from the cache at once. No online lookups are made, and the expired status is the one recorded
+    by the last :func:`mark_expired` check.
+
+    :param names: Series names, matched against the search strings of cached series.
+    :param tvdb_ids: TVDb IDs of series.
+    :param language: Only series cached in this language are found, if given.
+    :param session: An sqlalchemy session to be used for the lookups. If one is not supplied it will be created.
+
+    :return: :class:`CacheLookupResult` keyed by `('name', name)` and `('tvdb_id', id)`.
+    """
+    names = names or []
+    tvdb_ids = tvdb_ids or []
+    result = CacheLookupResult([('name', name) for name in names] + [('tvdb_id', i) for i in tvdb_ids])
+    query = session.query(TVDBSeries).options(joinedload(TVDBSeries._genres))
+    if language:
+        query = query.filter(TVDBSeries.language == language)
+    for series in query_in_chunks(query, TVDBSeries.id, set(tvdb_ids)):
+        result.add(('tvdb_id', series.id), series, series.expired)
+
+    wanted = {}
+    for name in names:
+        wanted.setdefault(name.lower(), []).append(name)
+    searches = session.query(TVDBSearchResult).options(joinedload(TVDBSearchResult.series)
+                                                       .joinedload(TVDBSeries._genres))
+    for search in query_in_chunks(searches, TVDBSearchResult.search, list(wanted)):
+        if search.series and (not language or search.series.language == language):
+            for name in wanted[search.search]:
+                result.add(('name', name), search.series, search.series.expired)
+    log.debug('bulk series lookup: %s', result)
+    return result
+
+
 @with_session
 def lookup_episode(name=None, season_number=None, episode_number=None, absolute_number=None,
                    tvdb_id=None, first_aired=None, only_cached=False, session=None, language=None):
@@ -8,14 +8,14 @@ from dateutil import parser
 from future.utils import native
 from requests.exceptions import RequestException
 from sqlalchemy import Column, Integer, Float, DateTime, String, Unicode, ForeignKey, Table, or_, \
-    and_
-from sqlalchemy.orm import relation
+    and_, func
+from sqlalchemy.orm import relation, joinedload, subqueryload
 from sqlalchemy.orm.exc import MultipleResultsFound
 
 from flexget import db_schema, plugin
 from flexget.event import event
 from flexget.utils import requests
-from flexget.utils.database import with_session, json_synonym
+from flexget.utils.database import with_session, json_synonym, query_in_chunks, CacheLookupResult
 from flexget.utils.tools import split_title_year
 
 log = logging.getLogger('api_tvmaze')
@@ -425,6 +425,42 @@ class APITVMaze(object):
                 search.series = series
         return series
 
+    @staticmethod
+    @with_session
+    def series_lookup_many(names=None, tvmaze_ids=None, session=None):
+        """
+        Looks up many series from the cache at once. No online lookups are made, expired series are returned as they
+        are.
+
+        :param names: Series names, matched case insensitively against series names and the search table.
+        :param tvmaze_ids: TVMaze ids of series.
+        :return: :class:`CacheLookupResult` keyed by `('name', name)` and `('tvmaze_id', id)`.
+        """
+        names = names or []
+        tvmaze_ids = tvmaze_ids or []
+        result = CacheLookupResult([('name', name) for name in names] + [('tvmaze_id', i) for i in tvmaze_ids])
+        query = session.query(TVMazeSeries).options(joinedload(TVMazeSeries.genres),
+                                                    subqueryload(TVMazeSeries.episodes))
+        for series in query_in_chunks(query, TVMazeSeries.tvmaze_id, set(tvmaze_ids)):
+            result.add(('tvmaze_id', series.tvmaze_id), series, series.expired)
+
+        wanted = {}
+        for name in names:
+            wanted.setdefault(name.lower(), []).append(name)
+
+        def found(search_name, series):
+            for name in wanted.pop(search_name, []):
+                result.add(('name', name), series, series.expired)
+
+        for series in query_in_chunks(query, func.lower(TVMazeSeries.name), list(wanted)):
+            found(series.name.lower(), series)
+        searches = session.query(TVMazeLookup).options(joinedload(TVMazeLookup.series).joinedload(TVMazeSeries.genres))
+        for search in query_in_chunks(searches, TVMazeLookup.search_name, list(wanted)):
+            if search.series:
+                found(search.search_name, search.series)
+        log.debug('bulk series lookup: %s', result)
+        return result
+
     @staticmethod
     @with_session
     def season_lookup(session=None, only_cached=False, **lookup_params):
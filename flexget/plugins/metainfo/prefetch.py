@@ -0,0 +1,136 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import logging
+import time
+from functools import partial
+from multiprocessing.pool import ThreadPool
+
+from flexget import plugin
+from flexget.event import event
+from flexget.task import use_task_logging
+
+log = logging.getLogger('prefetch')
+
+DEFAULT_WORKERS = 4
+
+
+def prefetch_fields(task):
+    """
+    Collects the fields the filter plugins configured on `task` are known to read.
+
+    Filter plugins declare them with a `prefetch_fields(config)` method returning the field names.
+    """
+    fields = set()
+    for filter_plugin in task.plugins('filter'):
+        method = getattr(filter_plugin.instance, 'prefetch_fields', None)
+        if method:
+            fields.update(method(task.config.get(filter_plugin.name)))
+    return fields
+
+
+def prefetch_cached(task, entries):
+    """
+    Lets the metainfo plugins configured on `task` fill the lazy fields of `entries` from their caches.
+
+    Metainfo plugins do this with a `prefetch_cached(entries, config)` method, which finds all entries with a few bulk
+    cache queries. Fields it can not fill, because they are not cached or expired, stay lazy.
+    """
+    for metainfo_plugin in task.plugins('metainfo'):
+        method = getattr(metainfo_plugin.instance, 'prefetch_cached', None)
+        config = task.config.get(metainfo_plugin.name)
+        if method and config:
+            method(entries, config)
+
+
+class Prefetch(object):
+    """
+    Evaluates lazy fields (imdb_lookup, tmdb_lookup, trakt_lookup etc.) of all entries concurrently before they are
+    needed by filters, instead of one entry at a time when a filter first reads them.
+
+    Fields read by the configured filters (imdb, if, require_field) are fetched automatically, more can be given with
+    the `fields` option. Runs after the builtin filters have rejected entries seen before. Lookup plugins first fill
+    what they can from their caches with a few bulk queries, only the rest is looked up entry by entry.
+
+    Example::
+
+      prefetch: yes
+
+    Example, use 8 threads and also fetch fields used in an output::
+
+      prefetch:
+        max_workers: 8
+        fields:
+          - imdb_plot_outline
+    """
+
+    schema = {
+        'oneOf': [
+            {'type': 'boolean'},
+            {'type': 'integer', 'minimum': 1},
+            {
+                'type': 'object',
+                'properties': {
+                    'max_workers': {'type': 'integer', 'minimum': 1},
+                    'fields': {'type': 'array', 'items': {'type': 'string'}}
+                },
+                'additionalProperties': False
+            }
+        ]
+    }
+
+    def prepare_config(self, config):
+        if config is False:
+            return None
+        if config is True:
+            config = {}
+        elif isinstance(config, int):
+            config = {'max_workers': config}
+        config.setdefault('max_workers', DEFAULT_WORKERS)
+        config.setdefault('fields', [])
+        return config
+
+    @plugin.priority(254)
+    def on_task_filter(self, task, config):
+        config = self.prepare_config(config)
+        if not config:
+            return
+        fields = prefetch_fields(task) | set(config['fields'])
+        if not fields:
+            log.debug('no filters known to need lazy fields')
+            return
+        entries = [entry for entry in task.entries if any(entry.is_lazy(field) for field in fields)]
+        if not entries:
+            return
+        started = time.time()
+        prefetch_cached(task, entries)
+        total = len(entries)
+        entries = [entry for entry in entries if any(entry.is_lazy(field) for field in fields)]
+        log.debug('%s of %s entries filled from cache in %0.2f seconds', total - len(entries), total,
+                  time.time() - started)
+        if not entries:
+            return
+
+        @use_task_logging
+        def fetch(task, entry):
+            # Lookups log with the name of the task, also to the output of the execution which started it
+            for field in fields:
+                if entry.is_lazy(field):
+                    entry.get(field)
+
+        log.verbose('Prefetching %s for %s entries', ', '.join(sorted(fields)), len(entries))
+        started = time.time()
+        pool = ThreadPool(min(config['max_workers'], len(entries)))
+        try:
+            # Lazy lookup functions handle their own errors, there is nothing to re-raise here
+            pool.map(partial(fetch, task), entries)
+            pool.close()
+            pool.join()
+        finally:
+            pool.terminate()
+        log.debug('prefetching took %0.2f seconds', time.time() - started)
+
+
+@event('plugin.register')
+def register_plugin():
+    plugin.register(Prefetch, 'prefetch', api_ver=2)
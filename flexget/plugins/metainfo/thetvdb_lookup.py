@@ -9,7 +9,8 @@ import logging
 from flexget import plugin
 from flexget.event import event
 
-from flexget.plugins.internal.api_tvdb import lookup_series, lookup_episode
+from flexget.manager import Session
+from flexget.plugins.internal.api_tvdb import lookup_series, lookup_series_many, lookup_episode, mark_expired
 from flexget.utils.database import with_session
 
 log = logging.getLogger('thetvdb_lookup')
@@ -160,6 +161,37 @@ class PluginThetvdbLookup(object):
         except LookupError as e:
             log.debug('Error looking up tvdb episode information for %s: %s', entry['title'], e.args[0])
 
+    def prefetch_cached(self, entries, config):
+        """
+        Fills the series fields of `entries` whose series are cached and not expired, with a few bulk queries per
+        language. Actor, poster and episode fields stay lazy.
+        """
+        language = config['language'] if not isinstance(config, bool) else 'en'
+        by_language = {}
+        for entry in entries:
+            if entry.is_lazy('tvdb_series_name'):
+                by_language.setdefault(entry.get('language', language), []).append(entry)
+        if not by_language:
+            return
+        with Session() as session:
+            # Same expiry check the single lookups do, so changes on tvdb are not missed
+            mark_expired(session)
+            for lang, lang_entries in by_language.items():
+                entry_keys = [(entry, [('tvdb_id', entry.get('tvdb_id', eval_lazy=False)),
+                                       ('name', entry.get('series_name', eval_lazy=False))]) for entry in lang_entries]
+                wanted = {}
+                for entry, keys in entry_keys:
+                    for kind, value in keys:
+                        if value:
+                            wanted.setdefault(kind, set()).add(value)
+                result = lookup_series_many(names=wanted.get('name'), tvdb_ids=wanted.get('tvdb_id'), language=lang,
+                                            session=session)
+                for entry, keys in entry_keys:
+                    series = next((result[key] for key in keys if key in result), None)
+                    if series is None or series.expired or not series.name:
+                        continue
+                    entry.update_using_map(self.series_map, series)
+
     # Run after series and metainfo series
     @plugin.priority(110)
     def on_task_metainfo(self, task, config):
@@ -68,6 +68,45 @@ class PluginTmdbLookup(object):
         except LookupError:
             log_once('TMDB lookup failed for %s' % entry['title'], log, logging.WARN)
 
+    @staticmethod
+    def cache_keys(entry):
+        """
+        :return: `(key, year)` pairs of :meth:`ApiTmdb.lookup_many` results which match `entry`, in the order the
+            single lookup tries them. A movie found by `key` only matches if `year` is None or the movie's year.
+        """
+        imdb_id = (entry.get('imdb_id', eval_lazy=False) or
+                   imdb.extract_id(entry.get('imdb_url', eval_lazy=False)))
+        tmdb_id = entry.get('tmdb_id', eval_lazy=False)
+        if tmdb_id or imdb_id:
+            return [((kind, value), None) for kind, value in [('tmdb_id', tmdb_id), ('imdb_id', imdb_id)] if value]
+        parser = plugin.get_plugin_by_name('parsing').instance.parse_movie(entry['title'])
+        if not parser.name:
+            return []
+        if not parser.year:
+            return [(('title', parser.name), None)]
+        return [(('title', parser.name), parser.year), (('title', '%s (%s)' % (parser.name, parser.year)), None)]
+
+    def prefetch_cached(self, entries, config):
+        """Fills the fields of `entries` whose movies are cached and not expired, with a few bulk queries."""
+        lookup_many = plugin.get_plugin_by_name('api_tmdb').instance.lookup_many
+        entry_keys = [(entry, self.cache_keys(entry)) for entry in entries if entry.is_lazy('tmdb_name')]
+        wanted = {}
+        for entry, keys in entry_keys:
+            for (kind, value), year in keys:
+                wanted.setdefault(kind, set()).add(value)
+        if not wanted:
+            return
+        with Session() as session:
+            result = lookup_many(tmdb_ids=wanted.get('tmdb_id'), imdb_ids=wanted.get('imdb_id'),
+                                 titles=wanted.get('title'), session=session)
+            for entry, keys in entry_keys:
+                movie = next((result[key] for key, year in keys
+                              if key in result and (not year or result[key].year == year)), None)
+                # Images missing from the cache would be fetched online, those are left to the lazy lookup
+                if movie is None or movie.expired or not (movie._posters and movie._backdrops):
+                    continue
+                entry.update_using_map(self.field_map, movie)
+
     def lookup(self, entry, language):
         """
         Populates all lazy fields to an Entry. May be called by other plugins
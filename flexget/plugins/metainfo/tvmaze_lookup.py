@@ -182,6 +182,35 @@ class PluginTVMazeLookup(object):
                 entry.update_using_map(self.episode_map, episode)
         return entry
 
+    def prefetch_cached(self, entries, config):
+        """
+        Fills the series fields of `entries` whose series are cached and not expired, with a few bulk queries.
+        Season and episode fields stay lazy.
+        """
+        series_lookup_many = plugin.get_plugin_by_name('api_tvmaze').instance.series_lookup_many
+        entry_keys = []
+        wanted = {}
+        for entry in entries:
+            tvmaze_id = entry.get('tvmaze_id', eval_lazy=False)
+            # The bulk lookup does not know tvdb and tvrage ids, those entries are left to the lazy lookup
+            if not entry.is_lazy('tvmaze_series_name') or (not tvmaze_id and (
+                    entry.get('tvdb_id', eval_lazy=False) or entry.get('tvrage_id', eval_lazy=False))):
+                continue
+            keys = [(kind, value) for kind, value in [('tvmaze_id', tvmaze_id),
+                                                      ('name', entry.get('series_name', eval_lazy=False))] if value]
+            for kind, value in keys:
+                wanted.setdefault(kind, set()).add(value)
+            entry_keys.append((entry, keys))
+        if not wanted:
+            return
+        with Session() as session:
+            result = series_lookup_many(names=wanted.get('name'), tvmaze_ids=wanted.get('tvmaze_id'), session=session)
+            for entry, keys in entry_keys:
+                series = next((result[key] for key in keys if key in result), None)
+                if series is None or series.expired:
+                    continue
+                entry.update_using_map(self.series_map, series)
+
     # Run after series and metainfo series
     @plugin.priority(110)
     def on_task_metainfo(self, task, config):
@@ -129,7 +129,7 @@ class DiscordNotifier(object):
         try:
             requests.post(config['web_hook_url'], json=web_hook)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
 
 
 @event('plugin.register')
@@ -86,7 +86,7 @@ class JoinNotifier(object):
         try:
             response = requests.get(JOIN_URL, params=notification)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
         else:
             error = response.json().get('errorMessage')
             if error:
@@ -48,7 +48,7 @@ class MsTeamsNotifier(object):
         try:
             requests.post(config['web_hook_url'], json=notification)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
 
 
 @event('plugin.register')
@@ -18,21 +18,45 @@ To implement a plugin that can deliver messages, it should implement a `notify`
 `(title, message, config)` as arguments. The plugin should also have a `schema` attribute which is a JSON schema that
 describes the config format for the plugin.
 
+If the service accepts several messages in one request, the plugin can also implement a `notify_batch` method, which
+takes `(messages, config)` where `messages` is a list of `(title, message)` tuples. It is used when several messages
+for the same notifier config are waiting to be delivered.
+
+Dispatching
+-----------
+Messages are rendered when `send_notification` is called, then delivered by a worker thread per notifier, so slow
+services do not hold up the task. Failed deliveries are retried, waiting as long as the service asks when it reports
+a rate limit. Messages which are still queued when FlexGet shuts down are stored in the database and sent on the next
+run. The `notification_queue` config key controls this behaviour.
+
 """
 
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+import copy
 import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
 
 from jinja2 import Template
+from sqlalchemy import Column, Integer, Unicode, DateTime
 
-from flexget import plugin
+from flexget import config_schema, db_schema, plugin
 from flexget.event import event
+from flexget.manager import Session
 from flexget.plugin import PluginWarning
+from flexget.utils.database import json_synonym
 from flexget.utils.template import RenderError
+from flexget.utils.tools import get_config_hash
 
 log = logging.getLogger('notify')
+Base = db_schema.versioned_base('notification_outbox', 0)
+
+#: Longest time to wait before retrying a delivery, even if the service asks for more
+MAX_RETRY_DELAY = 300
 
 NOTIFY_VIA_SCHEMA = {
     'type': 'array',
@@ -77,8 +101,286 @@ def render_config(config, template_renderer, _path=''):
         return config
 
 
+class OutboxMessage(Base):
+    """A message which was still waiting for delivery when FlexGet shut down."""
+    __tablename__ = 'notification_outbox'
+
+    id = Column(Integer, primary_key=True)
+    notifier = Column(Unicode)
+    title = Column(Unicode)
+    message = Column(Unicode)
+    _config = Column('config', Unicode)
+    config = json_synonym('_config')
+    attempts = Column(Integer, default=0)
+    added = Column(DateTime, default=datetime.now)
+
+
+class Notification(object):
+    """A rendered message waiting to be delivered by a notifier."""
+
+    def __init__(self, notifier, title, message, config, attempts=0):
+        self.notifier = notifier
+        self.title = title
+        self.message = message
+        self.config = config
+        self.attempts = attempts
+        self.config_hash = get_config_hash(config)
+
+    def __repr__(self):
+        return '<Notification(notifier=%s, title=%s)>' % (self.notifier, self.title)
+
+
+def retry_delay(error, attempt, base_delay):
+    """
+    Returns how many seconds to wait before retrying a failed delivery.
+
+    If the service refused the request because of a rate limit, the delay it asked for is used. Notifiers pass it on
+    the :class:`PluginWarning` they raise, either as `retry_after` seconds or as the `response` carrying `Retry-After`
+    or `X-Ratelimit-Reset` headers. Otherwise the delay doubles with every attempt.
+    """
+    kwargs = getattr(error, 'kwargs', None) or {}
+    delay = kwargs.get('retry_after')
+    response = kwargs.get('response')
+    if response is not None and getattr(response, 'status_code', None) == 429:
+        try:
+            if 'Retry-After' in response.headers:
+                delay = float(response.headers['Retry-After'])
+            elif 'X-Ratelimit-Reset' in response.headers:
+                delay = float(response.headers['X-Ratelimit-Reset']) - time.time()
+        except ValueError:
+            pass
+    if delay is None:
+        delay = base_delay * 2 ** (attempt - 1)
+    return min(max(delay, 0), MAX_RETRY_DELAY)
+
+
+def join_messages(messages, max_length=None, separator='\n\n'):
+    """
+    Joins the bodies of several messages for services which deliver one long message instead of many short ones.
+
+    :param list messages: List of `(title, message)` tuples.
+    :param int max_length: Longest allowed joined message, messages are split over more parts when needed.
+    :return: List of joined message bodies.
+    """
+    parts = []
+    current = None
+    for _, message in messages:
+        if current is not None and max_length and len(current) + len(separator) + len(message) > max_length:
+            parts.append(current)
+            current = None
+        current = message if current is None else current + separator + message
+    if current is not None:
+        parts.append(current)
+    return parts
+
+
+class NotifierQueue(object):
+    """Messages for one notifier, and the worker threads delivering them."""
+
+    def __init__(self, name, dispatcher):
+        self.name = name
+        self.dispatcher = dispatcher
+        self.items = deque()
+        self.pending = 0
+        self.condition = threading.Condition()
+        self.workers = []
+
+    def put(self, notifications):
+        with self.condition:
+            self.items.extend(notifications)
+            self.pending += len(notifications)
+            self.workers = [w for w in self.workers if w.is_alive()]
+            while len(self.workers) < self.dispatcher.workers:
+                worker = threading.Thread(target=self.run, name='notify-%s-%d' % (self.name, len(self.workers)))
+                worker.daemon = True
+                worker.start()
+                self.workers.append(worker)
+            self.condition.notify_all()
+
+    def take(self):
+        """Waits for queued messages, returns all of them. Returns an empty list when the dispatcher stops."""
+        with self.condition:
+            while not self.items and not self.dispatcher.stopping.is_set():
+                self.condition.wait(1)
+            if self.dispatcher.stopping.is_set():
+                return []
+            batch = list(self.items)
+            self.items.clear()
+            return batch
+
+    def done(self, count):
+        with self.condition:
+            self.pending -= count
+            self.condition.notify_all()
+
+    def drain(self):
+        """Removes and returns the messages which were not picked up by a worker yet."""
+        with self.condition:
+            items = list(self.items)
+            self.items.clear()
+            self.pending -= len(items)
+            self.condition.notify_all()
+            return items
+
+    def wait(self, timeout=None):
+        """Waits until all messages have been handled. Returns False if `timeout` elapsed first."""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self.condition:
+            while self.pending > 0:
+                remaining = deadline - time.time() if deadline is not None else 1
+                if remaining <= 0:
+                    return False
+                self.condition.wait(min(remaining, 1))
+        return True
+
+    def run(self):
+        while True:
+            batch = self.take()
+            if not batch:
+                return
+            try:
+                self.deliver(batch)
+            except Exception:
+                log.exception('Unexpected error while sending notifications to `%s`', self.name)
+            finally:
+                self.done(len(batch))
+
+    def deliver(self, batch):
+        notifier = plugin.get_plugin_by_name(self.name).instance
+        groups = {}
+        for notification in batch:
+            groups.setdefault(notification.config_hash, []).append(notification)
+        for group in groups.values():
+            self.deliver_group(notifier, group)
+
+    def deliver_group(self, notifier, group):
+        """Sends messages that share a notifier config, retrying on failure."""
+        while True:
+            for notification in group:
+                notification.attempts += 1
+            try:
+                if len(group) > 1 and hasattr(notifier, 'notify_batch'):
+                    log.debug('Sending %d notifications to `%s` in one batch', len(group), self.name)
+                    notifier.notify_batch([(n.title, n.message) for n in group], group[0].config)
+                else:
+                    while group:
+                        log.debug('Sending a notification to `%s`', self.name)
+                        notifier.notify(group[0].title, group[0].message, group[0].config)
+                        group.pop(0)
+            except PluginWarning as e:
+                attempts = group[0].attempts
+                if attempts > self.dispatcher.max_retries:
+                    log.warning('Error while sending notification to `%s`, giving up after %d attempts: %s',
+                                self.name, attempts, e.value)
+                    return
+                delay = retry_delay(e, attempts, self.dispatcher.retry_delay)
+                log.verbose('Error while sending notification to `%s`, retrying in %.0f seconds: %s',
+                            self.name, delay, e.value)
+                if self.dispatcher.stopping.wait(delay):
+                    # Shutting down, keep the rest for the next run
+                    self.dispatcher.unsent.extend(group)
+                    return
+            except plugin.PluginError as e:
+                log.error('Error while sending notification to `%s`: %s', self.name, e.value)
+                return
+            else:
+                log.verbose('Successfully sent a notification to `%s`', self.name)
+                return
+
+
+class NotificationDispatcher(object):
+    """Delivers notifications in the background, with a queue and worker threads per notifier."""
+
+    def __init__(self):
+        self.queues = {}
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.unsent = []
+        self.configure()
+
+    def configure(self, background=True, workers=1, max_retries=3, retry_delay=10, shutdown_timeout=30):
+        self.background = background
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.shutdown_timeout = shutdown_timeout
+
+    def put(self, notifications):
+        """Queues a list of :class:`Notification` for delivery."""
+        by_notifier = {}
+        for notification in notifications:
+            by_notifier.setdefault(notification.notifier, []).append(notification)
+        with self.lock:
+            self.stopping.clear()
+            for name, items in by_notifier.items():
+                if name not in self.queues:
+                    self.queues[name] = NotifierQueue(name, self)
+                self.queues[name].put(items)
+
+    def flush(self, timeout=None):
+        """
+        Waits for queued messages to be delivered.
+
+        :param timeout: Seconds to wait, None waits as long as it takes.
+        :return: True if everything was delivered before `timeout` elapsed.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        with self.lock:
+            queues = list(self.queues.values())
+        for queue in queues:
+            remaining = max(deadline - time.time(), 0) if deadline is not None else None
+            if not queue.wait(remaining):
+                return False
+        return True
+
+    def stop(self, timeout=None):
+        """
+        Gives queued messages `timeout` seconds to be delivered, then stops the workers.
+
+        :return: List of :class:`Notification` which were not delivered.
+        """
+        self.flush(timeout)
+        with self.lock:
+            self.stopping.set()
+            queues = list(self.queues.values())
+            self.queues = {}
+        unsent = []
+        for queue in queues:
+            unsent.extend(queue.drain())
+            # Give workers waiting to retry a moment to hand back their messages
+            for worker in queue.workers:
+                worker.join(1)
+        unsent.extend(self.unsent)
+        self.unsent = []
+        return unsent
+
+    def save_outbox(self, notifications):
+        """Stores undelivered notifications in the database, so they are sent on the next run."""
+        with Session() as session:
+            for notification in notifications:
+                session.add(OutboxMessage(notifier=notification.notifier, title=str(notification.title),
+                                          message=str(notification.message), config=notification.config,
+                                          attempts=notification.attempts))
+        log.verbose('%d notifications were not sent yet, they will be sent on the next run.', len(notifications))
+
+    def load_outbox(self):
+        """Queues notifications which were left over by the previous run."""
+        notifications = []
+        with Session() as session:
+            for item in session.query(OutboxMessage).order_by(OutboxMessage.id).all():
+                notifications.append(Notification(item.notifier, item.title, item.message, item.config,
+                                                  attempts=item.attempts))
+                session.delete(item)
+        if notifications:
+            log.verbose('Sending %d notifications left over from the previous run.', len(notifications))
+            self.put(notifications)
+
+
+dispatcher = NotificationDispatcher()
+
+
 class NotificationFramework(object):
-    def send_notification(self, title, message, notifiers, template_renderer=None):
+    def send_notification(self, title, message, notifiers, template_renderer=None, wait=None):
         """
         Send a notification out to the given `notifiers` with a given `title` and `message`.
         If `template_renderer` is specified, `title`, `message`, as well as any string options in a notifier's config
@@ -89,6 +391,8 @@ class NotificationFramework(object):
         :param list notifiers: A list of configured notifier output plugins. The `NOTIFY_VIA_SCHEMA` JSON schema
             describes the data structure for this parameter.
         :param template_renderer: A function that should be used to render any jinja strings in the configuration.
+        :param wait: Wait for the messages to be delivered before returning. Defaults to waiting only if background
+            delivery is disabled with the `notification_queue` config key.
         """
         if template_renderer:
             try:
@@ -99,10 +403,9 @@ class NotificationFramework(object):
                 message = template_renderer(message)
             except RenderError as e:
                 log.error('Error rendering notification body: %s', e)
+        notifications = []
         for notifier in notifiers:
             for notifier_name, notifier_config in notifier.items():
-                notifier = plugin.get_plugin_by_name(notifier_name).instance
-
                 rendered_config = notifier_config
 
                 # If a template renderer is specified, try to render all the notifier config values
@@ -112,13 +415,49 @@ class NotificationFramework(object):
                     except RenderError as e:
                         log.error('Error rendering %s plugin config field %s: %s', notifier_name, e.config_path, e)
 
-                log.debug('Sending a notification to `%s`', notifier_name)
-                try:
-                    notifier.notify(title, message, rendered_config)  # TODO: Update notifiers for new api
-                except PluginWarning as e:
-                    log.warning('Error while sending notification to `%s`: %s', notifier_name, e.value)
-                else:
-                    log.verbose('Successfully sent a notification to `%s`', notifier_name)
+                # Notifiers may alter their config, and they run after the task has moved on
+                notifications.append(Notification(notifier_name, title, message, copy.deepcopy(rendered_config)))
+        dispatcher.put(notifications)
+        if wait or wait is None and not dispatcher.background:
+            dispatcher.flush()
+
+    def flush(self, timeout=None):
+        """Waits for all queued notifications to be delivered, see :meth:`NotificationDispatcher.flush`."""
+        return dispatcher.flush(timeout)
+
+
+@event('config.register')
+def register_config():
+    config_schema.register_config_key('notification_queue', {
+        'type': 'object',
+        'properties': {
+            'background': {'type': 'boolean'},
+            'workers': {'type': 'integer', 'minimum': 1},
+            'max_retries': {'type': 'integer', 'minimum': 0},
+            'retry_delay': {'type': 'number', 'minimum': 0},
+            'shutdown_timeout': {'type': 'number', 'minimum': 0}
+        },
+        'additionalProperties': False,
+        'description': 'Settings for delivering notifications in the background.'
+    })
+
+
+@event('manager.config_updated')
+def apply_queue_config(manager):
+    dispatcher.configure(**manager.config.get('notification_queue', {}))
+
+
+@event('manager.daemon.started')
+@event('manager.execute.started')
+def send_outbox(manager, *args):
+    dispatcher.load_outbox()
+
+
+@event('manager.shutdown')
+def stop_dispatcher(manager):
+    unsent = dispatcher.stop(dispatcher.shutdown_timeout)
+    if unsent:
+        dispatcher.save_outbox(unsent)
 
 
 @event('plugin.register')
@@ -7,6 +7,7 @@ import itertools
 from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.event import event
+from flexget.plugins.notifiers.notification_framework import dispatcher
 from flexget.utils.template import get_template
 
 log = logging.getLogger('notify_entry')
@@ -108,6 +109,11 @@ class Notify(object):
         except Exception as e:
             log.exception(e)
 
+    def flush(self):
+        """Waits for queued notifications, unless they are delivered in the background."""
+        if not dispatcher.background:
+            dispatcher.flush()
+
     @plugin.priority(0)
     def on_task_output(self, task, config):
         config = self.prepare_config(config)
@@ -124,9 +130,11 @@ class Notify(object):
                         raise plugin.PluginError('Cannot locate template on disk: %s' % config['entries']['template'])
                 else:
                     message = config['entries']['message']
+                # Queue all the messages first, so they can be delivered concurrently and in batches
                 for entry in entries:
                     self.send_notification(config['entries']['title'], message, config['entries']['via'],
-                                           template_renderer=entry.render)
+                                           template_renderer=entry.render, wait=False)
+                self.flush()
         if 'task' in config:
             if not (task.accepted or task.failed) and not config['task']['always_send']:
                 log.verbose('No accepted or failed entries, not sending a notification.')
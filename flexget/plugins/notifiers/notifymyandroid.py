@@ -68,7 +68,7 @@ class NotifyMyAndroidNotifier(object):
         try:
             response = requests.post(NOTIFYMYANDROID_URL, data=notification)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
 
         request_status = ET.fromstring(response.content)
         error = request_status.find('error')
@@ -65,7 +65,7 @@ class ProwlNotifier(object):
         try:
             response = requests.post(PROWL_URL, data=notification)
         except RequestException as e:
-            raise PluginWarning(repr(e))
+            raise PluginWarning(repr(e), response=e.response)
 
         request_status = ET.fromstring(response.content)
         error = request_status.find('error')
@@ -67,7 +67,7 @@ class PushalotNotifier(object):
             try:
                 requests.post(PUSHALOT_URL, json=notification)
             except RequestException as e:
-                raise PluginWarning(repr(e))
+                raise PluginWarning(repr(e), response=e.response)
 
 
 @event('plugin.register')
@@ -82,6 +82,19 @@ class PushbulletNotifier(object):
             else:
                 self.send_push(key, title, message, config.get('url'))
 
+    def notify_batch(self, messages, config):
+        """
+        Send several messages as one Pushbullet push
+        """
+        titles = set(title for title, _ in messages)
+        if len(titles) == 1:
+            title = titles.pop()
+            body = '\n\n'.join(message for _, message in messages)
+        else:
+            title = '%d notifications' % len(messages)
+            body = '\n\n'.join('%s\n%s' % (t, m) if t else m for t, m in messages)
+        self.notify(title, body, config)
+
     def send_push(self, api_key, title, body, url=None, destination=None, destination_type=None):
         push_type = 'link' if url else 'note'
         notification = {'type': push_type, 'title': title, 'body': body}
@@ -109,7 +122,7 @@ class PushbulletNotifier(object):
                     message = e.response.json()['error']['message']
             else:
                 message = str(e)
-            raise PluginWarning(message)
+            raise PluginWarning(message, response=e.response)
 
         reset_time = datetime.datetime.fromtimestamp(
             int(response.headers['X-Ratelimit-Reset'])).strftime('%Y-%m-%d %H:%M:%S')
@@ -109,7 +109,7 @@ class PushoverNotifier(object):
                         error_message = e.response.json()['errors'][0]
                 else:
                     error_message = str(e)
-                raise PluginWarning(error_message)
+                raise PluginWarning(error_message, response=e.response)
 
             reset_time = datetime.datetime.fromtimestamp(
                 int(response.headers['X-Limit-App-Reset'])).strftime('%Y-%m-%d %H:%M:%S')
@@ -68,7 +68,7 @@ class PushsaferNotifier(object):
             try:
                 requests.post(PUSHSAFER_URL, data=notification)
             except RequestException as e:
-                raise PluginWarning(repr(e))
+                raise PluginWarning(repr(e), response=e.response)
 
 
 @event('plugin.register')
@@ -79,7 +79,7 @@ class RapidpushNotifier(object):
             try:
                 response = requests.post(RAPIDPUSH_URL, params=params)
             except RequestException as e:
-                raise PluginWarning(e.args[0])
+                raise PluginWarning(e.args[0], response=e.response)
             else:
                 if response.json()['code'] > 400:
                     raise PluginWarning(response.json()['desc'])
@@ -6,6 +6,7 @@ import logging
 from flexget import plugin
 from flexget.event import event
 from flexget.plugin import PluginWarning
+from flexget.plugins.notifiers.notification_framework import join_messages
 from requests.exceptions import RequestException
 from flexget.utils.requests import Session as RequestSession
 
@@ -13,6 +14,9 @@ requests = RequestSession(max_retries=3)
 
 plugin_name = 'slack'
 
+# Slack truncates longer messages
+MAX_MESSAGE_LENGTH = 4000
+
 log = logging.getLogger(plugin_name)
 
 
@@ -107,7 +111,14 @@ class SlackNotifier(object):
         try:
             requests.post(config['web_hook_url'], json=notification)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
+
+    def notify_batch(self, messages, config):
+        """
+        Send several messages as one Slack notification
+        """
+        for text in join_messages(messages, MAX_MESSAGE_LENGTH, separator='\n'):
+            self.notify(None, text, config)
 
 
 @event('plugin.register')
@@ -52,7 +52,7 @@ class SMSRuNotifier(object):
         try:
             token_response = requests.get(SMS_TOKEN_URL)
         except RequestException as e:
-            raise PluginWarning('Could not get auth token: %s' % repr(e))
+            raise PluginWarning('Could not get auth token: %s' % repr(e), response=e.response)
 
         sha512 = hashlib.sha512(config['password'] + token_response.text).hexdigest()
 
@@ -66,7 +66,7 @@ class SMSRuNotifier(object):
         try:
             response = requests.get(SMS_SEND_URL, params=notification)
         except RequestException as e:
-            raise PluginWarning(e.args[0])
+            raise PluginWarning(e.args[0], response=e.response)
         else:
             if not response.text.find('100') == 0:
                 raise PluginWarning(response.text)
@@ -10,6 +10,7 @@ from flexget import db_schema, plugin
 from flexget.event import event
 from flexget.manager import Session
 from flexget.plugin import PluginWarning, PluginError
+from flexget.plugins.notifiers.notification_framework import join_messages
 
 try:
     import telegram
@@ -22,6 +23,8 @@ _MIN_TELEGRAM_VER = '3.4'
 
 _PLUGIN_NAME = 'telegram'
 
+_MAX_MESSAGE_LENGTH = 4096
+
 _PARSERS = ['markdown', 'html']
 
 _DISABLE_PREVIEWS_ATTR = 'disable_previews'
@@ -183,6 +186,17 @@ class TelegramNotifier(object):
             return
         self._send_msgs(message, chat_ids)
 
+    def notify_batch(self, messages, config):
+        """
+        Send several Telegram notifications, joined into as few messages as the length limit allows
+        """
+        chat_ids = self._real_init(Session(), config)
+
+        if not chat_ids:
+            return
+        for msg in join_messages(messages, _MAX_MESSAGE_LENGTH):
+            self._send_msgs(msg, chat_ids)
+
     def _parse_config(self, config):
         """
         :type config: dict
@@ -256,9 +270,9 @@ class TelegramNotifier(object):
                     try:
                         self._bot.sendMessage(chat_id=chat_id, text=msg, **kwargs)
                     except TelegramError as e:
-                        raise PluginWarning(e.message)
+                        raise PluginWarning(e.message, retry_after=getattr(e, 'retry_after', None))
                 else:
-                    raise PluginWarning(e.message)
+                    raise PluginWarning(e.message, retry_after=getattr(e, 'retry_after', None))
 
     def _get_chat_ids_n_update_db(self, session):
         """
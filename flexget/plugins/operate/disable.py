@@ -20,6 +20,8 @@ class DisablePlugin(object):
     """
     Allows disabling built-ins, or plugins referenced by template/include plugin.
 
+    Built-ins are only disabled for the task using this plugin, other tasks running at the same time keep them.
+
     Example::
 
       templates:
@@ -41,11 +43,9 @@ class DisablePlugin(object):
     """
 
     schema = one_or_more({'type': 'string'})
-    disabled_builtins = None
 
     @plugin.priority(254)
     def on_task_start(self, task, config):
-        self.disabled_builtins = []
         disabled = []
 
         if isinstance(config, basestring):
@@ -58,32 +58,17 @@ class DisablePlugin(object):
                 del (task.config[p])
             # Disable built-in plugins.
             if p in plugin.plugins and plugin.plugins[p].builtin:
-                plugin.plugins[p].builtin = False
-                self.disabled_builtins.append(p)
+                task.disabled_builtins.add(p)
 
         # Disable all builtins mode.
         if 'builtins' in config:
-            for p in all_builtins():
-                p.builtin = False
-                self.disabled_builtins.append(p.name)
+            task.disabled_builtins.update(p.name for p in all_builtins())
 
-        if self.disabled_builtins:
-            log.debug('Disabled built-in plugin(s): %s' % ', '.join(self.disabled_builtins))
+        if task.disabled_builtins:
+            log.debug('Disabled built-in plugin(s): %s' % ', '.join(sorted(task.disabled_builtins)))
         if disabled:
             log.debug('Disabled plugin(s): %s' % ', '.join(disabled))
 
-    @plugin.priority(-255)
-    def on_task_exit(self, task, config):
-        if not self.disabled_builtins:
-            return
-
-        for name in self.disabled_builtins:
-            plugin.plugins[name].builtin = True
-        log.debug('Re-enabled builtin plugin(s): %s' % ', '.join(self.disabled_builtins))
-        self.disabled_builtins = []
-
-    on_task_abort = on_task_exit
-
 
 @event('plugin.register')
 def register_plugin():
@@ -0,0 +1,46 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import logging
+
+from flexget import plugin
+from flexget.event import event
+
+log = logging.getLogger('parallel_inputs')
+
+
+class ParallelInputs(object):
+    """
+    Run all inputs of the task at the same time instead of one after another.
+
+    Useful when a task has many slow (network bound) inputs. Entries are still added in input priority order.
+
+    Example::
+
+      parallel_inputs: yes
+
+    Example, limit the amount of inputs running at once::
+
+      parallel_inputs: 3
+    """
+
+    schema = {
+        'oneOf': [
+            {'type': 'boolean'},
+            {'type': 'integer', 'minimum': 1}
+        ]
+    }
+
+    @plugin.priority(255)
+    def on_task_start(self, task, config):
+        if config is False:
+            task.max_parallel_inputs = 1
+            return
+        # `yes` runs every input at once
+        task.max_parallel_inputs = None if config is True else config
+        log.debug('running at most %s inputs at the same time', task.max_parallel_inputs or 'all')
+
+
+@event('plugin.register')
+def register_plugin():
+    plugin.register(ParallelInputs, 'parallel_inputs', api_ver=2)
@@ -1,11 +1,18 @@
 from __future__ import unicode_literals, division, absolute_import
+import bisect
 import logging
 import datetime
+import threading
+import time
 from datetime import timedelta
 
-from flexget.utils.database import with_session
+from flexget.utils.database import with_session, pipe_list_synonym
+from flexget.utils.requests import http_stats
 from flexget.utils.sqlalchemy_utils import create_index
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, select, func, Index
+from flexget.utils.tools import LatencyHistogram
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, select, func, Index
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.schema import ForeignKey
 from sqlalchemy.orm import relation
@@ -33,6 +40,7 @@ class StatusTask(Base):
     id = Column(Integer, primary_key=True)
     name = Column('task', String)
     executions = relation('TaskExecution', backref='task', cascade='all, delete, delete-orphan', lazy='dynamic')
+    plugin_timings = relation('PluginTiming', backref='task', cascade='all, delete, delete-orphan', lazy='dynamic')
 
     def __repr__(self):
         return '<StatusTask(id=%s,name=%s)>' % (self.id, self.name)
@@ -95,6 +103,42 @@ Index('ix_status_execution_task_id_start_end_succeeded', TaskExecution.task_id,
       TaskExecution.succeeded)
 
 
+#: Upper bounds in seconds of the buckets plugin run times are counted in
+PLUGIN_TIME_BOUNDS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class PluginTiming(Base):
+    """Run times, database queries and http requests of one plugin in one phase of a task, rolled up per hour."""
+    __tablename__ = 'status_plugin_timing'
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, ForeignKey('status_task.id'), index=True)
+    window_start = Column(DateTime, index=True)
+    phase = Column(String)
+    plugin = Column(String)
+
+    runs = Column(Integer, default=0)
+    total_time = Column(Float, default=0.0)
+    max_time = Column(Float, default=0.0)
+    queries = Column(Integer, default=0)
+    requests = Column(Integer, default=0)
+    _buckets = Column('buckets', String)
+    buckets = pipe_list_synonym('_buckets')
+
+    def __repr__(self):
+        return '<PluginTiming(task_id=%s,window_start=%s,phase=%s,plugin=%s,runs=%s)>' % (
+            self.task_id, self.window_start, self.phase, self.plugin, self.runs)
+
+    def add(self, took, queries, requests):
+        counts = [int(c) for c in self.buckets] if self.buckets else [0] * (len(PLUGIN_TIME_BOUNDS) + 1)
+        counts[bisect.bisect_left(PLUGIN_TIME_BOUNDS, took)] += 1
+        self.buckets = [str(c) for c in counts]
+        self.runs = (self.runs or 0) + 1
+        self.total_time = (self.total_time or 0.0) + took
+        self.max_time = max(self.max_time or 0.0, took)
+        self.queries = (self.queries or 0) + queries
+        self.requests = (self.requests or 0) + requests
+
+
 class Status(object):
     """Track health status of tasks"""
 
@@ -139,6 +183,75 @@ class Status(object):
     on_task_abort = on_task_exit
 
 
+# Per thread counters, so plugins running in parallel input threads are measured separately
+_local = threading.local()
+# Plugin measurements of running tasks, by id of the task
+_task_timings = {}
+_task_timings_lock = threading.Lock()
+
+
+@sqlalchemy_event.listens_for(Engine, 'after_cursor_execute')
+def count_query(*args):
+    _local.queries = getattr(_local, 'queries', 0) + 1
+
+
+@event('task.execute.started')
+def start_timings(task):
+    with _task_timings_lock:
+        _task_timings[id(task)] = {}
+
+
+@event('task.execute.before_plugin')
+def before_plugin(task, keyword):
+    starts = getattr(_local, 'starts', None)
+    if starts is None:
+        starts = _local.starts = {}
+    starts[(id(task), keyword)] = (time.time(), getattr(_local, 'queries', 0), http_stats.thread_requests())
+
+
+@event('task.execute.after_plugin')
+def after_plugin(task, keyword):
+    start = getattr(_local, 'starts', {}).pop((id(task), keyword), None)
+    if start is None:
+        return
+    started, queries, requests = start
+    took = time.time() - started
+    queries = getattr(_local, 'queries', 0) - queries
+    requests = http_stats.thread_requests() - requests
+    with _task_timings_lock:
+        timings = _task_timings.get(id(task))
+        if timings is None:
+            return
+        # Reruns add up to a single measurement for the execution
+        key = (task.current_phase, keyword)
+        previous = timings.get(key, (0.0, 0, 0))
+        timings[key] = (previous[0] + took, previous[1] + queries, previous[2] + requests)
+
+
+@event('task.execute.completed')
+def store_timings(task):
+    with _task_timings_lock:
+        timings = _task_timings.pop(id(task), None)
+    if not timings:
+        return
+    window_start = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    with Session() as session:
+        st = session.query(StatusTask).filter(StatusTask.name == task.name).first()
+        if not st:
+            st = StatusTask()
+            st.name = task.name
+            session.add(st)
+            session.flush()
+        rows = dict(((row.phase, row.plugin), row) for row in
+                    st.plugin_timings.filter(PluginTiming.window_start == window_start))
+        for (phase, plugin_name), (took, queries, requests) in timings.items():
+            row = rows.get((phase, plugin_name))
+            if row is None:
+                row = PluginTiming(task_id=st.id, window_start=window_start, phase=phase, plugin=plugin_name)
+                session.add(row)
+            row.add(took, queries, requests)
+
+
 @event('manager.db_cleanup')
 def db_cleanup(manager, session):
     # Purge all status data for non existing tasks
@@ -153,6 +266,12 @@ def db_cleanup(manager, session):
     if result:
         log.verbose('Removed %s task executions from history older than 1 year', result)
 
+    # Purge plugin timings older than 30 days
+    result = session.query(PluginTiming).filter(
+        PluginTiming.window_start < datetime.datetime.now() - timedelta(days=30)).delete()
+    if result:
+        log.verbose('Removed %s plugin timing rollups older than 30 days', result)
+
 
 @event('plugin.register')
 def register_plugin():
@@ -190,3 +309,47 @@ def get_executions_by_task_id(task_id, start=None, stop=None, order_by='start',
     else:
         query = query.order_by(getattr(TaskExecution, order_by))
     return query.slice(start, stop).all()
+
+
+@with_session
+def get_plugin_timings(task_id=None, window=24, session=None):
+    """
+    Combines the plugin timing rollups of the last `window` hours.
+
+    :param int task_id: Only include this status task, all tasks if None.
+    :param int window: Number of hours to include.
+    :return: List of dicts, one per task, phase and plugin, slowest total run time first.
+    """
+    since = datetime.datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=window - 1)
+    query = session.query(PluginTiming).filter(PluginTiming.window_start >= since)
+    if task_id is not None:
+        query = query.filter(PluginTiming.task_id == task_id)
+    combined = {}
+    for row in query:
+        key = (row.task_id, row.phase, row.plugin)
+        if key not in combined:
+            combined[key] = {'histogram': LatencyHistogram(PLUGIN_TIME_BOUNDS), 'queries': 0, 'requests': 0}
+        item = combined[key]
+        item['histogram'].add_counts([int(c) for c in row.buckets], row.total_time, row.max_time)
+        item['queries'] += row.queries
+        item['requests'] += row.requests
+
+    names = dict(session.query(StatusTask.id, StatusTask.name))
+    results = []
+    for (task, phase, plugin_name), item in combined.items():
+        histogram = item['histogram']
+        results.append({
+            'task_id': task,
+            'task': names.get(task),
+            'phase': phase,
+            'plugin': plugin_name,
+            'runs': histogram.count,
+            'total_time': histogram.total,
+            'mean': histogram.total / histogram.count if histogram.count else 0.0,
+            'p50': histogram.percentile(50),
+            'p95': histogram.percentile(95),
+            'max': histogram.max,
+            'queries': item['queries'],
+            'requests': item['requests']
+        })
+    return sorted(results, key=lambda r: r['total_time'], reverse=True)
@@ -1,7 +1,7 @@
 from __future__ import unicode_literals, division, absolute_import
 
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
-from future.moves.urllib.parse import unquote
+from future.moves.urllib.parse import unquote, urlparse
 
 import hashlib
 import io
@@ -12,19 +12,45 @@ import shutil
 import socket
 import sys
 import tempfile
+import threading
 from cgi import parse_header
+from functools import partial
 from http.client import BadStatusLine
+from multiprocessing.pool import ThreadPool
 
 from requests import RequestException
 
 from flexget import options, plugin
 from flexget.event import event
+from flexget.task import use_task_logging
 from flexget.utils.tools import decode_html, native_str_to_text
 from flexget.utils.template import RenderError
 from flexget.utils.pathscrub import pathscrub
 
 log = logging.getLogger('download')
 
+# How many files are fetched from a single domain at a time when downloading concurrently
+DEFAULT_MAX_PER_DOMAIN = 2
+
+
+class DomainSlots(object):
+    """Limits how many downloads from each domain may run at the same time."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def slot(self, url):
+        """
+        :return: Semaphore to hold while downloading `url`.
+        """
+        domain = urlparse(url).hostname
+        with self._lock:
+            if domain not in self._slots:
+                self._slots[domain] = threading.BoundedSemaphore(self.limit)
+            return self._slots[domain]
+
 
 class PluginDownload(object):
     """
@@ -52,6 +78,13 @@ class PluginDownload(object):
 
     You may use commandline parameter --dl-path to temporarily override
     all paths to another location.
+
+    Download several files at a time, at most 2 from the same site::
+
+      download:
+        path: ~/torrents/
+        max_workers: 6
+        max_per_domain: 2
     """
 
     schema = {
@@ -64,7 +97,9 @@ class PluginDownload(object):
                     'fail_html': {'type': 'boolean', 'default': True},
                     'overwrite': {'type': 'boolean', 'default': False},
                     'temp': {'type': 'string', 'format': 'path'},
-                    'filename': {'type': 'string'}
+                    'filename': {'type': 'string'},
+                    'max_workers': {'type': 'integer', 'minimum': 1, 'default': 1},
+                    'max_per_domain': {'type': 'integer', 'minimum': 1, 'default': DEFAULT_MAX_PER_DOMAIN}
                 },
                 'additionalProperties': False
             },
@@ -82,6 +117,8 @@ class PluginDownload(object):
         if not config.get('path'):
             config['require_path'] = True
         config.setdefault('fail_html', True)
+        config.setdefault('max_workers', 1)
+        config.setdefault('max_per_domain', DEFAULT_MAX_PER_DOMAIN)
         return config
 
     def on_task_download(self, task, config):
@@ -91,10 +128,10 @@ class PluginDownload(object):
         tmp = config.get('temp', os.path.join(task.manager.config_base, 'temp'))
 
         self.get_temp_files(task, require_path=config.get('require_path', False), fail_html=config['fail_html'],
-                            tmp_path=tmp)
+                            tmp_path=tmp, max_workers=config['max_workers'], max_per_domain=config['max_per_domain'])
 
     def get_temp_file(self, task, entry, require_path=False, handle_magnets=False, fail_html=True,
-                      tmp_path=tempfile.gettempdir()):
+                      tmp_path=tempfile.gettempdir(), domain_slots=None):
         """
         Download entry content and store in temporary folder.
         Fails entry with a reason if there was problem.
@@ -108,6 +145,8 @@ class PluginDownload(object):
           fail entries which url respond with html content
         :param tmp_path:
           path to use for temporary files while downloading
+        :param DomainSlots domain_slots:
+          limits concurrent downloads per domain, if given
         """
         if entry.get('urls'):
             urls = entry.get('urls')
@@ -129,7 +168,11 @@ class PluginDownload(object):
                 # Don't fail here, there might be a magnet later in the list of urls
                 log.debug('Skipping url %s because there is no path for download', url)
                 continue
-            error = self.process_entry(task, entry, url, tmp_path)
+            if domain_slots:
+                with domain_slots.slot(url):
+                    error = self.process_entry(task, entry, url, tmp_path)
+            else:
+                error = self.process_entry(task, entry, url, tmp_path)
 
             # disallow html content
             html_mimes = ['html', 'text/html']
@@ -162,7 +205,7 @@ class PluginDownload(object):
             outfile.write(page)
 
     def get_temp_files(self, task, require_path=False, handle_magnets=False, fail_html=True,
-                       tmp_path=tempfile.gettempdir()):
+                       tmp_path=tempfile.gettempdir(), max_workers=1, max_per_domain=DEFAULT_MAX_PER_DOMAIN):
         """Download all task content and store in temporary folder.
 
         :param bool require_path:
@@ -174,9 +217,34 @@ class PluginDownload(object):
           fail entries which url respond with html content
         :param tmp_path:
           path to use for temporary files while downloading
+        :param int max_workers:
+          how many entries are downloaded at the same time
+        :param int max_per_domain:
+          how many of the concurrent downloads may be from the same domain
         """
-        for entry in task.accepted:
-            self.get_temp_file(task, entry, require_path, handle_magnets, fail_html, tmp_path)
+        entries = list(task.accepted)
+        if max_workers <= 1 or len(entries) <= 1 or task.options.test:
+            for entry in entries:
+                self.get_temp_file(task, entry, require_path, handle_magnets, fail_html, tmp_path)
+            return
+
+        domain_slots = DomainSlots(max_per_domain)
+
+        @use_task_logging
+        def download(task, entry):
+            # Downloads log with the name of the task, also to the output of the execution which started it
+            self.get_temp_file(task, entry, require_path, handle_magnets, fail_html, tmp_path,
+                               domain_slots=domain_slots)
+
+        log.verbose('Downloading %s entries, %s at a time', len(entries), max_workers)
+        pool = ThreadPool(min(max_workers, len(entries)))
+        try:
+            # Errors which would abort the task are re-raised here
+            pool.map(partial(download, task), entries)
+            pool.close()
+            pool.join()
+        finally:
+            pool.terminate()
 
     # TODO: a bit silly method, should be get rid of now with simplier exceptions ?
     def process_entry(self, task, entry, url, tmp_path):
@@ -232,13 +300,14 @@ class PluginDownload(object):
             auth = entry['download_auth']
             log.debug('Custom auth enabled for %s download: %s', entry['title'], entry['download_auth'])
 
-        headers = task.requests.headers
+        # Copy, custom headers must not leak into the session or other downloads
+        headers = task.requests.headers.copy()
         if 'download_headers' in entry:
             headers.update(entry['download_headers'])
             log.debug('Custom headers enabled for %s download: %s', entry['title'], entry['download_headers'])
 
         try:
-            response = task.requests.get(url, auth=auth, raise_status=False, headers=headers)
+            response = task.requests.get(url, auth=auth, raise_status=False, headers=headers, stream=True)
         except UnicodeError:
             log.error('Unicode error while encoding url %s', url)
             return
@@ -265,7 +334,12 @@ class PluginDownload(object):
         # create if missing
         if not os.path.isdir(tmp_path):
             log.debug('creating tmp_path %s' % tmp_path)
-            os.mkdir(tmp_path)
+            try:
+                os.mkdir(tmp_path)
+            except OSError:
+                # Another download may have created it meanwhile
+                if not os.path.isdir(tmp_path):
+                    raise
 
         # check for write-access
         if not os.access(tmp_path, os.W_OK):
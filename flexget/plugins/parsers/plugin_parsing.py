@@ -1,10 +1,12 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+import copy
 import logging
 
 from flexget import plugin
 from flexget.event import event
+from flexget.utils.tools import LRUCache
 
 log = logging.getLogger('parsing')
 PARSER_TYPES = ['movie', 'series']
@@ -14,6 +16,9 @@ parsers = {}
 # Mapping from parser type to the name of the default/selected parser for that type
 default_parsers = {}
 selected_parsers = {}
+# Results of recent parses, keyed on (parser type, parser name, data, parser options). The same titles tend to come
+# back on every run of a task, this lets them skip parsing entirely.
+parse_cache = LRUCache(max_size=20000)
 
 
 # We need to wait until manager startup to access other plugin instances, to make sure they have all been loaded
@@ -57,6 +62,7 @@ class PluginParsing(object):
     def on_task_exit(self, task, config):
         # Restore default parsers for next task run
         selected_parsers.clear()
+        log.debug('parse cache: %s', parse_cache)
 
     on_task_abort = on_task_exit
 
@@ -70,8 +76,9 @@ class PluginParsing(object):
 
         :returns: An object containing the parsed information. The `valid` attribute will be set depending on success.
         """
-        parser = parsers['series'][selected_parsers.get('series', default_parsers.get('series'))]
-        return parser.parse_series(data, name=name, **kwargs)
+        parser_name = selected_parsers.get('series', default_parsers.get('series'))
+        kwargs['name'] = name
+        return self._cached_parse('series', parser_name, data, kwargs)
 
     def parse_movie(self, data, **kwargs):
         """
@@ -81,8 +88,22 @@ class PluginParsing(object):
 
         :returns: An object containing the parsed information. The `valid` attribute will be set depending on success.
         """
-        parser = parsers['movie'][selected_parsers.get('movie') or default_parsers['movie']]
-        return parser.parse_movie(data, **kwargs)
+        parser_name = selected_parsers.get('movie') or default_parsers['movie']
+        return self._cached_parse('movie', parser_name, data, kwargs)
+
+    def _cached_parse(self, parser_type, parser_name, data, kwargs):
+        """Returns a parse result from the cache, or parses `data` with given parser and caches the result."""
+        key = (parser_type, parser_name, data, repr(sorted(kwargs.items())))
+        try:
+            result = parse_cache[key]
+        except KeyError:
+            parser = parsers[parser_type][parser_name]
+            result = getattr(parser, 'parse_' + parser_type)(data, **kwargs)
+            parse_cache[key] = result
+        # Callers are free to modify the results they get, make sure that doesn't touch the cached one
+        result = copy.copy(result)
+        result.quality = copy.copy(result.quality)
+        return result
 
 
 @event('plugin.register')
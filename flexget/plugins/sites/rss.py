@@ -4,8 +4,6 @@ from future.moves.urllib.parse import quote
 
 import logging
 
-from jinja2 import TemplateSyntaxError
-
 from flexget import plugin
 from flexget.event import event
 from flexget.utils.search import normalize_unicode
@@ -20,15 +18,15 @@ class SearchRSS(object):
     schema = {'$ref': '/schema/plugin/rss'}
 
     def search(self, task, entry, config=None):
-        from flexget.utils.template import environment
+        from flexget.utils.template import compile_template, RenderError
         search_strings = [quote(normalize_unicode(s).encode('utf-8'))
                           for s in entry.get('search_strings', [entry['title']])]
         rss_plugin = plugin.get_plugin_by_name('rss')
         entries = set()
         rss_config = rss_plugin.instance.build_config(config)
         try:
-            template = environment.from_string(rss_config['url'])
-        except TemplateSyntaxError as e:
+            template = compile_template(rss_config['url'])
+        except RenderError as e:
             raise plugin.PluginError('Invalid jinja template as rss url: %s' % e)
         rss_config['all_entries'] = True
         for search_string in search_strings:
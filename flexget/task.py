@@ -1,5 +1,6 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+from future.utils import PY2
 
 import copy
 import itertools
@@ -7,12 +8,14 @@ import logging
 import threading
 import random
 import string
+import time
 from functools import wraps, total_ordering
+from multiprocessing.pool import ThreadPool
 
 from sqlalchemy import Column, Integer, String, Unicode
 
 from flexget import config_schema, db_schema
-from flexget.entry import EntryUnicodeError
+from flexget.entry import EntryUnicodeError, INDEXED_FIELDS
 from flexget.event import event, fire_event
 from flexget.logger import capture_output
 from flexget.manager import Session
@@ -21,6 +24,7 @@ from flexget.plugin import (
     DependencyError, get_plugins, phase_methods, plugin_schemas, PluginError, PluginWarning, task_phases)
 from flexget.utils import requests
 from flexget.utils.database import with_session
+from flexget.utils.lazy_dict import LazyLookup
 from flexget.utils.simple_persistence import SimpleTaskPersistence
 from flexget.utils.tools import get_config_hash, MergeException, merge_dict_from_to
 from flexget.utils.template import render_from_task, FlexGetTemplate
@@ -81,16 +85,19 @@ class EntryIterator(object):
         self.all_entries = entries
         if isinstance(states, str):
             states = [states]
+        self.states = states
         self.filter = lambda e: e._state in states
 
     def __iter__(self):
+        if not self:
+            return iter([])
         return filter(self.filter, self.all_entries)
 
     def __bool__(self):
-        return any(e for e in self)
+        return len(self) > 0
 
     def __len__(self):
-        return sum(1 for e in self)
+        return self.all_entries.count_states(self.states)
 
     def __add__(self, other):
         return itertools.chain(self, other)
@@ -117,10 +124,25 @@ class EntryIterator(object):
 
 
 class EntryContainer(list):
-    """Container for a list of entries, also contains accepted, rejected failed iterators over them."""
+    """
+    Container for a list of entries, also contains accepted, rejected failed iterators over them.
+
+    Keeps count of its entries in each state, and lazily built indexes of the entries by the fields in
+    :data:`~flexget.entry.INDEXED_FIELDS`. Entries notify the containers they are in when their state or indexed
+    fields change, so counting entries in a state and looking them up by title or url does not need to scan them.
+    """
 
     def __init__(self, iterable=None):
-        list.__init__(self, iterable or [])
+        list.__init__(self)
+        # Maps id of each contained entry to the number of times it is in the container
+        self._refs = {}
+        # Number of entries in each state
+        self._state_counts = {}
+        # Maps indexed field names to dicts of values to lists of entries with that value, in container order.
+        # False if the field has unhashable or lazy values.
+        self._field_indexes = {}
+        # Entries may change state from several threads, e.g. when downloading concurrently
+        self._state_lock = threading.Lock()
 
         self._entries = EntryIterator(self, ['undecided', 'accepted'])
         self._accepted = EntryIterator(self, 'accepted')  # accepted entries, can still be rejected
@@ -128,6 +150,9 @@ class EntryContainer(list):
         self._failed = EntryIterator(self, 'failed')  # failed entries
         self._undecided = EntryIterator(self, 'undecided')  # undecided entries (default)
 
+        if iterable:
+            self.extend(iterable)
+
     # Make these read-only properties
     entries = property(lambda self: self._entries)
     accepted = property(lambda self: self._accepted)
@@ -135,6 +160,136 @@ class EntryContainer(list):
     failed = property(lambda self: self._failed)
     undecided = property(lambda self: self._undecided)
 
+    def count_states(self, states):
+        """Number of entries which are in one of `states`."""
+        return sum(self._state_counts.get(state, 0) for state in states)
+
+    def lookup(self, field, value):
+        """
+        Find entries by value of an indexed field.
+
+        :return: List of entries whose `field` equals `value` in container order, or None if the field cannot be
+            looked up from the index. Lazy fields are not evaluated.
+        """
+        if field not in INDEXED_FIELDS:
+            return None
+        index = self._field_indexes.get(field)
+        if index is None:
+            index = self._field_indexes[field] = self._build_index(field)
+        if index is False:
+            return None
+        try:
+            return list(index.get(value, []))
+        except TypeError:
+            return None
+
+    def _build_index(self, field):
+        index = {}
+        for entry in self:
+            value = entry.store.get(field)
+            if isinstance(value, LazyLookup):
+                return False
+            try:
+                index.setdefault(value, []).append(entry)
+            except TypeError:
+                return False
+        return index
+
+    def _entries_added(self, entries):
+        for entry in entries:
+            count = self._refs.get(id(entry), 0)
+            if not count:
+                entry._added_to(self)
+            self._refs[id(entry)] = count + 1
+            self._state_counts[entry._state] = self._state_counts.get(entry._state, 0) + 1
+        self._field_indexes.clear()
+
+    def _entries_removed(self, entries):
+        for entry in entries:
+            count = self._refs.pop(id(entry)) - 1
+            if count:
+                self._refs[id(entry)] = count
+            else:
+                entry._removed_from(self)
+            self._state_counts[entry._state] -= 1
+        self._field_indexes.clear()
+
+    def _entry_state_changed(self, entry, old_state, new_state):
+        count = self._refs.get(id(entry))
+        if count:
+            with self._state_lock:
+                self._state_counts[old_state] -= count
+                self._state_counts[new_state] = self._state_counts.get(new_state, 0) + count
+
+    def _entry_field_changed(self, entry, field):
+        self._field_indexes.pop(field, None)
+
+    def append(self, entry):
+        list.append(self, entry)
+        self._entries_added([entry])
+
+    def extend(self, entries):
+        entries = list(entries)
+        list.extend(self, entries)
+        self._entries_added(entries)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+
+    def __imul__(self, times):
+        entries = list(self)
+        self[:] = entries * times
+        return self
+
+    def insert(self, index, entry):
+        list.insert(self, index, entry)
+        self._entries_added([entry])
+
+    def pop(self, index=-1):
+        entry = list.pop(self, index)
+        self._entries_removed([entry])
+        return entry
+
+    def remove(self, entry):
+        self.pop(self.index(entry))
+
+    def clear(self):
+        del self[:]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            removed = list.__getitem__(self, index)
+        else:
+            removed = [list.__getitem__(self, index)]
+        list.__setitem__(self, index, value)
+        self._entries_removed(removed)
+        self._entries_added(value if isinstance(index, slice) else [value])
+
+    def __delitem__(self, index):
+        removed = list.__getitem__(self, index)
+        list.__delitem__(self, index)
+        self._entries_removed(removed if isinstance(index, slice) else [removed])
+
+    if PY2:
+        def __setslice__(self, i, j, sequence):
+            self.__setitem__(slice(i, j), sequence)
+
+        def __delslice__(self, i, j):
+            self.__delitem__(slice(i, j))
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._field_indexes.clear()
+
+    def reverse(self):
+        list.reverse(self)
+        self._field_indexes.clear()
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
     def __repr__(self):
         return '<EntryContainer(%s)>' % list.__repr__(self)
 
@@ -245,7 +400,8 @@ class Task(object):
         self.abort_reason = None
         self.silent_abort = False
 
-        self.session = None
+        # Each thread running plugins for this task gets its own session, see `session`
+        self._local = threading.local()
 
         self.requests = requests.Session()
 
@@ -255,10 +411,27 @@ class Task(object):
 
         self.disabled_phases = []
 
+        # Names of built-in plugins turned off for this task only, see the disable plugin
+        self.disabled_builtins = set()
+        # Phase handler priorities by plugin name overriding the defaults for this task only, see plugin_priority
+        self.plugin_priorities = {}
+
+        # How many input plugins may run at the same time, `None` runs all of them at once (see parallel_inputs)
+        self.max_parallel_inputs = 1
+
         # current state
         self.current_phase = None
         self.current_plugin = None
 
+    @property
+    def session(self):
+        """Database session of the plugin currently being executed (in this thread)."""
+        return getattr(self._local, 'session', None)
+
+    @session.setter
+    def session(self, value):
+        self._local.session = value
+
     @property
     def max_reruns(self):
         """How many times task can be rerunned before stopping"""
@@ -380,7 +553,14 @@ class Task(object):
         cat = getattr(self, category)
         if not isinstance(cat, EntryIterator):
             raise TypeError('category must be a EntryIterator')
-        for entry in cat:
+        candidates = None
+        for field in INDEXED_FIELDS:
+            if field in values:
+                candidates = cat.all_entries.lookup(field, values[field])
+                if candidates is not None:
+                    candidates = filter(cat.filter, candidates)
+                    break
+        for entry in candidates if candidates is not None else cat:
             for k, v in values.items():
                 if not (k in entry and entry[k] == v):
                     break
@@ -397,10 +577,12 @@ class Task(object):
           An iterator over configured :class:`flexget.plugin.PluginInfo` instances enabled on this task.
         """
         if phase:
-            plugins = sorted(get_plugins(phase=phase), key=lambda p: p.phase_handlers[phase], reverse=True)
+            plugins = sorted(get_plugins(phase=phase), reverse=True,
+                             key=lambda p: self.plugin_priorities.get(p.name, p.phase_handlers[phase].priority))
         else:
             plugins = iter(all_plugins.values())
-        return (p for p in plugins if p.name in self.config or p.builtin)
+        return (p for p in plugins
+                if p.name in self.config or (p.builtin and p.name not in self.disabled_builtins))
 
     def __run_task_phase(self, phase):
         """Executes task phase, ie. call all enabled plugins on the task.
@@ -429,6 +611,10 @@ class Task(object):
                         else:
                             log.warning('Task doesn\'t have any %s plugins, you should add (at least) one!' % phase)
 
+        if phase == 'input' and self.max_parallel_inputs != 1:
+            self.__run_parallel_inputs()
+            return
+
         for plugin in self.plugins(phase):
             # Abort this phase if one of the plugins disables it
             if phase in self.disabled_phases:
@@ -437,20 +623,12 @@ class Task(object):
             self.current_phase = phase
             self.current_plugin = plugin.name
 
-            if plugin.api_ver == 1:
-                # backwards compatibility
-                # pass method only task (old behaviour)
-                args = (self,)
-            else:
-                # pass method task, copy of config (so plugin cannot modify it)
-                args = (self, copy.copy(self.config.get(plugin.name)))
-
             # Hack to make task.session only active for a single plugin
             with Session() as session:
                 self.session = session
                 try:
                     fire_event('task.execute.before_plugin', self, plugin.name)
-                    response = self.__run_plugin(plugin, phase, args)
+                    response = self.__run_plugin(plugin, phase, self.__plugin_args(plugin))
                     if phase == 'input' and response:
                         # add entries returned by input to self.all_entries
                         for e in response:
@@ -463,6 +641,62 @@ class Task(object):
         if phase == 'prepare':
             self.check_config_hash()
 
+    def __plugin_args(self, plugin):
+        if plugin.api_ver == 1:
+            # backwards compatibility
+            # pass method only task (old behaviour)
+            return (self,)
+        # pass method task, copy of config (so plugin cannot modify it)
+        return (self, copy.copy(self.config.get(plugin.name)))
+
+    @use_task_logging
+    def __run_input_plugin(self, plugin):
+        """
+        Runs a single input plugin in its own session, used from the worker threads of parallel input mode.
+
+        :return: Tuple of entries produced by the plugin and seconds it took.
+        """
+        started = time.time()
+        with Session() as session:
+            self.session = session
+            try:
+                fire_event('task.execute.before_plugin', self, plugin.name)
+                response = self.__run_plugin(plugin, 'input', self.__plugin_args(plugin))
+            finally:
+                fire_event('task.execute.after_plugin', self, plugin.name)
+                self.session = None
+        return response, time.time() - started
+
+    def __run_parallel_inputs(self):
+        """
+        Runs all input plugins at the same time, at most :attr:`max_parallel_inputs` at once.
+
+        Produced entries are added to :attr:`all_entries` in plugin priority order, same as when the inputs are ran one
+        after another. If inputs abort the task, the abort of the highest priority one is raised after all inputs have
+        completed.
+        """
+        plugins = list(self.plugins('input'))
+        if not plugins:
+            return
+        self.current_phase = 'input'
+        self.current_plugin = None
+        pool = ThreadPool(min(self.max_parallel_inputs or len(plugins), len(plugins)))
+        try:
+            results = [pool.apply_async(self.__run_input_plugin, (plugin,)) for plugin in plugins]
+            pool.close()
+            pool.join()
+        finally:
+            pool.terminate()
+        for plugin, result in zip(plugins, results):
+            self.current_plugin = plugin.name
+            # Re-raises the TaskAbort from the plugin, if there was one
+            response, took = result.get()
+            entries = list(response or [])
+            log.verbose('Input `%s` produced %s entries in %0.2f seconds', plugin.name, len(entries), took)
+            for e in entries:
+                e.task = self
+            self.all_entries.extend(entries)
+
     def __run_plugin(self, plugin, phase, args=None, kwargs=None):
         """
         Execute given plugins phase method, with supplied args and kwargs.
@@ -672,6 +906,7 @@ class Task(object):
         # Some mutable objects need to be copies
         new.options = copy.copy(self.options)
         new.config = copy.deepcopy(self.config)
+        new._local = threading.local()
         return new
 
     copy = __copy__
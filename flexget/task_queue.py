@@ -9,70 +9,278 @@ import time
 
 from sqlalchemy.exc import ProgrammingError, OperationalError
 
+from flexget import config_schema
+from flexget.event import event
+from flexget.plugin import get_plugins
 from flexget.task import TaskAbort
+from flexget.utils.tools import get_config_hash
 
 log = logging.getLogger('task_queue')
 
+# Plugins which store per series state, tasks using them will lock the series they have configured
+SERIES_PLUGINS = ['series']
+# Plugins which can touch any series in the database, tasks using them lock all series
+ALL_SERIES_PLUGINS = ['configure_series', 'all_series', 'series_premiere', 'series_begin', 'series_forget']
+
+
+def _series_names(config):
+    """Yields the series names configured in a `series` plugin config, in either the simple or grouped form."""
+    if isinstance(config, dict):
+        groups = [value for key, value in config.items() if key != 'settings']
+    else:
+        groups = [config]
+    for group in groups:
+        if not isinstance(group, list):
+            continue
+        for series in group:
+            if isinstance(series, dict):
+                for name in series:
+                    yield str(name).lower()
+            else:
+                yield str(series).lower()
+
+
+def _template_configs(task):
+    """Yields configs of all templates that may be merged into `task` during the prepare phase."""
+    templates = task.manager.config.get('templates') or {}
+    names = task.config.get('template')
+    if names is False:
+        return
+    if not isinstance(names, list):
+        names = [names] if names else []
+    names = [name for name in names if name != 'no_global'] + (['global'] if 'no_global' not in names else [])
+    seen = set()
+    while names:
+        name = names.pop()
+        if name in seen or not templates.get(name):
+            continue
+        seen.add(name)
+        nested = templates[name].get('template')
+        if isinstance(nested, list):
+            names.extend(nested)
+        elif nested:
+            names.append(nested)
+        yield templates[name]
+
+
+def task_resources(task):
+    """
+    Get the shared database resources `task` will modify while it executes.
+
+    Two tasks whose resources conflict are never run at the same time by :class:`TaskQueue`.
+
+    :param Task task: Task to inspect.
+    :return: A set of resource tuples. The second item of a resource is `None` when it covers the whole kind.
+    """
+    resources = {('task', task.name)}
+    list_plugins = set(p.name for p in get_plugins(interface='list'))
+
+    def walk(config):
+        if isinstance(config, dict):
+            for key, value in config.items():
+                if key in SERIES_PLUGINS:
+                    resources.update(('series', name) for name in _series_names(value))
+                elif key in ALL_SERIES_PLUGINS:
+                    resources.add(('series', None))
+                elif key in list_plugins:
+                    resources.add(('list', '%s:%s' % (key, get_config_hash(value))))
+                walk(value)
+        elif isinstance(config, list):
+            for item in config:
+                walk(item)
+
+    walk(task.config)
+    for template_config in _template_configs(task):
+        walk(template_config)
+    return resources
+
+
+def resources_conflict(first, second):
+    """Check whether any resource in `first` collides with one in `second`."""
+    for kind, name in first:
+        for other_kind, other_name in second:
+            if kind == other_kind and (name == other_name or name is None or other_name is None):
+                return True
+    return False
+
 
 class TaskQueue(object):
     """
-    Task processing thread.
-    Only executes one task at a time, if more are requested they are queued up and run in turn.
+    Task processing thread pool.
+
+    Runs up to `max_workers` tasks at a time, if more are requested they are queued up and run in priority order. The
+    number of workers can be changed while running with :meth:`resize`.
+    Tasks which share database resources (see :func:`task_resources`) are run one at a time, in the order they were
+    queued, so a task waiting for a resource cannot be starved by tasks queued after it.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers=1):
         self.run_queue = queue.PriorityQueue()
+        self.max_workers = max_workers
         self._shutdown_now = False
         self._shutdown_when_finished = False
 
-        self.current_task = None
+        # Tasks taken from the run queue which are waiting for resources held by running tasks, in priority order
+        self._deferred = []
+        # Maps ids of running tasks to the task and the resources it holds
+        self._running = {}
+        self._lock = threading.Condition()
+
+        self._threads = []
+        self._started_threads = 0
+
+    @property
+    def current_task(self):
+        """
+        .. deprecated:: Use :attr:`running_tasks`, more than one task can be running at once.
+        """
+        running = self.running_tasks
+        return running[0] if running else None
+
+    @property
+    def running_tasks(self):
+        """A list of tasks currently executing, in priority order."""
+        with self._lock:
+            return sorted(task for task, _ in self._running.values())
 
-        # We don't override `threading.Thread` because debugging this seems unsafe with pydevd.
-        # Overriding __len__(self) seems to cause a debugger deadlock.
-        self._thread = threading.Thread(target=self.run, name='task_queue')
-        self._thread.daemon = True
+    @property
+    def waiting_tasks(self):
+        """A list of tasks waiting to be executed, in priority order."""
+        with self._lock:
+            return sorted([task for task, _ in self._deferred] + list(self.run_queue.queue))
 
     def start(self):
-        self._thread.start()
+        self._add_workers()
+        log.debug('task queue started with %s worker(s)', len(self._threads))
+
+    def _add_workers(self):
+        """Starts worker threads until there are `max_workers` of them."""
+        with self._lock:
+            while len(self._threads) < max(self.max_workers, 1):
+                # We don't override `threading.Thread` because debugging this seems unsafe with pydevd.
+                # Overriding __len__(self) seems to cause a debugger deadlock.
+                name = 'task_queue-%s' % self._started_threads if self._started_threads else 'task_queue'
+                thread = threading.Thread(target=self.run, name=name)
+                thread.daemon = True
+                self._threads.append(thread)
+                self._started_threads += 1
+                thread.start()
+
+    def resize(self, max_workers):
+        """
+        Changes how many tasks may run at the same time.
+
+        When shrinking, the extra workers exit after finishing the task they are running, running tasks are never
+        interrupted.
+        """
+        with self._lock:
+            if max_workers == self.max_workers:
+                return
+            old, self.max_workers = self.max_workers, max_workers
+            if self._threads:
+                log.verbose('Changing the number of concurrent tasks from %s to %s', old, max_workers)
+                self._add_workers()
+            self._lock.notify_all()
+
+    def _retire(self):
+        """Removes the current thread from the workers if there are more of them than `max_workers`."""
+        with self._lock:
+            current = threading.current_thread()
+            if self._threads.index(current) < max(self.max_workers, 1):
+                return False
+            self._threads.remove(current)
+            log.debug('task queue worker %s exiting, the number of workers was reduced', current.name)
+            return True
+
+    def _blocked(self, resources, deferred):
+        """Check if a task needing `resources` must wait for running tasks or tasks in `deferred` queued before it."""
+        for task, held in self._running.values():
+            if resources_conflict(resources, held):
+                return True
+        for task, waiting in deferred:
+            if resources_conflict(resources, waiting):
+                return True
+        return False
+
+    def _next_task(self):
+        """
+        Pick the next task which can run without conflicting with running tasks, and mark its resources as held.
+
+        :return: The task, or None if nothing could be started right now.
+        """
+        with self._lock:
+            # Tasks deferred earlier take precedence, and keep their queue order
+            for index, (task, resources) in enumerate(self._deferred):
+                if not self._blocked(resources, self._deferred[:index]):
+                    del self._deferred[index]
+                    self._running[id(task)] = (task, resources)
+                    return task
+            while True:
+                try:
+                    task = self.run_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.run_queue.task_done()
+                resources = task_resources(task)
+                if self._blocked(resources, self._deferred):
+                    log.debug('task %s is waiting for resources used by another task', task.name)
+                    self._deferred.append((task, resources))
+                    self._deferred.sort(key=lambda item: item[0])
+                    continue
+                self._running[id(task)] = (task, resources)
+                return task
+            if not self._deferred and not self._running and self._shutdown_when_finished:
+                self._shutdown_now = True
+                self._lock.notify_all()
+                return None
+            self._lock.wait(timeout=0.5)
+        return None
+
+    def _task_finished(self, task):
+        with self._lock:
+            self._running.pop(id(task), None)
+            self._lock.notify_all()
 
     def run(self):
         while not self._shutdown_now:
-            # Grab the first job from the run queue and do it
-            try:
-                self.current_task = self.run_queue.get(timeout=0.5)
-            except queue.Empty:
-                if self._shutdown_when_finished:
-                    self._shutdown_now = True
+            if self._retire():
+                return
+            # Grab the first runnable job from the run queue and do it
+            task = self._next_task()
+            if task is None:
                 continue
             try:
-                self.current_task.execute()
+                task.execute()
             except TaskAbort as e:
-                log.debug('task %s aborted: %r' % (self.current_task.name, e))
+                log.debug('task %s aborted: %r' % (task.name, e))
             except (ProgrammingError, OperationalError):
                 log.critical('Database error while running a task. Attempting to recover.')
-                self.current_task.manager.crash_report()
+                task.manager.crash_report()
             except Exception:
                 log.critical('BUG: Unhandled exception during task queue run loop.')
-                self.current_task.manager.crash_report()
+                task.manager.crash_report()
             finally:
-                self.run_queue.task_done()
-                self.current_task = None
+                self._task_finished(task)
 
-        remaining_jobs = self.run_queue.qsize()
+        if threading.current_thread() is not self._threads[0]:
+            return
+        remaining_jobs = len(self)
         if remaining_jobs:
             log.warning('task queue shut down with %s tasks remaining in the queue to run.' % remaining_jobs)
         else:
             log.debug('task queue shut down')
 
     def is_alive(self):
-        return self._thread.is_alive()
+        return any(thread.is_alive() for thread in self._threads)
 
     def put(self, task):
         """Adds a task to be executed to the queue."""
         self.run_queue.put(task)
+        with self._lock:
+            self._lock.notify()
 
     def __len__(self):
-        return self.run_queue.qsize()
+        return self.run_queue.qsize() + len(self._deferred)
 
     def shutdown(self, finish_queue=True):
         """
@@ -83,29 +291,52 @@ class TaskQueue(object):
         log.debug('task queue shutdown requested')
         if finish_queue:
             self._shutdown_when_finished = True
-            if self.run_queue.qsize():
+            if len(self):
                 log.verbose('There are %s tasks to execute. Shutdown will commence when they have completed.' %
-                            self.run_queue.qsize())
+                            len(self))
         else:
             self._shutdown_now = True
 
     def wait(self):
         """
-        Waits for the thread to exit.
+        Waits for the threads to exit.
         Allows abortion of task queue with ctrl-c
         """
         if sys.version_info >= (3, 4):
             # Due to python bug, Thread.is_alive doesn't seem to work properly under our conditions on python 3.4+
             # http://bugs.python.org/issue26793
             # TODO: Is it important to have the clean abortion? Do we need to find a better way?
-            self._thread.join()
-            return
+            # Workers added by a resize while waiting are joined too
+            joined = set()
+            while True:
+                threads = [thread for thread in list(self._threads) if thread not in joined]
+                if not threads:
+                    return
+                for thread in threads:
+                    thread.join()
+                    joined.add(thread)
         try:
-            while self._thread.is_alive():
+            while self.is_alive():
                 time.sleep(0.5)
         except KeyboardInterrupt:
-            log.error('Got ctrl-c, shutting down after running task (if any) completes')
+            log.error('Got ctrl-c, shutting down after running tasks (if any) complete')
             self.shutdown(finish_queue=False)
             # We still wait to finish cleanly, pressing ctrl-c again will abort
-            while self._thread.is_alive():
+            while self.is_alive():
                 time.sleep(0.5)
+
+
+@event('config.register')
+def register_config():
+    config_schema.register_config_key('max_concurrent_tasks', {
+        'type': 'integer',
+        'minimum': 1,
+        'description': 'How many independent tasks may be executed at the same time. Defaults to 1.'
+    })
+
+
+@event('manager.config_updated')
+def apply_max_concurrent_tasks(manager):
+    # Also applies changes made by reloading the config of a running daemon
+    if manager.task_queue is not None:
+        manager.task_queue.resize(manager.config.get('max_concurrent_tasks', 1))
@@ -12,6 +12,7 @@ from flexget.api.app import __version__ as __api_version__, base_message
 from flexget.api.core.server import ObjectsContainer as OC
 from flexget.manager import Manager
 from flexget.tests.conftest import MockManager
+from flexget.utils.requests import http_stats
 from flexget.utils.tools import get_latest_flexget_version_number
 
 
@@ -106,6 +107,18 @@ class TestServerAPI(object):
                         'api_version': __api_version__,
                         'latest_version': latest}
 
+    def test_http_stats(self, api_client, schema_match):
+        http_stats.clear()
+        http_stats.add('example.com', 'requests', 4)
+        http_stats.add('example.com', 'connections')
+        rsp = api_client.get('/server/http_stats/')
+        assert rsp.status_code == 200
+        data = json.loads(rsp.get_data(as_text=True))
+
+        errors = schema_match(OC.http_stats, data)
+        assert not errors
+        assert data['example.com']['reuse_ratio'] == 0.75
+
     def test_crash_logs_without_crash_log(self, api_client, schema_match):
         rsp = api_client.get('/server/crash_logs')
         assert rsp.status_code == 200
@@ -321,3 +321,41 @@ class TestTaskStatusPagination(object):
         data = json.loads(rsp.get_data(as_text=True))
 
         assert data[0]['produced'] == 10
+
+
+class TestStatusTimingsAPI(object):
+    config = """
+        tasks:
+          test_task:
+            mock:
+              - {title: 'entry 1'}
+            accept_all: yes
+    """
+
+    def test_task_timings(self, api_client, execute_task, schema_match):
+        rsp = api_client.get('/status/1/timings/')
+        assert rsp.status_code == 404
+
+        execute_task('test_task')
+        execute_task('test_task')
+
+        rsp = api_client.get('/status/1/timings/')
+        assert rsp.status_code == 200
+        data = json.loads(rsp.get_data(as_text=True))
+
+        errors = schema_match(OC.plugin_timings_list, data)
+        assert not errors
+
+        timings = dict(((t['phase'], t['plugin']), t) for t in data)
+        assert timings[('input', 'mock')]['runs'] == 2
+        assert timings[('filter', 'accept_all')]['runs'] == 2
+        assert timings[('input', 'mock')]['task'] == 'test_task'
+        assert timings[('input', 'mock')]['p95'] <= timings[('input', 'mock')]['max']
+
+        rsp = api_client.get('/status/timings/')
+        assert rsp.status_code == 200
+        data = json.loads(rsp.get_data(as_text=True))
+
+        errors = schema_match(OC.plugin_timings_list, data)
+        assert not errors
+        assert ('input', 'mock') in [(t['phase'], t['plugin']) for t in data]
@@ -0,0 +1,125 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import mock
+import pytest
+
+from flexget import plugin
+from flexget.event import event
+from flexget.manager import Session
+from flexget.plugin import PluginWarning
+from flexget.plugins.notifiers.notification_framework import (dispatcher, join_messages, retry_delay, OutboxMessage,
+                                                              Notification)
+
+
+class BatchNotification(object):
+    schema = {'type': 'object'}
+
+    def __init__(self):
+        self.batches = []
+        self.failures = 0
+
+    def notify(self, title, message, config):
+        self.notify_batch([(title, message)], config)
+
+    def notify_batch(self, messages, config):
+        if self.failures:
+            self.failures -= 1
+            raise PluginWarning('service unavailable')
+        self.batches.append(messages)
+
+
+@event('plugin.register')
+def register_plugin():
+    plugin.register(BatchNotification, 'batch_notification', interfaces=['notifiers'], api_ver=2, debug=True)
+
+
+@pytest.fixture()
+def batch_notifier(manager):
+    notifier = plugin.get_plugin_by_name('batch_notification').instance
+    notifier.batches = []
+    notifier.failures = 0
+    return notifier
+
+
+class TestNotificationQueue(object):
+    config = """
+        notification_queue:
+          retry_delay: 0
+        tasks:
+          test_background:
+            mock:
+             - {title: 'foo', url: 'http://bla.com'}
+             - {title: 'bar', url: 'http://bla2.com'}
+            accept_all: yes
+            notify:
+              entries:
+                title: "{{title}}"
+                message: "{{url}}"
+                via:
+                  - debug_notification:
+                      api_key: apikey
+    """
+
+    def test_background_delivery(self, execute_task, debug_notifications):
+        execute_task('test_background')
+        assert dispatcher.flush(timeout=10)
+        assert sorted(debug_notifications) == [('bar', 'http://bla2.com', {'api_key': 'apikey'}),
+                                               ('foo', 'http://bla.com', {'api_key': 'apikey'})]
+
+    def test_batching(self, manager, batch_notifier):
+        dispatcher.put([Notification('batch_notification', 't%d' % i, 'm%d' % i, {'a': 1}) for i in range(3)] +
+                       [Notification('batch_notification', 'other', 'config', {'a': 2})])
+        assert dispatcher.flush(timeout=10)
+        assert sorted(batch_notifier.batches) == [[('other', 'config')], [('t0', 'm0'), ('t1', 'm1'), ('t2', 'm2')]]
+
+    def test_retry(self, manager, batch_notifier):
+        batch_notifier.failures = 2
+        dispatcher.put([Notification('batch_notification', 'title', 'message', {})])
+        assert dispatcher.flush(timeout=10)
+        assert batch_notifier.batches == [[('title', 'message')]]
+
+    def test_give_up(self, manager, batch_notifier):
+        batch_notifier.failures = 10
+        dispatcher.put([Notification('batch_notification', 'title', 'message', {})])
+        assert dispatcher.flush(timeout=10)
+        assert batch_notifier.batches == []
+        assert batch_notifier.failures == 10 - (dispatcher.max_retries + 1)
+
+    def test_outbox(self, manager, batch_notifier):
+        dispatcher.save_outbox([Notification('batch_notification', 'title', 'message', {'a': 1}, attempts=1)])
+        with Session() as session:
+            assert session.query(OutboxMessage).count() == 1
+        dispatcher.load_outbox()
+        assert dispatcher.flush(timeout=10)
+        assert batch_notifier.batches == [[('title', 'message')]]
+        with Session() as session:
+            assert session.query(OutboxMessage).count() == 0
+
+    def test_stop_keeps_undelivered(self, manager, batch_notifier):
+        dispatcher.configure(retry_delay=60)
+        batch_notifier.failures = 1
+        dispatcher.put([Notification('batch_notification', 'title', 'message', {})])
+        unsent = dispatcher.stop(timeout=0.5)
+        assert [(n.title, n.message) for n in unsent] == [('title', 'message')]
+
+
+class TestNotificationHelpers(object):
+    def test_join_messages(self):
+        messages = [('t', 'aaa'), ('t', 'bbb'), ('t', 'ccc')]
+        assert join_messages(messages) == ['aaa\n\nbbb\n\nccc']
+        assert join_messages(messages, max_length=8) == ['aaa\n\nbbb', 'ccc']
+        assert join_messages([]) == []
+
+    def test_retry_delay(self):
+        assert retry_delay(PluginWarning('error'), 1, 10) == 10
+        assert retry_delay(PluginWarning('error'), 3, 10) == 40
+        assert retry_delay(PluginWarning('error'), 10, 10) == 300
+
+        assert retry_delay(PluginWarning('error', retry_after=5), 1, 10) == 5
+        response = mock.Mock(status_code=429, headers={'Retry-After': '7'})
+        assert retry_delay(PluginWarning('error', response=response), 1, 10) == 7
+        response = mock.Mock(status_code=500, headers={'Retry-After': '7'})
+        assert retry_delay(PluginWarning('error', response=response), 1, 10) == 10
+        # A request failing without a response
+        assert retry_delay(PluginWarning('error', response=None), 1, 10) == 10
@@ -4,6 +4,8 @@ from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
 class TestNotifyAbort(object):
     config = """
+        notification_queue:
+          background: no
         tasks:
           test_abort:
             # causes on_task_abort to be called
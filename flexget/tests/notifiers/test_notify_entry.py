@@ -6,6 +6,8 @@ import mock
 
 class TestNotifyEntry(object):
     config = """
+        notification_queue:
+          background: no
         tasks:
           test_basic_notify:
             mock:
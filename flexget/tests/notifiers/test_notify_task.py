@@ -4,6 +4,8 @@ from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
 class TestNotifyTask(object):
     config = """
+        notification_queue:
+          background: no
         tasks:
           test_accepted:
             mock:
@@ -1,13 +1,15 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+import copy
 from datetime import timedelta
 
 import pytest
+from future.utils import PY2
 
 from flexget.utils.cached_input import cached
 from flexget import plugin
-from flexget.entry import Entry
+from flexget.entry import Entry, FrozenEntry
 
 
 class InputPersist(object):
@@ -58,3 +60,89 @@ class TestInputCache(object):
         assert task.entries, 'should have created entries at the start'
         task = execute_task('test_db')
         assert task.entries, 'should have created entries from the cache'
+
+
+class InputMutable(object):
+    """Fake input plugin which emits an entry with mutable fields."""
+
+    @cached('test_mutable')
+    def on_task_input(self, task, config):
+        return [Entry(title='Test', url='http://test.com', genres=['drama'], info={'rating': 5})]
+
+
+plugin.register(InputMutable, 'test_mutable', api_ver=2)
+
+
+class TestInputCacheCopyOnWrite(object):
+    config = """
+        tasks:
+          test_mutable:
+            test_mutable: True
+    """
+
+    def test_mutations_do_not_leak(self, execute_task):
+        task = execute_task('test_mutable')
+        entry = task.find_entry(title='Test')
+        entry['genres'].append('comedy')
+        entry['info']['rating'] = 1
+        entry['title'] = 'Changed'
+        task = execute_task('test_mutable')
+        entry = task.find_entry(title='Test')
+        assert entry, 'entry should have been restored from the cache with its original title'
+        assert entry['genres'] == ['drama']
+        assert entry['info'] == {'rating': 5}
+        entry['genres'].append('comedy')
+        task = execute_task('test_mutable')
+        assert task.find_entry(title='Test')['genres'] == ['drama']
+
+
+class TestFrozenEntry(object):
+    def test_thaw(self):
+        entry = Entry(title='Test', url='http://test.com', genres=['drama'])
+        entry.trace('traced')
+        frozen = FrozenEntry(entry)
+        entry['genres'].append('comedy')
+        first, second = frozen.thaw(), frozen.thaw()
+        assert first['genres'] == ['drama']
+        assert first.traces == entry.traces
+        first['genres'].append('action')
+        first.trace('another')
+        assert second['genres'] == ['drama']
+        assert second.traces == [(None, None, 'traced')]
+        assert dict(second) == {'title': 'Test', 'url': 'http://test.com', 'original_url': 'http://test.com',
+                                'genres': ['drama']}
+
+    def test_shared_values_not_leaked(self):
+        entry = Entry(title='Test', url='http://test.com', genres=['drama'], info={'rating': 5})
+        frozen = FrozenEntry(entry)
+
+        def mutate(genres):
+            genres.append('comedy')
+
+        mutate(frozen.thaw().pop('genres'))
+        mutate(frozen.thaw().store.pop('genres'))
+        restored = frozen.thaw()
+        while restored:
+            key, value = restored.store.popitem()
+            if key == 'genres':
+                mutate(value)
+        mutate(copy.copy(frozen.thaw())['genres'])
+        mutate(frozen.thaw().copy().store.copy()['genres'])
+        mutate(dict(frozen.thaw())['genres'])
+        if not PY2:
+            # Python 2 copies dict subclasses without calling any of their methods
+            mutate(dict(frozen.thaw().store)['genres'])
+        # A copy made before the original is changed keeps the snapshot values
+        original = frozen.thaw()
+        copied = copy.copy(original)
+        mutate(original['genres'])
+        assert copied['genres'] == ['drama']
+        assert frozen.thaw()['genres'] == ['drama']
+        assert frozen.thaw()['info'] == {'rating': 5}
+
+    def test_lazy_fields(self):
+        entry = Entry(title='Test', url='http://test.com')
+        entry.register_lazy_func(lambda e: e.update(lazy_field='value'), ['lazy_field'])
+        restored = FrozenEntry(entry).thaw()
+        assert restored['lazy_field'] == 'value'
+        assert entry.is_lazy('lazy_field')
@@ -1,6 +1,10 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+from flexget.entry import Entry
+from flexget.plugins.filter.if_condition import FilterIf
+from flexget.utils import template
+
 
 class TestCondition(object):
     config = """
@@ -33,6 +37,10 @@ class TestCondition(object):
             if:
               - has_field('year'): accept
 
+          test_syntax_error:
+            if:
+              - "year >": accept
+
           test_sub_plugin:
             if:
               - title.upper() == 'TEST':
@@ -67,6 +75,37 @@ class TestCondition(object):
         assert entry
         assert len(task.accepted) == 1
 
+    def test_syntax_error(self, execute_task):
+        task = execute_task('test_syntax_error')
+        assert not task.accepted
+
+    def test_compiled_once(self, execute_task):
+        template.expression_cache.clear()
+        execute_task('test_condition_accept')
+        execute_task('test_condition_accept')
+        assert template.expression_cache.misses == 2
+        assert template.expression_cache.hits == 2 * 2 - 2
+
+    def test_lazy_fields(self, manager):
+        lookups = []
+
+        def lookup(entry):
+            lookups.append(entry['title'])
+            entry['lazy_field'] = 5
+
+        def unused_lookup(entry):
+            lookups.append('unused')
+
+        entries = [Entry(title='a', year=2000), Entry(title='b', year=2011)]
+        for entry in entries:
+            entry.register_lazy_func(lookup, ['lazy_field'])
+            entry.register_lazy_func(unused_lookup, ['unused_field'])
+        matched = FilterIf().matching_entries('year > 2010 or lazy_field > 1', entries)
+        assert [e['title'] for e in matched] == ['a', 'b']
+        assert lookups == ['a', 'b']
+        # The value is loaded into the entries themselves
+        assert not entries[0].is_lazy('lazy_field')
+
 
 class TestQualityCondition(object):
     config = """
@@ -15,9 +15,49 @@ class TestCrossmatch(object):
                 - title: entry 2
               action: reject
               fields: [title]
+
+          test_not_exact:
+            mock:
+            - {title: 'Some.Show.S01E01.720p'}
+            - {title: 'Other.Show.S01E01'}
+            - {title: 'Show'}
+            crossmatch:
+              from:
+              - mock:
+                - {title: 'Some.Show.S01E01', library: yes}
+                - {title: 'Show.S01E01.HDTV'}
+              action: accept
+              exact: no
+              fields: [title]
+
+          test_all_fields:
+            mock:
+            - {title: 'entry 1', series_name: 'foo', resolution: 720p}
+            - {title: 'entry 2', series_name: 'foo', resolution: 1080p}
+            crossmatch:
+              from:
+              - mock:
+                - {title: 'entry 3', series_name: 'foo', resolution: 720p}
+                - {title: 'entry 4', series_name: 'bar', resolution: 1080p}
+                - {title: 'entry 5', series_name: 'baz', resolution: 1080p}
+              action: reject
+              all_fields: yes
+              fields: [series_name, resolution]
     """
 
     def test_reject_title(self, execute_task):
         task = execute_task('test_title')
         assert task.find_entry('rejected', title='entry 2')
         assert len(task.rejected) == 1
+
+    def test_not_exact(self, execute_task):
+        task = execute_task('test_not_exact')
+        # Generated title contained in the entry title, and the other way around
+        entry = task.find_entry('accepted', title='Some.Show.S01E01.720p')
+        assert entry['library'], 'fields of the generated entry should have been copied'
+        assert task.find_entry('accepted', title='Show')
+        assert len(task.accepted) == 2
+
+    def test_all_fields(self, execute_task):
+        task = execute_task('test_all_fields')
+        assert [e['title'] for e in task.rejected] == ['entry 1']
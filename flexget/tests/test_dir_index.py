@@ -0,0 +1,83 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import os
+import time
+
+import pytest
+
+from flexget.utils.dir_index import index, DIR, FILE
+
+
+def age(*paths):
+    """Moves the modification times of `paths` far enough into the past for their listings to be reused."""
+    past = time.time() - 3600
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+@pytest.fixture()
+def tree(manager, tmpdir):
+    tmpdir.join('show').mkdir()
+    tmpdir.join('show', 'Show.S01E01.mkv').write('')
+    tmpdir.join('show', 'Show.S01E02.mkv').write('')
+    tmpdir.join('other').mkdir()
+    tmpdir.join('Movie.2010.mkv').write('')
+    age(tmpdir.join('show').strpath, tmpdir.join('other').strpath, tmpdir.strpath)
+    return tmpdir
+
+
+class TestDirectoryIndex(object):
+    config = 'tasks: {}'
+
+    def test_walk(self, tree):
+        paths = [(p.relpath(tree.strpath), flags & (DIR | FILE)) for p, flags in index.walk(tree.strpath)]
+        assert sorted(paths) == [('Movie.2010.mkv', FILE), ('other', DIR), ('show', DIR),
+                                 (os.path.join('show', 'Show.S01E01.mkv'), FILE),
+                                 (os.path.join('show', 'Show.S01E02.mkv'), FILE)]
+        # subdirectories come right after their parent
+        names = [p.name for p, _ in index.walk(tree.strpath)]
+        assert names.index('Show.S01E01.mkv') == names.index('show') + 1
+        assert [p.name for p, _ in index.walk(tree.strpath, max_depth=0)] == sorted(os.listdir(tree.strpath),
+                                                                                   key=names.index)
+
+    def test_only_changed_directories_listed(self, tree):
+        index.scan(tree.strpath)
+        listed = index.listed
+        assert [d.path for d, _ in index.scan(tree.strpath)] == [d.path for d, _ in index.scan(tree.strpath)]
+        assert index.listed == listed
+
+        tree.join('show', 'Show.S01E03.mkv').write('')
+        tree.join('other').remove()
+        directories = dict((d.path, d) for d, _ in index.scan(tree.strpath))
+        assert index.listed == listed + 2
+        assert 'Show.S01E03.mkv' in directories[tree.join('show').strpath].names()
+        assert tree.join('other').strpath not in directories
+
+    def test_persisted(self, tree):
+        index.scan(tree.strpath)
+        index.clear()
+        directories = index.scan(tree.strpath)
+        assert index.listed == 0
+        assert index.reused == len(directories) == 3
+
+    def test_parsed(self, tree):
+        calls = []
+
+        def parse(name):
+            calls.append(name)
+            return name.upper()
+
+        directory = index.directory(tree.join('show').strpath)
+        assert index.parsed(directory, 'upper', parse) == {'Show.S01E01.mkv': 'SHOW.S01E01.MKV',
+                                                           'Show.S01E02.mkv': 'SHOW.S01E02.MKV'}
+        assert index.parsed(directory, 'upper', parse, FILE) == index.parsed(directory, 'upper', parse)
+        assert len(calls) == 2
+
+        # Only new names are parsed after a change, also after a restart
+        index.save()
+        index.clear()
+        tree.join('show', 'Show.S01E03.mkv').write('')
+        directory = index.directory(tree.join('show').strpath)
+        assert len(index.parsed(directory, 'upper', parse)) == 3
+        assert calls == ['Show.S01E01.mkv', 'Show.S01E02.mkv', 'Show.S01E03.mkv']
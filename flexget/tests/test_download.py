@@ -4,6 +4,7 @@ from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 import pytest
 import sys
 import os
+import threading
 
 from jinja2 import Template
 
@@ -175,3 +176,56 @@ class TestDownloadAuth(object):
 
         task = execute_task('with_auth')
         assert len(task.accepted) == 2
+
+
+@pytest.mark.usefixtures('tmpdir')
+class TestDownloadConcurrent(object):
+    _config = """
+        tasks:
+          concurrent:
+            mock:
+            {% for i in range(6) %}
+              - {title: 'file {{ i }}', url: 'file://{{ source }}/file{{ i }}.txt'}
+            {% endfor %}
+              - {title: 'missing', url: 'file://{{ source }}/missing.txt'}
+            accept_all: yes
+            disable: builtins
+            download:
+              path: {{ dest }}
+              max_workers: 3
+              max_per_domain: 2
+      """
+
+    @pytest.fixture
+    def config(self, tmpdir):
+        source = tmpdir.mkdir('source')
+        for i in range(6):
+            source.join('file%s.txt' % i).write('content %s' % i)
+        dest = tmpdir.mkdir('dest')
+        return Template(self._config).render({'source': source.strpath, 'dest': dest.strpath})
+
+    def test_concurrent(self, execute_task, tmpdir):
+        task = execute_task('concurrent')
+        assert len(task.accepted) == 6
+        for i in range(6):
+            entry = task.find_entry('accepted', title='file %s' % i)
+            with open(entry['location']) as f:
+                assert f.read() == 'content %s' % i
+        assert task.find_entry('failed', title='missing'), 'only the missing file should have failed'
+
+    def test_task_logging(self, execute_task, caplog):
+        execute_task('concurrent')
+        main = threading.current_thread().name
+        records = [r for r in caplog.records if r.name == 'download' and r.threadName != main]
+        assert records, 'downloads should log from the worker threads'
+        assert all(r.task == 'concurrent' for r in records)
+
+    def test_domain_slots(self):
+        from flexget.plugins.output.download import DomainSlots
+
+        slots = DomainSlots(2)
+        slot = slots.slot('http://example.com/a')
+        assert slots.slot('http://example.com/b') is slot
+        assert slots.slot('http://other.com/a') is not slot
+        assert slot.acquire(False) and slot.acquire(False)
+        assert not slot.acquire(False), 'only 2 downloads per domain are allowed'
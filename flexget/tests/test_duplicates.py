@@ -26,6 +26,15 @@ class TestDuplicates(object):
             duplicates:
               field: foo
               action: reject
+          duplicates_reject_keeps_last:
+            mock:
+              - {title: 'entry 1', url: 'http://foo.bar', another_field: 'bla'}
+              - {title: 'entry 2', url: 'http://foo.baz', another_field: 'foo'}
+              - {title: 'entry 3', url: 'http://foo.qux', another_field: 'bla'}
+              - {title: 'entry 4', url: 'http://foo.quux', another_field: 'bla'}
+            duplicates:
+              field: another_field
+              action: reject
     """
 
     def test_duplicates_accept(self, execute_task):
@@ -42,3 +51,8 @@ class TestDuplicates(object):
         task = execute_task('duplicates_missing_field')
         assert len(task.accepted) == 0
         assert len(task.rejected) == 0
+
+    def test_duplicates_reject_keeps_last(self, execute_task):
+        task = execute_task('duplicates_reject_keeps_last')
+        assert [e['title'] for e in task.rejected] == ['entry 1', 'entry 3']
+        assert [e['title'] for e in task.entries] == ['entry 2', 'entry 4']
@@ -5,6 +5,8 @@ import os
 
 import pytest
 
+from flexget.utils.dir_index import index
+
 
 class TestExistsSeries(object):
     _config = """
@@ -89,10 +91,24 @@ class TestExistsSeries(object):
             - title: jinja2 s01e01
             accept_all: yes
             exists_series: __tmp__
+          test_name_suffixes:
+            mock:
+              - {title: 'Castle.2009.S01E01.720p'}
+              - {title: 'The.Flash.S01E01'}
+              - {title: 'The.Flash.S01E02'}
+              - {title: 'Doctor.Who.2005.S01E01'}
+              - {title: 'Shameless.US.S01E01'}
+            series:
+              - Castle (2009)
+              - The Flash
+              - Doctor Who (2005)
+              - Shameless (US)
+            exists_series: __tmp__
     """
 
     test_dirs = ['Foo.Bar.S01E02.XViD-GrpA', 'Asdf.S01E02.HDTV', 'Mock.S01E01.XViD', 'Test.S01E01.Proper',
-                 'jinja/jinja.s01e01', 'jinja.s01e02', 'jinja2/jinja2.s01e01', 'invalid']
+                 'jinja/jinja.s01e01', 'jinja.s01e02', 'jinja2/jinja2.s01e01', 'invalid',
+                 'Castle.S01E01.720p', 'The.Flash.2014.S01E01', 'Doctor.Who.S01E01', 'Shameless.S01E01']
 
     @pytest.fixture(params=['internal', 'guessit'], ids=['internal', 'guessit'])
     def config(self, request, tmpdir):
@@ -141,6 +157,15 @@ class TestExistsSeries(object):
         assert task.find_entry('rejected', title='Test.S01E01'), \
             'pre-existin proper should have caused reject'
 
+    def test_parsed_once(self, execute_task, tmpdir):
+        """Names are parsed once for all series, and the results are kept in the directory index"""
+        execute_task('test_propers')
+        directory = index.directory(tmpdir.strpath)
+        assert len(directory.parsed) == 1
+        results = list(directory.parsed.values())[0]
+        assert sorted(results) == sorted(directory.names())
+        assert results['Test.S01E01.Proper'][:2] == ['test', 'S01E01']
+
     def test_invalid(self, execute_task):
         """Exists_series plugin: no episode numbering on the disk"""
         # shouldn't raise anything
@@ -163,3 +188,10 @@ class TestExistsSeries(object):
             'jinja2 s01e01 should have been rejected (exists)'
         assert task.find_entry('accepted', title='jinja s01e02'), \
             'jinja s01e02 should have been accepted'
+
+    def test_name_suffixes(self, execute_task):
+        """Years and country codes are optional in the names of the files, like when matching series"""
+        task = execute_task('test_name_suffixes')
+        for title in ['Castle.2009.S01E01.720p', 'The.Flash.S01E01', 'Doctor.Who.2005.S01E01', 'Shameless.US.S01E01']:
+            assert task.find_entry('rejected', title=title), '%s should have been rejected (exists)' % title
+        assert task.find_entry('accepted', title='The.Flash.S01E02')
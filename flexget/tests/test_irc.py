@@ -0,0 +1,38 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import time
+
+from flexget.entry import Entry
+from flexget.plugins.daemon.irc import compile_task_routes, route_entries, announce_latency
+
+
+class TestTaskRoutes(object):
+    def test_route_entries(self):
+        routes = compile_task_routes([
+            {'task': 'tv', 'patterns': [{'regexp': 'hdtv', 'field': 'title'},
+                                        {'regexp': '^tv', 'field': 'irc_category'}]},
+            {'task': 'movies', 'patterns': [{'regexp': 'bluray', 'field': 'title'}]},
+        ])
+        tv = Entry(title='Show.S01E01.HDTV', url='', irc_category='TV/HD')
+        movie = Entry(title='Movie.2017.BluRay', url='', irc_category='Movies')
+        other = Entry(title='Show.S01E01.HDTV', url='', irc_category='Other')
+        assert route_entries(routes, [tv, movie, other]) == {'tv': [tv], 'movies': [movie]}
+
+
+class TestAnnounceLatency(object):
+    config = """
+        tasks:
+          announce:
+            accept_all: yes
+    """
+
+    def test_latency_recorded(self, manager, execute_task):
+        announce_latency.clear()
+        entry = Entry(title='announced', url='mock://announced', irc_announce_time=time.time() - 3,
+                      irc_connection='tracker')
+        manager.config['tasks']['announce']['mock'] = [dict(entry)]
+        execute_task('announce')
+        latency = announce_latency['tracker'].to_dict()
+        assert latency['count'] == 1
+        assert latency['max'] >= 3
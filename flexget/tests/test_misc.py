@@ -6,6 +6,7 @@ from future.utils import text_type
 
 import os
 import stat
+from collections import MutableMapping
 
 import pytest
 
@@ -164,6 +165,53 @@ class TestEntryStringCoercion(object):
         assert type(e['test']) == text_type  # pylint: disable=unidiomatic-typecheck
 
 
+class TestEntryCompact(object):
+    def test_lazy_allocation(self):
+        e = Entry('title', 'url')
+        assert not hasattr(e, '__dict__')
+        assert e._traces is None and e._snapshots is None and e._hooks is None
+        e.accept('because')
+        assert e.traces == [(None, 'accept', 'because')]
+        e.on_complete(lambda entry: entry.trace('completed'))
+        e.complete()
+        assert (None, None, 'completed') in e.traces
+        with pytest.raises(ValueError):
+            e.add_hook('foo', lambda entry: None)
+
+    def test_mapping_interface(self):
+        e = Entry('title', 'url')
+        assert isinstance(e, MutableMapping)
+        e.update({'a': 1, 'b': 2})
+        assert e.pop('a') == 1
+        assert e.pop('a', None) is None
+        with pytest.raises(KeyError):
+            e.pop('a')
+        assert e.setdefault('b', 3) == 2
+        assert 'b' in e and 'a' not in e
+        assert sorted(e.keys()) == ['b', 'original_url', 'title', 'url']
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+
+        e = Entry('title', 'url')
+        e['list'] = [1]
+        e.take_snapshot('snap')
+        for other in (copy.deepcopy(e), pickle.loads(pickle.dumps(e))):
+            assert other == e
+            assert other['list'] == [1] and other['list'] is not e['list']
+            assert other.snapshots['snap']['title'] == 'title'
+
+    def test_old_pickle_state(self):
+        e = Entry.__new__(Entry)
+        e.__setstate__({'store': {'title': 'title', 'url': 'url'}, 'traces': [], 'snapshots': {'snap': {}},
+                        '_state': 'accepted', '_hooks': {'accept': [], 'reject': [], 'fail': [], 'complete': []},
+                        'task': None})
+        assert e.accepted
+        assert e['title'] == 'title'
+        assert 'snap' in e.snapshots
+
+
 class TestFilterRequireField(object):
     config = """
         tasks:
@@ -0,0 +1,34 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+
+class TestParallelInputs(object):
+    config = """
+        templates:
+          inputs:
+            mock:
+              - {title: 'title1', url: 'http://url1'}
+              - {title: 'title2', url: 'http://url2'}
+            inputs:
+              - mock:
+                  - {title: 'title3', url: 'http://url3'}
+              - mock:
+                  - {title: 'title4', url: 'http://url4'}
+        tasks:
+          test_sequential:
+            template: inputs
+          test_parallel:
+            template: inputs
+            parallel_inputs: yes
+          test_limited:
+            template: inputs
+            parallel_inputs: 2
+    """
+
+    def test_same_order(self, execute_task):
+        expected = [e['title'] for e in execute_task('test_sequential').all_entries]
+        assert len(expected) == 4
+        for name in ('test_parallel', 'test_limited'):
+            task = execute_task(name)
+            assert [e['title'] for e in task.all_entries] == expected
+            assert all(e.task is task for e in task.all_entries)
@@ -32,3 +32,32 @@ class TestTaskParsing(object):
         # make sure when a non-default parser is installed on a task, it doesn't affect other tasks
         execute_task('explicit_parser')
         assert not plugin_parsing.selected_parsers
+
+
+class TestParseCache(object):
+    config = """
+        tasks: {}
+    """
+
+    def test_cached_results(self, manager):
+        plugin_parsing.parse_cache.clear()
+        parsing = get_plugin_by_name('parsing').instance
+        first = parsing.parse_series('Some.Show.S01E02.720p.HDTV-Group', name='Some Show')
+        assert plugin_parsing.parse_cache.misses == 1
+        second = parsing.parse_series('Some.Show.S01E02.720p.HDTV-Group', name='Some Show')
+        assert plugin_parsing.parse_cache.hits == 1
+        assert second.identifier == first.identifier == 'S01E02'
+        assert second.quality == first.quality
+
+        # Different parser options must not share the cached result
+        parsing.parse_series('Some.Show.S01E02.720p.HDTV-Group', name='Some Show', identified_by='ep')
+        assert plugin_parsing.parse_cache.misses == 2
+
+    def test_results_are_copies(self, manager):
+        plugin_parsing.parse_cache.clear()
+        parsing = get_plugin_by_name('parsing').instance
+        movie = parsing.parse_movie('The.Matrix.1999.1080p.BluRay.x264-FlexGet')
+        movie.name = 'Changed'
+        again = parsing.parse_movie('The.Matrix.1999.1080p.BluRay.x264-FlexGet')
+        assert again.name == 'The Matrix'
+        assert again.quality is not movie.quality
@@ -0,0 +1,65 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import logging
+import threading
+
+import mock
+
+from flexget.logger import suppress_logging
+from flexget.manager import Session
+from flexget.plugins.cli.perf import BENCHMARKS, do_cli, run_benchmarks
+from flexget.plugins.filter.seen import SeenEntry
+
+
+class TestPerf(object):
+    config = 'tasks: {}'
+
+    def test_benchmarks(self, manager):
+        results = run_benchmarks(manager, sorted(BENCHMARKS), entries=40, shows=10, repeat=1, memory=False)
+        assert results['parameters']['entries'] == 40
+        benchmarks = results['benchmarks']
+        assert sorted(benchmarks) == sorted(BENCHMARKS)
+        for name, result in benchmarks.items():
+            assert result['http_requests'] == 0, name
+            assert result['queries'] > 0, name
+            assert len(result['runs']) == 1
+        assert benchmarks['series']['entries'] == 40
+        assert benchmarks['filesystem']['entries'] == 20
+        # Everything was seen in the unmeasured run
+        assert benchmarks['seen']['accepted'] == 0
+        assert benchmarks['crossmatch']['accepted'] == 20
+        assert benchmarks['quality']['accepted'] < 40
+
+    def test_database_restored(self, manager):
+        run_benchmarks(manager, ['seen'], entries=10, shows=5, repeat=1, memory=False)
+        with Session() as session:
+            assert session.query(SeenEntry).count() == 0
+
+    def test_deterministic(self, manager):
+        first = run_benchmarks(manager, ['regexp'], entries=30, shows=10, repeat=1, memory=False)
+        second = run_benchmarks(manager, ['regexp'], entries=30, shows=10, repeat=1, memory=False)
+        assert first['benchmarks']['regexp']['accepted'] == second['benchmarks']['regexp']['accepted']
+
+    def test_refused_in_daemon(self, manager):
+        manager.is_daemon = True
+        try:
+            with mock.patch('flexget.plugins.cli.perf.run_benchmarks') as run:
+                do_cli(manager, mock.Mock(benchmarks=['seen']))
+        finally:
+            manager.is_daemon = False
+        assert not run.called
+
+    def test_logging_of_other_threads_kept(self, manager, caplog):
+        log = logging.getLogger('perf_test')
+        other = threading.Thread(target=log.info, args=('from another thread',))
+        with suppress_logging(logging.WARNING):
+            log.info('suppressed')
+            log.warning('not suppressed')
+            other.start()
+            other.join()
+        log.info('after')
+        assert 'suppressed' not in [r.getMessage() for r in caplog.records]
+        assert 'not suppressed' in caplog.text
+        assert 'from another thread' in caplog.text
+        assert 'after' in caplog.text
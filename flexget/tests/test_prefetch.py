@@ -0,0 +1,89 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import logging
+import threading
+
+from flexget import plugin
+from flexget.event import event
+from flexget.plugins.metainfo.prefetch import prefetch_fields
+from flexget.task import Task
+
+log = logging.getLogger('lazy_thread_lookup')
+
+
+class LazyThreadLookup(object):
+    """Registers a lazy field which records the thread it was evaluated in."""
+
+    schema = {'type': 'boolean'}
+
+    def on_task_metainfo(self, task, config):
+        for entry in task.entries:
+            entry.register_lazy_func(self.lookup, ['lazy_thread', 'lazy_other'])
+
+    def lookup(self, entry):
+        log.info('looking up %s', entry['title'])
+        entry['lazy_thread'] = threading.current_thread().name
+        entry['lazy_other'] = entry['title']
+
+
+@event('plugin.register')
+def register_plugin():
+    plugin.register(LazyThreadLookup, 'lazy_thread_lookup', api_ver=2, debug=True)
+
+
+class TestPrefetch(object):
+    config = """
+        templates:
+          global:
+            mock:
+              - {title: 'a'}
+              - {title: 'b'}
+              - {title: 'c'}
+            lazy_thread_lookup: yes
+            disable: seen
+        tasks:
+          prefetch:
+            prefetch: 2
+            if:
+              - "lazy_thread != ''": accept
+          no_prefetch:
+            if:
+              - "lazy_thread != ''": accept
+          not_needed:
+            prefetch: yes
+            accept_all: yes
+          fields:
+            imdb:
+              min_score: 5
+              accept_genres: [drama]
+            require_field: [tvdb_id, imdb_id]
+            if:
+              - "imdb_votes > 5 and has_field('movie_name')": accept
+    """
+
+    def test_prefetch(self, execute_task):
+        task = execute_task('prefetch')
+        assert len(task.accepted) == 3
+        for entry in task.accepted:
+            assert entry['lazy_thread'] != threading.current_thread().name, 'field should have been prefetched'
+
+    def test_task_logging(self, execute_task, caplog):
+        execute_task('prefetch')
+        records = [r for r in caplog.records if r.name == 'lazy_thread_lookup']
+        assert len(records) == 3
+        assert all(r.task == 'prefetch' and r.threadName != threading.current_thread().name for r in records)
+
+    def test_no_prefetch(self, execute_task):
+        task = execute_task('no_prefetch')
+        assert len(task.accepted) == 3
+        for entry in task.accepted:
+            assert entry['lazy_thread'] == threading.current_thread().name
+
+    def test_not_needed(self, execute_task):
+        task = execute_task('not_needed')
+        assert all(entry.is_lazy('lazy_thread') for entry in task.accepted)
+
+    def test_prefetch_fields(self, manager):
+        task = Task(manager, 'fields')
+        assert prefetch_fields(task) == {'imdb_score', 'imdb_genres', 'tvdb_id', 'imdb_id', 'imdb_votes'}
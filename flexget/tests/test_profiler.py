@@ -0,0 +1,66 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import os
+import time
+
+from flexget.event import get_events
+from flexget.utils import json
+from flexget.utils.profiler import SamplingProfiler, start_profiler, stop_profiler
+
+
+class TestSamplingProfiler(object):
+    config = """
+        tasks:
+          test_sleep:
+            mock:
+              - {title: 'entry 1'}
+            sleep:
+              seconds: 1
+              phase: input
+    """
+
+    def test_task_samples(self, execute_task):
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        try:
+            execute_task('test_sleep')
+        finally:
+            profiler.stop()
+
+        assert profiler.sample_count > 0
+        stacks = list(profiler.samples['test_sleep'])
+        assert all(stack[0].startswith('phase: ') and stack[1].startswith('plugin: ') for stack in stacks)
+        # Nearly all the time is spent sleeping
+        sleeping = [s for s in stacks if s[:2] == ('phase: input', 'plugin: sleep') and 'do_sleep' in s[-1]]
+        assert sleeping
+
+        collapsed = profiler.to_collapsed()
+        assert 'task: test_sleep;phase: input;plugin: sleep;' in collapsed
+
+        speedscope = profiler.to_speedscope()
+        assert [p['name'] for p in speedscope['profiles']] == ['test_sleep']
+        profile = speedscope['profiles'][0]
+        assert len(profile['samples']) == len(profile['weights'])
+        frames = speedscope['shared']['frames']
+        assert all(0 <= index < len(frames) for sample in profile['samples'] for index in sample)
+
+    def test_handlers_removed(self, manager):
+        before = len(get_events('task.execute.before_plugin'))
+        profiler = SamplingProfiler()
+        profiler.start()
+        assert len(get_events('task.execute.before_plugin')) == before + 1
+        profiler.stop()
+        assert len(get_events('task.execute.before_plugin')) == before
+        assert not profiler.running
+
+    def test_start_stop(self, tmpdir):
+        assert stop_profiler(tmpdir.strpath) is None
+        assert start_profiler(interval=0.005)
+        assert not start_profiler()
+        time.sleep(0.05)
+        paths = stop_profiler(tmpdir.strpath)
+        assert len(paths) == 2
+        assert all(os.path.exists(path) for path in paths)
+        with open([p for p in paths if p.endswith('.json')][0]) as f:
+            assert json.load(f)['exporter'] == 'flexget'
@@ -6,6 +6,7 @@ from jinja2 import Template
 
 from flexget.plugins.parsers.parser_guessit import ParserGuessit
 from flexget.plugins.parsers.parser_internal import ParserInternal
+from flexget.utils import qualities
 from flexget.utils.qualities import Quality
 
 
@@ -19,6 +20,29 @@ class TestQualityModule(object):
             got_val = Quality(test_val).name
             assert got_val == '720p', got_val
 
+    def test_parse_cache(self):
+        first = Quality('Some.Show.720p.HDTV.x264-GRP')
+        first.source = qualities.get('bluray').source
+        second = Quality('Some.Show.720p.HDTV.x264-GRP')
+        assert second == '720p hdtv h264', 'modifying a parsed quality changed the cached result'
+        assert second.clean_text == first.clean_text
+        assert Quality('Some.Show.S01E01-GRP') == Quality()
+
+    def test_get_cache(self):
+        first = qualities.get('720p hdtv')
+        first.codec = qualities.get('h264').codec
+        assert qualities.get('720p hdtv') == '720p hdtv'
+        with pytest.raises(ValueError):
+            qualities.get('720p foobar')
+
+    def test_requirements_cache(self):
+        first = qualities.Requirements('720p hdtv+')
+        first.parse_requirements('h264')
+        second = qualities.Requirements('720p hdtv+')
+        assert str(second) == '720p hdtv+'
+        assert second.allows('720p bluray xvid')
+        assert not first.allows('720p bluray xvid')
+
 
 class TestQualityParser(object):
     @pytest.fixture(scope='class', params=['internal', 'guessit'], ids=['internal', 'guessit'], autouse=True)
@@ -88,6 +88,18 @@ class TestRegexp(object):
                 - 6:
                     from: imdb_score
 
+          test_first_match_wins:
+            regexp:
+              accept:
+                - exp1:
+                    set: {matched: first}
+                - regexp:
+                    set: {matched: second}
+                    not: regexp1
+                - reg:
+                    set: {matched: third}
+              rest: reject
+
           test_match_in_list:
             regexp:
               # Also tests global from option
@@ -154,3 +166,10 @@ class TestRegexp(object):
         assert task.find_entry('accepted', title='expression'), '\'expression\' should have been accepted'
         assert task.find_entry('entries',
                                title='regular') not in task.accepted, '\'regular\' should not have been accepted'
+
+    def test_first_match_wins(self, execute_task):
+        task = execute_task('test_first_match_wins')
+        assert task.find_entry('accepted', title='regexp1', matched='first')
+        assert task.find_entry('accepted', title='regexp2', matched='second')
+        assert task.find_entry('accepted', title='regular', matched='third')
+        assert task.find_entry('rejected', title='expression')
@@ -0,0 +1,81 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import mock
+import pytest
+from requests import Request
+
+from flexget.utils import requests
+
+
+class TestSharedPool(object):
+    def test_pool_shared_across_sessions(self):
+        first, second = requests.Session(), requests.Session()
+        url = 'http://pooled.example.com/'
+        assert first.get_adapter(url).poolmanager is second.get_adapter(url).poolmanager is requests.pool_manager
+        pool = requests.pool_manager.connection_from_url(url)
+        first.close()
+        assert requests.pool_manager.connection_from_url(url) is pool, 'closing a session should keep the shared pools'
+
+    def test_tls_settings_not_shared(self):
+        pools = []
+
+        def urlopen(pool, *args, **kwargs):
+            pools.append((pool, pool.cert_reqs))
+            raise RuntimeError('no network in tests')
+
+        verified, unverified = requests.Session(), requests.Session()
+        unverified.verify = False
+        with mock.patch.object(requests.CountingHTTPSConnectionPool, 'urlopen', autospec=True, side_effect=urlopen):
+            for session in (verified, unverified, verified):
+                request = session.prepare_request(Request('GET', 'https://tls.example.com/'))
+                with pytest.raises(RuntimeError):
+                    session.send(request)
+        assert [cert_reqs for _, cert_reqs in pools] == ['CERT_REQUIRED', 'CERT_NONE', 'CERT_REQUIRED']
+        assert pools[0][0] is pools[2][0]
+        assert pools[0][0] is not pools[1][0]
+
+    def test_connection_counters(self):
+        requests.http_stats.clear()
+        pool = requests.pool_manager.connection_from_url('http://counted.example.com/')
+        for _ in range(3):
+            pool._put_conn(pool._get_conn())
+        stats = requests.http_stats.snapshot()['counted.example.com']
+        assert stats['connections'] == 1, 'idle connection should have been reused'
+
+    def test_configure_pool(self):
+        try:
+            requests.configure_pool(max_connections_per_host=2, block=True)
+            assert requests.pool_manager.connection_pool_kw['maxsize'] == 2
+            assert requests.pool_manager.connection_pool_kw['block'] is True
+        finally:
+            requests.configure_pool()
+        assert requests.pool_manager.connection_pool_kw['maxsize'] == requests.DEFAULT_MAX_CONNECTIONS_PER_HOST
+
+
+class TestTokenBucketLimiter(object):
+    def test_wait_does_not_hold_lock(self):
+        limiter = requests.TokenBucketLimiter('limited.example.com', 1, '10 seconds')
+        limiter.tokens = 0
+        waits = []
+
+        def sleep(seconds):
+            # Another thread must be able to reserve its token while we wait
+            assert not limiter.lock.locked()
+            waits.append(seconds)
+
+        requests.http_stats.clear()
+        with mock.patch('flexget.utils.requests.time.sleep', sleep):
+            limiter()
+            limiter()
+        assert len(waits) == 2
+        assert waits[1] > waits[0], 'second request should queue behind the first'
+        stats = requests.http_stats.snapshot()['limited.example.com']
+        assert stats['waits'] == 2
+        assert stats['wait_time'] == pytest.approx(sum(waits))
+
+    def test_no_wait(self):
+        limiter = requests.TokenBucketLimiter('nowait.example.com', 1, '10 seconds', wait=False)
+        limiter()
+        with pytest.raises(requests.RequestException):
+            limiter()
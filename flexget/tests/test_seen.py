@@ -186,3 +186,30 @@ class TestFilterSeenMovies(object):
         task = execute_task('test_2')
         msg = 'Changing scope should not have rejected Seen movie title 13'
         assert not task.find_entry('rejected', title='Seen movie title 13'), msg
+
+
+class TestSeenBatchLookup(object):
+    config = """
+      tasks:
+        test:
+          mock:
+          - title: a title
+    """
+
+    def test_many_values(self, manager):
+        from flexget.manager import Session
+        from flexget.plugins.filter.seen import add, search_by_field_values_many
+
+        with Session() as session:
+            for i in range(1000):
+                add('title %s' % i, 'other', {'url': 'http://localhost/%s' % i}, session=session)
+            add('local title', 'test', {'url': 'http://localhost/local'}, local=True, session=session)
+
+        values = ['http://localhost/%s' % i for i in range(0, 2000, 2)] + ['http://localhost/local']
+        with Session() as session:
+            found = search_by_field_values_many(values, 'test', session=session)
+            assert len(found) == 500
+            assert found['http://localhost/998'].seen_entry.title == 'title 998'
+            assert 'http://localhost/local' not in found
+            found = search_by_field_values_many(values, 'test', local=True, session=session)
+            assert list(found) == ['http://localhost/local']
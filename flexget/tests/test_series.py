@@ -11,7 +11,9 @@ from sqlalchemy.sql import select
 from flexget.entry import Entry
 from flexget.logger import capture_output
 from flexget.manager import Session, get_parser
-from flexget.plugins.filter.series import Series, SeriesTask, Episode, EpisodeRelease, Season, SeasonRelease
+from flexget.plugins.filter.series import (
+    Series, SeriesTask, Episode, EpisodeRelease, Season, SeasonRelease, SeriesMatcher
+)
 from flexget.task import TaskAbort
 
 
@@ -2419,3 +2421,43 @@ class TestSeriesDDAudio(object):
         assert task.find_entry(title='Channels.S01E01.1080p.HDTV.DD+7.1-FlexGet'), \
             'Channels.S01E01.1080p.HDTV.DD+7.1-FlexGet should have been accepted'
         assert len(task.accepted) == 1, 'should have accepted only one'
+
+
+class TestSeriesMatcher(object):
+    config = """
+        templates:
+          global:
+            parsing:
+              series: {{parser}}
+        tasks:
+          test_candidates:
+            mock:
+              - {title: 'The.Office.S01E01.720p.HDTV-FlexGet'}
+              - {title: 'Office.S01E02.720p.HDTV-FlexGet'}
+              - {title: 'Law.and.Order.S02E01.720p.HDTV-FlexGet'}
+              - {title: 'LO.S02E02.720p.HDTV-FlexGet'}
+              - {title: 'Unrelated.S01E01.720p.HDTV-FlexGet'}
+            series:
+              - The Office
+              - Office
+              - Law & Order:
+                  alternate_name: LO
+    """
+
+    def test_candidates(self):
+        matcher = SeriesMatcher([{'The Office': {}}, {'Office': {}}, {'Law & Order': {'alternate_name': 'L&O'}},
+                                 {'Show (US)': {}}, {'Custom': {'name_regexp': 'custom'}}, {'24': {}}])
+        assert matcher.candidates('The.Office.S01E01') == {0, 1, 4}
+        assert matcher.candidates('Law.and.Order.S01E02') == {2, 4}
+        assert matcher.candidates('L and O 1x02') == {2, 4}
+        assert matcher.candidates('Show.US.S01E01') == {3, 4}
+        assert matcher.candidates('24.S01E01') == {4, 5}
+        assert matcher.candidates('Unrelated.S01E01') == {4}
+
+    def test_task(self, execute_task):
+        task = execute_task('test_candidates')
+        assert task.find_entry('accepted', title='The.Office.S01E01.720p.HDTV-FlexGet', series_name='The Office')
+        assert task.find_entry('accepted', title='Office.S01E02.720p.HDTV-FlexGet', series_name='Office')
+        assert task.find_entry('accepted', title='Law.and.Order.S02E01.720p.HDTV-FlexGet')
+        assert task.find_entry('accepted', title='LO.S02E02.720p.HDTV-FlexGet', series_name='Law & Order')
+        assert not task.find_entry(title='Unrelated.S01E01.720p.HDTV-FlexGet').get('series_name')
@@ -7,6 +7,7 @@ import pytest
 
 from flexget.plugins.parsers.parser_internal import ParserInternal
 from flexget.plugins.parsers.parser_guessit import ParserGuessit
+from flexget.utils.titles.series import SeriesParser
 
 
 class TestSeriesParser(object):
@@ -617,3 +618,25 @@ class TestSeriesParser(object):
         assert s.season == 1
         assert s.episode == 1
 
+
+class TestSeriesParserProfile(object):
+    def test_profile_shared(self):
+        first = SeriesParser(name='Show (US)', alternate_names=['Other Show'], ep_regexps=[r'(\d{2})x(\d{2})'])
+        second = SeriesParser(name='Show (US)', alternate_names=['Other Show'], ep_regexps=[r'(\d{2})x(\d{2})'])
+        assert first.name_regexps is second.name_regexps
+        assert first.ep_regexps is second.ep_regexps
+        assert first.strict_name, 'parenthetical should enable strict name matching'
+        assert SeriesParser(name='Show (US)').ep_regexps is SeriesParser.ep_regexps
+
+    def test_parse_with_profile(self):
+        for _ in range(2):
+            parser = SeriesParser(name='Other Show', ep_regexps=[r'ep(\d{2})x(\d{2})'])
+            parser.parse('Other.Show.ep03x04.720p.HDTV')
+            assert parser.valid
+            assert (parser.season, parser.episode) == (3, 4)
+
+    def test_guessed_name(self):
+        parser = SeriesParser()
+        parser.parse('Guessed.Show.S01E02.720p.HDTV')
+        assert parser.valid
+        assert parser.name == 'Guessed Show'
@@ -1,6 +1,9 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+from flexget.entry import Entry
+from flexget.task import EntryContainer
+
 
 class TestTemplate(object):
     config = """
@@ -29,3 +32,74 @@ class TestTemplate(object):
 
         task = execute_task('test')
         assert len(task.entries) == 2, 'Should have emitted House S01E02 and Hawaii Five-O S01E01'
+
+
+class TestEntryContainer(object):
+    def test_state_counts(self):
+        entries = [Entry(title='entry %s' % i, url='http://test/%s' % i) for i in range(4)]
+        container = EntryContainer(entries)
+        assert len(container.entries) == 4 and len(container.undecided) == 4
+        assert not container.accepted
+        entries[0].accept()
+        entries[1].reject()
+        entries[2].fail()
+        assert len(container.accepted) == 1 and container.accepted[0] is entries[0]
+        assert len(container.entries) == 2
+        assert len(container.rejected) == 1 and len(container.failed) == 1
+        container.remove(entries[0])
+        assert not container.accepted
+        entries[0].reject()
+        assert len(container.rejected) == 1, 'entries removed from the container should not be counted'
+        container[:] = entries[3:]
+        assert len(container.undecided) == 1 and not container.rejected and not container.failed
+        container.extend(entries[:1])
+        assert len(container.rejected) == 1
+        del container[0]
+        assert not container.undecided
+
+    def test_multiple_containers(self):
+        entry = Entry(title='entry', url='http://test')
+        first, second = EntryContainer([entry]), EntryContainer([entry])
+        entry.accept()
+        assert len(first.accepted) == 1 and len(second.accepted) == 1
+        first.pop()
+        entry.reject()
+        assert len(first.entries) == 0 and len(first.rejected) == 0
+        assert len(second.rejected) == 1
+
+    def test_lookup(self):
+        entries = [Entry(title='entry', url='http://test/1'), Entry(title='other', url='http://test/2'),
+                   Entry(title='entry', url='http://test/3')]
+        container = EntryContainer(entries)
+        assert container.lookup('title', 'entry') == [entries[0], entries[2]]
+        entries[0]['title'] = 'changed'
+        assert container.lookup('title', 'entry') == [entries[2]]
+        assert container.lookup('url', 'http://test/1') == [entries[0]]
+        assert container.lookup('original_url', 'http://test/2') == [entries[1]]
+        container.reverse()
+        assert container.lookup('title', 'changed') == [entries[0]]
+        assert container.lookup('description', 'foo') is None
+
+
+class TestFindEntry(object):
+    config = """
+        tasks:
+          test:
+            mock:
+              - {title: 'a', url: 'http://test/a'}
+              - {title: 'b', url: 'http://test/b'}
+              - {title: 'b', url: 'http://test/b2'}
+            accept_all: yes
+            set:
+              title: '{{title}}{{title}}'
+    """
+
+    def test_find_entry(self, execute_task):
+        task = execute_task('test')
+        assert not task.find_entry(title='a')
+        assert task.find_entry('accepted', title='bb')['url'] == 'http://test/b'
+        assert task.find_entry('accepted', title='bb', url='http://test/b2')
+        assert not task.find_entry('rejected', title='aa')
+        task.find_entry(title='aa').reject()
+        assert task.find_entry('rejected', title='aa', original_url='http://test/a')
+        assert len(task.accepted) == 2
@@ -0,0 +1,167 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import threading
+import time
+
+from flexget import plugin
+from flexget.event import event
+from flexget.task import Task
+from flexget.task_queue import TaskQueue, resources_conflict, task_resources
+
+
+class BlockTask(object):
+    """Holds tasks in the filter phase until `release` is set."""
+
+    schema = {'type': 'boolean'}
+    blocked = threading.Event()
+    release = threading.Event()
+
+    def on_task_filter(self, task, config):
+        self.blocked.set()
+        self.release.wait(10)
+
+
+@event('plugin.register')
+def register_plugin():
+    plugin.register(BlockTask, 'block_task', api_ver=2, debug=True)
+
+
+class TestTaskResources(object):
+    config = """
+        templates:
+          shows:
+            series:
+              - Other Show
+        tasks:
+          series_a:
+            series:
+              - Some Show
+          series_b:
+            series:
+              group:
+                - some show
+          series_c:
+            template: shows
+          configured:
+            configure_series:
+              from:
+                mock:
+                  - title: Some Show
+          list_a:
+            list_add:
+              - entry_list: a
+          list_b:
+            entry_list: a
+          list_c:
+            list_add:
+              - entry_list: c
+    """
+
+    def resources(self, manager, name):
+        return task_resources(Task(manager, name))
+
+    def test_series_conflicts(self, manager):
+        a = self.resources(manager, 'series_a')
+        assert ('series', 'some show') in a
+        assert resources_conflict(a, self.resources(manager, 'series_b'))
+        assert not resources_conflict(a, self.resources(manager, 'series_c'))
+        assert ('series', 'other show') in self.resources(manager, 'series_c')
+
+    def test_all_series_conflicts(self, manager):
+        configured = self.resources(manager, 'configured')
+        assert resources_conflict(configured, self.resources(manager, 'series_a'))
+        assert resources_conflict(configured, self.resources(manager, 'series_c'))
+
+    def test_list_conflicts(self, manager):
+        a = self.resources(manager, 'list_a')
+        assert resources_conflict(a, self.resources(manager, 'list_b'))
+        assert not resources_conflict(a, self.resources(manager, 'list_c'))
+
+    def test_same_task_conflicts(self, manager):
+        assert resources_conflict(self.resources(manager, 'list_c'), self.resources(manager, 'list_c'))
+
+    def test_deferred_order(self, manager):
+        task_queue = TaskQueue(max_workers=2)
+        first, second, third = Task(manager, 'series_a'), Task(manager, 'series_b'), Task(manager, 'series_c')
+        for task in (first, second, third):
+            task_queue.put(task)
+        assert task_queue._next_task() is first
+        # series_b shares a series with the running task and has to wait, series_c can run next to it
+        assert task_queue._next_task() is third
+        assert task_queue.waiting_tasks == [second]
+        task_queue._task_finished(first)
+        assert task_queue._next_task() is second
+
+
+class TestTaskQueueSize(object):
+    config = """
+        max_concurrent_tasks: 2
+        tasks: {}
+    """
+
+    def test_config_applied(self, manager):
+        assert manager.task_queue.max_workers == 2
+        manager.update_config(dict(manager.user_config, max_concurrent_tasks=3))
+        assert manager.task_queue.max_workers == 3
+
+    def test_resize(self):
+        task_queue = TaskQueue(max_workers=1)
+        task_queue.start()
+        try:
+            task_queue.resize(3)
+            assert len(task_queue._threads) == 3
+            assert all(thread.is_alive() for thread in task_queue._threads)
+            task_queue.resize(1)
+            # Idle workers notice they are not needed on their next look at the queue
+            for _ in range(50):
+                if len(task_queue._threads) == 1:
+                    break
+                time.sleep(0.1)
+            assert [thread.name for thread in task_queue._threads] == ['task_queue']
+        finally:
+            task_queue.shutdown(finish_queue=False)
+            task_queue.wait()
+        assert not task_queue.is_alive()
+
+
+class TestTaskIsolation(object):
+    config = """
+        tasks:
+          no_builtins:
+            mock:
+              - {title: 'a'}
+            accept_all: yes
+            disable: builtins
+            plugin_priority:
+              accept_all: 1
+            block_task: yes
+          with_builtins:
+            mock:
+              - {title: 'a'}
+            accept_all: yes
+    """
+
+    def test_disable_only_affects_own_task(self, manager):
+        BlockTask.blocked.clear()
+        BlockTask.release.clear()
+        task_queue = TaskQueue(max_workers=2)
+        task_queue.start()
+        try:
+            blocking = Task(manager, 'no_builtins')
+            task_queue.put(blocking)
+            assert BlockTask.blocked.wait(10)
+            assert 'seen' not in [p.name for p in blocking.plugins('filter')]
+            # Seen keeps working for tasks running at the same time
+            tasks = [Task(manager, 'with_builtins'), Task(manager, 'with_builtins')]
+            for task in tasks:
+                task_queue.put(task)
+                assert task.finished_event.wait(10)
+            assert tasks[0].accepted and not tasks[1].accepted
+            accept_all = plugin.get_plugin_by_name('accept_all')
+            assert accept_all.phase_handlers['filter'].priority != 1
+        finally:
+            BlockTask.release.set()
+            task_queue.shutdown()
+            task_queue.wait()
+        assert blocking.accepted
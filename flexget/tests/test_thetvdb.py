@@ -12,7 +12,8 @@ import pytest
 from flexget.manager import Session
 from flexget.plugins.internal.api_tvdb import persist, TVDBSearchResult, lookup_series, mark_expired, TVDBRequest, \
     TVDBEpisode, \
-    find_series_id
+    find_series_id, TVDBSeries, lookup_series_many
+from flexget.plugins.metainfo import thetvdb_lookup
 
 
 @mock.patch('flexget.plugins.internal.api_tvdb.mark_expired')
@@ -440,3 +441,64 @@ class TestTheTVDBLanguages(object):
         assert entry['tvdb_ep_name'] == 'Gasland'
         assert entry['tvdb_ep_overview'] == 'Indrukwekkende documentaire over de gevolgen van schaliegaswinning in ' \
                                             'de VS\r\n'
+
+
+class TestTVDBLookupMany(object):
+    config = """
+        tasks:
+          prefetch:
+            mock:
+              - {title: 'Fresh.Show.S01E01', series_name: 'Fresh Show'}
+              - {title: 'Oude.Show.S01E01', series_name: 'Oude Show'}
+              - {title: 'Old.Show.S01E01', series_name: 'Old Show', tvdb_id: 2}
+            thetvdb_lookup: yes
+            prefetch:
+              # The in-memory test database can not be used from several threads at once
+              max_workers: 1
+              fields: [tvdb_series_name]
+            accept_all: yes
+    """
+
+    def test_lookup_many(self, manager):
+        with Session() as session:
+            session.execute(TVDBSeries.__table__.insert(), [
+                {'id': 1, 'name': 'Fresh Show', 'expired': False, 'language': 'en'},
+                {'id': 2, 'name': 'Old Show', 'expired': True, 'language': 'en'},
+                {'id': 4, 'name': 'Oude Show', 'expired': False, 'language': 'nl'},
+            ])
+            session.add(TVDBSearchResult(search='Fresh Show', series_id=1))
+            session.add(TVDBSearchResult(search='Fresh Show 2016', series_id=1))
+            session.add(TVDBSearchResult(search='Oude Show', series_id=4))
+
+        result = lookup_series_many(names=['Fresh Show', 'fresh show 2016', 'Other Show'], tvdb_ids=[2, 3])
+        assert result.cached == {('name', 'Fresh Show'), ('name', 'fresh show 2016')}
+        assert result.expired == {('tvdb_id', 2)}
+        assert result.missing == {('name', 'Other Show'), ('tvdb_id', 3)}
+        assert result[('name', 'Fresh Show')] is result[('name', 'fresh show 2016')]
+        assert list(result[('tvdb_id', 2)].genres) == []
+
+        # Series cached in another language are not found
+        result = lookup_series_many(names=['Fresh Show', 'Oude Show'], tvdb_ids=[4], language='nl')
+        assert result.cached == {('name', 'Oude Show'), ('tvdb_id', 4)}
+        assert result.missing == {('name', 'Fresh Show')}
+
+    def test_prefetch_cached(self, execute_task, monkeypatch):
+        with Session() as session:
+            session.execute(TVDBSeries.__table__.insert(), [
+                {'id': 1, 'name': 'Fresh Show', 'expired': False, 'language': 'en'},
+                {'id': 2, 'name': 'Old Show', 'expired': True, 'language': 'en'},
+                {'id': 4, 'name': 'Oude Show', 'expired': False, 'language': 'nl'},
+            ])
+            session.add(TVDBSearchResult(search='Fresh Show', series_id=1))
+            session.add(TVDBSearchResult(search='Oude Show', series_id=4))
+        lookups = []
+
+        def lookup_series(name=None, **kwargs):
+            lookups.append(name)
+            raise LookupError('not found')
+
+        monkeypatch.setattr(thetvdb_lookup, 'lookup_series', lookup_series)
+        task = execute_task('prefetch')
+        assert task.find_entry(series_name='Fresh Show')['tvdb_id'] == 1
+        # Expired, and cached in another language than the configured one
+        assert sorted(lookups) == ['Old Show', 'Oude Show']
@@ -1,10 +1,13 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+from datetime import date, datetime, timedelta
+
 import pytest
 
 from flexget.manager import Session
-from flexget.plugins.internal.api_tmdb import TMDBSearchResult
+from flexget.plugins.internal import api_tmdb
+from flexget.plugins.internal.api_tmdb import ApiTmdb, TMDBBackdrop, TMDBMovie, TMDBPoster, TMDBSearchResult
 
 
 @pytest.mark.online
@@ -52,3 +55,64 @@ class TestTmdbUnicodeLookup(object):
         with Session() as session:
             r = session.query(TMDBSearchResult).all()
             assert len(r) == 1, 'Should not have added a new row'
+
+
+class TestTmdbLookupMany(object):
+    config = """
+        tasks:
+          prefetch:
+            mock:
+              - {title: 'Old Movie 1980'}
+              - {title: 'Old Movie 1999'}
+              - {title: 'Movie', tmdb_id: 2}
+            tmdb_lookup: yes
+            prefetch:
+              # The in-memory test database can not be used from several threads at once
+              max_workers: 1
+              fields: [tmdb_name]
+            accept_all: yes
+    """
+
+    def test_lookup_many(self, manager):
+        now = datetime.now()
+        with Session() as session:
+            session.execute(TMDBMovie.__table__.insert(), [
+                {'id': 1, 'imdb_id': 'tt0000001', 'name': 'Old Movie', 'released': date(1980, 1, 1),
+                 'updated': now - timedelta(days=30)},
+                {'id': 2, 'imdb_id': 'tt0000002', 'name': 'New Movie', 'released': now.date(),
+                 'updated': now - timedelta(days=2)},
+            ])
+            session.add(TMDBSearchResult(search='Old Movie (1980)', movie_id=1))
+
+        result = ApiTmdb.lookup_many(tmdb_ids=[1, 3], imdb_ids=['tt0000002'], titles=['old movie (1980)', 'Other', '2'])
+        assert result.cached == {('tmdb_id', 1), ('title', 'old movie (1980)')}
+        assert result.expired == {('imdb_id', 'tt0000002')}, 'new movies should expire after a day'
+        assert result.missing == {('tmdb_id', 3), ('title', 'Other'), ('title', '2')}
+        assert result[('tmdb_id', 1)] is result[('title', 'old movie (1980)')]
+        assert list(result[('tmdb_id', 1)].genres) == []
+
+    def test_prefetch_cached(self, execute_task, monkeypatch):
+        now = datetime.now()
+        with Session() as session:
+            session.execute(TMDBMovie.__table__.insert(), [
+                {'id': 1, 'imdb_id': 'tt0000001', 'name': 'Old Movie', 'released': date(1980, 1, 1),
+                 'updated': now - timedelta(days=30)},
+                {'id': 2, 'imdb_id': 'tt0000002', 'name': 'Movie', 'released': date(1990, 1, 1),
+                 'updated': now - timedelta(days=30)},
+            ])
+            session.add(TMDBPoster(movie_id=1, file_path='/poster.jpg'))
+            session.add(TMDBBackdrop(movie_id=1, file_path='/backdrop.jpg'))
+        monkeypatch.setattr(api_tmdb, '_tmdb_config', {'images': {'base_url': 'http://image.tmdb.org/'}})
+        lookups = []
+
+        def lookup(**kwargs):
+            lookups.append(kwargs['smart_match'])
+            raise LookupError('not found')
+
+        monkeypatch.setattr(ApiTmdb, 'lookup', staticmethod(lookup))
+        task = execute_task('prefetch')
+        entry = task.find_entry(title='Old Movie 1980')
+        assert entry['tmdb_id'] == 1
+        assert entry['tmdb_posters'] == ['http://image.tmdb.org/original/poster.jpg']
+        # Other year, and a movie whose images would have to be fetched online
+        assert sorted(lookups) == ['Movie', 'Old Movie 1999']
@@ -0,0 +1,129 @@
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import mock
+import pytest
+
+from flexget.plugins.clients import transmission
+
+transmissionrpc = pytest.importorskip('transmissionrpc')
+
+
+def magnet(name):
+    return 'magnet:?xt=urn:btih:%s' % name
+
+
+def files_of(*sizes):
+    return dict((i, {'name': 'file%d.mkv' % i, 'size': size, 'selected': True, 'priority': 'normal'})
+                for i, size in enumerate(sizes))
+
+
+def fake_client(files=None):
+    """Mock transmissionrpc client which gives the added torrents ids counting from 1."""
+    client = mock.Mock()
+    client.add_torrent.side_effect = [mock.Mock(id=i) for i in range(1, 10)]
+    client.get_session.return_value = mock.Mock(start_added_torrents=True, download_dir='/downloads')
+    files = files or {}
+    client.get_files.side_effect = lambda ids: dict((i, files.get(i, {})) for i in ids)
+    client.get_torrents.side_effect = lambda ids, fields: [mock.Mock(id=i, totalSize=100) for i in ids]
+    return client
+
+
+@pytest.fixture()
+def rpc(manager):
+    """Patches transmissionrpc.Client, returning the mocked clients in the order they are connected."""
+    transmission.rpc_clients.clear()
+    clients = [fake_client(), fake_client()]
+    with mock.patch('transmissionrpc.Client', side_effect=clients) as client_class, \
+            mock.patch('flexget.plugins.clients.transmission.time.sleep'):
+        client_class.clients = clients
+        yield client_class
+    transmission.rpc_clients.clear()
+
+
+class TestTransmission(object):
+    config = """
+        templates:
+          global:
+            disable: builtins
+            accept_all: yes
+            transmission:
+              host: localhost
+        tasks:
+          test_start_stop:
+            mock:
+              - {title: 'started', url: 'magnet:?xt=urn:btih:a', addpaused: no}
+              - {title: 'stopped', url: 'magnet:?xt=urn:btih:b', addpaused: yes}
+              - {title: 'default', url: 'magnet:?xt=urn:btih:c'}
+          test_magnetization:
+            mock:
+              - {title: 'slow', url: 'magnet:?xt=urn:btih:a', magnetization_timeout: 1}
+              - {title: 'fast', url: 'magnet:?xt=urn:btih:b', magnetization_timeout: 5}
+            transmission:
+              main_file_only: yes
+          test_files:
+            mock:
+              - {title: 'needs files', url: 'magnet:?xt=urn:btih:a', main_file_only: yes}
+              - {title: 'no files', url: 'magnet:?xt=urn:btih:b'}
+          test_add_error:
+            mock:
+              - {title: 'bad', url: 'magnet:?xt=urn:btih:a'}
+              - {title: 'good', url: 'magnet:?xt=urn:btih:b'}
+    """
+
+    def test_batched_start_stop(self, execute_task, rpc):
+        task = execute_task('test_start_stop')
+        client = rpc.clients[0]
+        assert [c[0][0] for c in client.add_torrent.call_args_list] == [magnet('a'), magnet('b'), magnet('c')]
+        client.start_torrent.assert_called_once_with([1, 3])
+        client.stop_torrent.assert_called_once_with([2])
+        # Nothing needed the files of the torrents
+        assert not client.get_files.called
+        assert len(task.accepted) == 3
+
+    def test_magnetization_timeouts(self, execute_task, rpc):
+        client = rpc.clients[0]
+        calls = []
+
+        def get_files(ids):
+            calls.append(ids)
+            # The second torrent only has its files on the fourth call
+            return dict((i, files_of(95, 5) if i == 2 and len(calls) >= 4 else {}) for i in ids)
+
+        client.get_files.side_effect = get_files
+        task = execute_task('test_magnetization')
+        # The first torrent is given up after its own, shorter timeout
+        assert calls == [[1, 2], [1, 2], [2], [2]]
+        client.change_torrent.assert_called_once_with(2, 30, files_wanted=[0], files_unwanted=[1])
+        assert len(task.accepted) == 2
+
+    def test_reconnect(self, execute_task, rpc):
+        lost = transmissionrpc.TransmissionError('lost', original=transmissionrpc.HTTPHandlerError(httpcode=104))
+        first, second = rpc.clients
+        first.add_torrent.side_effect = lost
+        task = execute_task('test_add_error')
+        assert rpc.call_count == 2
+        # Only the first add is retried, the second entry uses the new client
+        assert first.add_torrent.call_count == 1
+        assert [c[0][0] for c in second.add_torrent.call_args_list] == [magnet('a'), magnet('b')]
+        second.start_torrent.assert_called_once_with([1, 2])
+        assert len(task.accepted) == 2
+
+    def test_add_error(self, execute_task, rpc):
+        client = rpc.clients[0]
+        client.add_torrent.side_effect = [transmissionrpc.TransmissionError('invalid torrent'), mock.Mock(id=1)]
+        task = execute_task('test_add_error')
+        assert rpc.call_count == 1, 'errors from transmission should not reconnect'
+        assert task.find_entry('failed', title='bad')
+        assert task.find_entry('accepted', title='good')
+        client.start_torrent.assert_called_once_with([1])
+
+    def test_get_files_error(self, execute_task, rpc):
+        client = rpc.clients[0]
+        client.get_files.side_effect = transmissionrpc.TransmissionError('timeout')
+        task = execute_task('test_files')
+        client.get_files.assert_called_once_with([1])
+        assert task.find_entry('failed', title='needs files')
+        # The other torrent is in transmission and does not need its files, it is still started
+        assert task.find_entry('accepted', title='no files')
+        client.start_torrent.assert_called_once_with([2])
@@ -428,3 +428,55 @@ class TestTVMazeSeasonLookup(object):
         task = execute_task('test_season_pack')
         entry = task.entries[0]
         assert entry['tvmaze_season_id'] == 40
+
+
+class TestTVMazeSeriesLookupMany(object):
+    config = """
+        tasks:
+          prefetch:
+            mock:
+              - {title: 'Fresh.Show.S01E01', series_name: 'Fresh Show'}
+              - {title: 'Old.Show.S01E01', series_name: 'Old Show', tvmaze_id: 2}
+              - {title: 'Other.Show.S01E01', series_name: 'Fresh Show', tvdb_id: 10}
+            tvmaze_lookup: yes
+            prefetch:
+              # The in-memory test database can not be used from several threads at once
+              max_workers: 1
+              fields: [tvmaze_series_name]
+            accept_all: yes
+    """
+
+    def test_lookup_many(self, manager):
+        with Session() as session:
+            session.execute(TVMazeSeries.__table__.insert(), [
+                {'tvmaze_id': 1, 'name': 'Fresh Show', 'last_update': datetime.now()},
+                {'tvmaze_id': 2, 'name': 'Old Show', 'last_update': datetime.now() - timedelta(days=30)},
+            ])
+            session.add(TVMazeLookup(search_name='Fresh Show 2016', series_id=1))
+
+        result = APITVMaze.series_lookup_many(names=['fresh show', 'Fresh Show 2016', 'Other Show'],
+                                              tvmaze_ids=[2, 3])
+        assert result.cached == {('name', 'fresh show'), ('name', 'Fresh Show 2016')}
+        assert result.expired == {('tvmaze_id', 2)}
+        assert result.missing == {('name', 'Other Show'), ('tvmaze_id', 3)}
+        assert result[('name', 'Fresh Show 2016')].tvmaze_id == 1
+        assert result[('tvmaze_id', 2)].genres == [], 'genres should have been loaded with the series'
+
+    def test_prefetch_cached(self, execute_task, monkeypatch):
+        with Session() as session:
+            session.execute(TVMazeSeries.__table__.insert(), [
+                {'tvmaze_id': 1, 'name': 'Fresh Show', 'last_update': datetime.now(), 'schedule': '{}'},
+                {'tvmaze_id': 2, 'name': 'Old Show', 'last_update': datetime.now() - timedelta(days=30),
+                 'schedule': '{}'},
+            ])
+        lookups = []
+
+        def series_lookup(title=None, **kwargs):
+            lookups.append(title)
+            raise LookupError('not found')
+
+        monkeypatch.setattr(APITVMaze, 'series_lookup', staticmethod(series_lookup))
+        task = execute_task('prefetch')
+        assert task.find_entry(title='Fresh.Show.S01E01')['tvmaze_series_id'] == 1
+        # Expired, and looked up by an id the cache can not be searched with
+        assert sorted(lookups) == ['Fresh Show', 'Old Show']
@@ -6,8 +6,9 @@ import math
 
 import pytest
 
-from flexget.utils import json
-from flexget.utils.tools import parse_filesize, split_title_year
+from flexget.entry import Entry
+from flexget.utils import json, template
+from flexget.utils.tools import parse_filesize, split_title_year, LRUCache, LatencyHistogram
 
 
 def compare_floats(float1, float2):
@@ -98,3 +99,79 @@ class TestSplitYearTitle(object):
     ])
     def test_split_year_title(self, title, expected_title, expected_year):
         assert split_title_year(title) == (expected_title, expected_year)
+
+
+class TestLRUCache(object):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        assert cache['a'] == 1
+        cache['c'] = 3
+        assert 'b' not in cache
+        assert list(cache) == ['a', 'c']
+
+    def test_counts(self):
+        cache = LRUCache(max_size=2)
+        cache['a'] = 1
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert 'b' not in cache
+        assert cache.stats() == {'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1}
+
+
+class TestLatencyHistogram(object):
+    def test_buckets(self):
+        histogram = LatencyHistogram(bounds=(1, 5))
+        for seconds in (0.2, 1, 3, 10):
+            histogram.add(seconds)
+        result = histogram.to_dict()
+        assert result['count'] == 4
+        assert result['max'] == 10
+        assert result['mean'] == pytest.approx(3.55)
+        assert result['buckets'] == [{'le': 1, 'count': 2}, {'le': 5, 'count': 1}, {'le': None, 'count': 1}]
+
+    def test_percentile(self):
+        histogram = LatencyHistogram(bounds=(1, 5, 10))
+        assert histogram.percentile(50) == 0
+        for seconds in (0.2, 0.5, 3, 4, 7):
+            histogram.add(seconds)
+        assert histogram.percentile(40) == 1
+        assert histogram.percentile(50) == 5
+        assert histogram.percentile(95) == 7
+
+    def test_add_counts(self):
+        histogram = LatencyHistogram(bounds=(1, 5))
+        histogram.add(2)
+        histogram.add_counts([1, 0, 2], total=30.5, maximum=20)
+        assert histogram.counts == [1, 1, 2]
+        assert histogram.count == 4
+        assert histogram.total == 32.5
+        assert histogram.max == 20
+
+
+class TestRender(object):
+    config = 'tasks: {}'
+
+    def test_template_cache(self, manager):
+        template.template_cache.clear()
+        entry = Entry(title='foo', url='http://example.com')
+        assert template.render_from_entry('{{title}} - {{url}}', entry) == 'foo - http://example.com'
+        assert template.render_from_entry('{{title}} - {{url}}', Entry(title='bar', url='')) == 'bar - '
+        assert template.template_cache.misses == 1
+        assert template.template_cache.hits == 1
+        with pytest.raises(template.RenderError):
+            template.compile_template('{{title')
+
+    def test_render_context(self, manager):
+        entry = Entry(title='foo', task='entry task')
+        entry.register_lazy_func(lambda e: e.update(lazy_field='lazy'), ['lazy_field'])
+        context = template.RenderContext({'title': 'first'}, entry.store, {'task': 'default', 'other': 'bar'})
+        assert context['title'] == 'first'
+        assert context['task'] == 'entry task'
+        assert 'other' in context and 'missing' not in context
+        assert sorted(context) == ['lazy_field', 'other', 'task', 'title']
+        assert template.render('{{title}} {{other}} {{lazy_field}}', context) == 'first bar lazy'
+        assert template.render_from_entry('{{now is defined}} {{task}}', entry) == 'True entry task'
+        with pytest.raises(template.RenderError):
+            template.render('{{undefined_field}}', context)
@@ -1,12 +1,12 @@
 from __future__ import unicode_literals, division, absolute_import
 
-import copy
 import logging
 import pickle
 from datetime import datetime, timedelta
 
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 from flexget import db_schema
+from flexget.entry import Entry, FrozenEntry
 from flexget.event import event
 from flexget.manager import Session
 from flexget.plugin import PluginError
@@ -21,6 +21,16 @@ log = logging.getLogger('input_cache')
 Base = db_schema.versioned_base('input_cache', 1)
 
 
+def freeze_entries(entries, copy_values=True):
+    """Returns read only snapshots of `entries` for storing in the memory cache."""
+    return [FrozenEntry(entry, copy_values=copy_values) for entry in entries]
+
+
+def thaw_entries(frozen_entries):
+    """Returns new independent entries from snapshots stored in the memory cache."""
+    return [frozen.thaw() for frozen in frozen_entries]
+
+
 @db_schema.upgrade('input_cache')
 def upgrade(ver, session):
     if ver == 0:
@@ -119,10 +129,7 @@ class cached(object):
             if not task.options.nocache and cache_value:
                 # return from the cache
                 log.trace('cache hit')
-                entries = []
-                for entry in cache_value:
-                    fresh = copy.deepcopy(entry)
-                    entries.append(fresh)
+                entries = thaw_entries(cache_value)
                 if entries:
                     log.verbose('Restored %s entries from cache' % len(entries))
                 return entries
@@ -135,11 +142,12 @@ class cached(object):
                             filter(InputCache.added > datetime.now() - self.persist). \
                             first()
                         if db_cache:
-                            entries = [e.entry for e in db_cache.entries]
+                            entries = [Entry(e.entry) for e in db_cache.entries]
                             log.verbose('Restored %s entries from db cache' % len(entries))
-                            # Store to in memory cache
-                            self.cache[cache_name] = copy.deepcopy(entries)
-                            return entries
+                            # Store to in memory cache, the entries were just created so they don't need copying
+                            frozen = freeze_entries(entries, copy_values=False)
+                            self.cache[cache_name] = frozen
+                            return thaw_entries(frozen)
 
                 # Nothing was restored from db or memory cache, run the function
                 log.trace('cache miss')
@@ -155,11 +163,12 @@ class cached(object):
                             if db_cache and db_cache.entries:
                                 log.error('There was an error during %s input (%s), using cache instead.' %
                                           (self.name, e))
-                                entries = [ent.entry for ent in db_cache.entries]
+                                entries = [Entry(ent.entry) for ent in db_cache.entries]
                                 log.verbose('Restored %s entries from db cache' % len(entries))
                                 # Store to in memory cache
-                                self.cache[cache_name] = copy.deepcopy(entries)
-                                return entries
+                                frozen = freeze_entries(entries, copy_values=False)
+                                self.cache[cache_name] = frozen
+                                return thaw_entries(frozen)
                     # If there was nothing in the db cache, re-raise the error.
                     raise
                 if api_ver == 1:
@@ -170,7 +179,7 @@ class cached(object):
                 # store results to cache
                 log.debug('storing to cache %s %s entries' % (cache_name, len(response)))
                 try:
-                    self.cache[cache_name] = copy.deepcopy(response)
+                    self.cache[cache_name] = freeze_entries(response)
                 except TypeError:
                     # might be caused because of backlog restoring some idiotic stuff, so not neccessarily a bug
                     log.critical('Unable to save task content into cache, '
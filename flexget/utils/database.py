@@ -12,6 +12,7 @@ from sqlalchemy.ext.hybrid import Comparator, hybrid_property
 
 from flexget.manager import Session
 from flexget.utils import qualities, json
+from flexget.utils.tools import chunked
 from flexget.entry import Entry
 
 
@@ -235,3 +236,56 @@ def year_property(date_attr):
         return extract('year', getattr(cls, date_attr))
 
     return hybrid_property(getter, expr=expr)
+
+
+def query_in_chunks(query, column, values):
+    """
+    Yields the results of `query` filtered to rows where `column` is one of `values`.
+
+    The values are split into chunks so the IN clauses stay within what sqlite can handle.
+    """
+    for chunk in chunked(list(values)):
+        for item in query.filter(column.in_(chunk)):
+            yield item
+
+
+class CacheLookupResult(object):
+    """
+    Result of a bulk cache lookup, as returned by the `lookup_*_many` functions of the api plugins.
+
+    Keys are `(kind, value)` tuples, like `('tvdb_id', 1)` or `('name', 'Some Show')`, so ids and names never collide.
+
+    :ivar set keys: All keys which were requested.
+    :ivar dict found: Maps each key found from the cache to its db instance, whether it has expired or not.
+    :ivar set expired: Keys found from the cache whose data has expired.
+    """
+
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+        self.found = {}
+        self.expired = set()
+
+    def add(self, key, item, expired=False):
+        self.found[key] = item
+        if expired:
+            self.expired.add(key)
+
+    @property
+    def cached(self):
+        """Keys found from the cache which have not expired."""
+        return set(self.found) - self.expired
+
+    @property
+    def missing(self):
+        """Keys not found from the cache at all."""
+        return self.keys - set(self.found)
+
+    def __getitem__(self, key):
+        return self.found[key]
+
+    def __contains__(self, key):
+        return key in self.found
+
+    def __repr__(self):
+        return '<CacheLookupResult(cached=%s, expired=%s, missing=%s)>' % (
+            len(self.cached), len(self.expired), len(self.missing))
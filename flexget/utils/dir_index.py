@@ -0,0 +1,335 @@
+"""
+Index of directory trees shared by the plugins which look at local files.
+
+Each directory is listed once, and listed again only when its modification time changes, which happens when entries
+are added to, removed from or renamed in it. Checking a tree for changes takes one stat call per directory instead of
+one per file. The listings are stored in the database, so they survive restarts, along with the results of parsing the
+names in them (e.g. as series episodes), so only names which were not there before have to be parsed.
+"""
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import logging
+import os
+import stat
+import threading
+import time
+
+from path import Path
+from sqlalchemy import Column, Integer, Unicode, Float
+
+from flexget import db_schema
+from flexget import __version__ as flexget_version
+from flexget.event import event
+from flexget.manager import Session
+from flexget.utils.database import json_synonym
+from flexget.utils.tools import chunked
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+log = logging.getLogger('dir_index')
+Base = db_schema.versioned_base('dir_index', 0)
+
+# Flags of the kind of a directory entry, dirs and files are also the targets of symlinks to them
+DIR = 1
+FILE = 2
+SYMLINK = 4
+
+#: Seconds a listing has to be taken after the last change of a directory to be trusted, as changes within the
+#: resolution of the modification time of the file system do not change it
+MTIME_RESOLUTION = 2
+
+
+class IndexedDirectory(Base):
+    __tablename__ = 'dir_index'
+
+    id = Column(Integer, primary_key=True)
+    path = Column(Unicode, index=True, unique=True)
+    mtime = Column(Float)
+    scanned = Column(Float)
+    _children = Column('children', Unicode)
+    children = json_synonym('_children')
+    _parsed = Column('parsed', Unicode)
+    parsed = json_synonym('_parsed')
+
+
+class Directory(object):
+    """Listing of one directory."""
+    __slots__ = ('path', 'mtime', 'scanned', 'children', 'parsed')
+
+    def __init__(self, path, mtime, scanned, children, parsed=None):
+        self.path = path
+        self.mtime = mtime
+        self.scanned = scanned
+        #: List of (name, flags) pairs, in the order the file system listed them
+        self.children = children
+        #: Results of parsing the names of the children by key, see :meth:`DirectoryIndex.parsed`
+        self.parsed = parsed or {}
+
+    def names(self, flags=None):
+        """Names of the children having any of `flags`, or of all of them."""
+        return [name for name, child_flags in self.children if flags is None or child_flags & flags]
+
+    def subdirs(self):
+        return [os.path.join(self.path, name) for name, flags in self.children if flags & DIR]
+
+
+def list_directory(path):
+    """:return: List of (name, flags) pairs of the entries in directory `path`."""
+    children = []
+    if scandir is not None:
+        for entry in scandir(path):
+            try:
+                flags = ((DIR if entry.is_dir() else 0) | (FILE if entry.is_file() else 0) |
+                         (SYMLINK if entry.is_symlink() else 0))
+            except OSError:
+                flags = 0
+            children.append((entry.name, flags))
+        return children
+    for name in os.listdir(path):
+        child = os.path.join(path, name)
+        children.append((name, ((DIR if os.path.isdir(child) else 0) | (FILE if os.path.isfile(child) else 0) |
+                                (SYMLINK if os.path.islink(child) else 0))))
+    return children
+
+
+def storable(path, names=()):
+    """
+    Names not decodable with the file system encoding can not be stored, those directories are only kept in memory.
+    """
+    try:
+        path.encode('utf-8')
+        for name in names:
+            name.encode('utf-8')
+    except UnicodeError:
+        return False
+    return True
+
+
+class DirectoryIndex(object):
+    """Listings of directories by path, kept up to date by their modification times. Safe to share between threads."""
+
+    def __init__(self):
+        self._directories = {}
+        self._loaded = False
+        self._dirty = set()
+        self._removed = set()
+        self._lock = threading.RLock()
+        self.listed = 0
+        self.reused = 0
+
+    def clear(self):
+        with self._lock:
+            self._directories.clear()
+            self._loaded = False
+            self._dirty.clear()
+            self._removed.clear()
+            self.listed = self.reused = 0
+
+    def _load(self):
+        with Session() as session:
+            for row in session.query(IndexedDirectory).all():
+                try:
+                    self._directories[row.path] = Directory(row.path, row.mtime, row.scanned,
+                                                            [tuple(child) for child in row.children], row.parsed)
+                except ValueError:
+                    log.debug('Ignoring unreadable index of %s', row.path)
+        self._loaded = True
+        log.debug('Loaded the index of %s directories', len(self._directories))
+
+    def save(self):
+        """Stores the directories which changed since the last save."""
+        with self._lock:
+            if not self._dirty and not self._removed:
+                return
+            dirty, self._dirty = self._dirty, set()
+            removed, self._removed = self._removed - dirty, set()
+            dirty = [path for path in dirty
+                     if path in self._directories and storable(path, self._directories[path].names())]
+            removed = [path for path in removed if storable(path)]
+            with Session() as session:
+                for paths in chunked(sorted(dirty)):
+                    rows = dict((row.path, row) for row in
+                                session.query(IndexedDirectory).filter(IndexedDirectory.path.in_(paths)))
+                    for path in paths:
+                        directory = self._directories[path]
+                        row = rows.get(path)
+                        if row is None:
+                            row = IndexedDirectory(path=path)
+                            session.add(row)
+                        row.mtime = directory.mtime
+                        row.scanned = directory.scanned
+                        row.children = directory.children
+                        row.parsed = directory.parsed
+                for paths in chunked(sorted(removed)):
+                    session.query(IndexedDirectory).filter(IndexedDirectory.path.in_(paths)).delete(
+                        synchronize_session=False)
+            log.debug('Saved the index of %s directories, removed %s', len(dirty), len(removed))
+
+    def _forget(self, path):
+        """Removes `path` and all directories under it from the index."""
+        prefix = os.path.join(path, '')
+        for known in [p for p in self._directories if p == path or p.startswith(prefix)]:
+            del self._directories[known]
+            self._dirty.discard(known)
+            self._removed.add(known)
+
+    def directory(self, path, stat_result=None):
+        """
+        :return: Up to date :class:`Directory` for `path`, or None if it can not be listed.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            try:
+                stat_result = stat_result or os.stat(path)
+            except OSError:
+                stat_result = None
+            if stat_result is None or not stat.S_ISDIR(stat_result.st_mode):
+                if path in self._directories:
+                    self._forget(path)
+                return None
+            directory = self._directories.get(path)
+            if (directory is not None and directory.mtime == stat_result.st_mtime and
+                    directory.scanned - directory.mtime > MTIME_RESOLUTION):
+                self.reused += 1
+                return directory
+            now = time.time()
+            try:
+                children = list_directory(path)
+            except OSError as e:
+                log.debug('Could not list %s: %s', path, e)
+                return None
+            self.listed += 1
+            parsed = {}
+            if directory is not None:
+                # Directories which are gone are forgotten with everything under them
+                subdirs = set(name for name, flags in children if flags & DIR)
+                for name, flags in directory.children:
+                    if flags & DIR and name not in subdirs:
+                        self._forget(os.path.join(path, name))
+                # Parse results only depend on the name, they are kept for the names which are still there
+                names = set(name for name, _ in children)
+                for key, results in directory.parsed.items():
+                    parsed[key] = dict((name, result) for name, result in results.items() if name in names)
+            directory = Directory(path, stat_result.st_mtime, now, children, parsed)
+            self._directories[path] = directory
+            self._dirty.add(path)
+            return directory
+
+    def scan(self, root, max_depth=None):
+        """
+        Brings the index of the tree under `root` up to date.
+
+        :param max_depth: Levels of subdirectories to include, None for all of them. 0 only includes `root`.
+        :return: List of (:class:`Directory`, depth) pairs in the tree, parents before their subdirectories.
+        """
+        result = []
+        visited = set()
+        with self._lock:
+            stack = [(os.path.abspath(root), 0)]
+            while stack:
+                path, depth = stack.pop()
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                # Symlinks to directories are followed, but never into a loop
+                if (stat_result.st_dev, stat_result.st_ino) in visited:
+                    continue
+                visited.add((stat_result.st_dev, stat_result.st_ino))
+                directory = self.directory(path, stat_result)
+                if directory is None:
+                    continue
+                result.append((directory, depth))
+                if max_depth is None or depth < max_depth:
+                    stack.extend((subdir, depth + 1) for subdir in reversed(directory.subdirs()))
+            self.save()
+        return result
+
+    def walk(self, root, max_depth=None, scanned=None):
+        """
+        Yields the paths of everything under `root` along with their flags, each directory followed by its contents.
+
+        :param max_depth: Levels of subdirectories to descend into, None for all of them. 0 only yields the children
+            of `root`.
+        :param scanned: Result of :meth:`scan` for `root` to walk, instead of scanning it again
+        """
+        if scanned is None:
+            scanned = self.scan(root, max_depth)
+        directories = dict((directory.path, directory) for directory, _ in scanned)
+        root = Path(root)
+
+        def walk_directory(path, directory):
+            for name, flags in directory.children:
+                child = path / name
+                yield child, flags
+                if flags & DIR:
+                    subdir = directories.get(os.path.join(directory.path, name))
+                    if subdir is not None:
+                        for item in walk_directory(child, subdir):
+                            yield item
+
+        top = directories.get(os.path.abspath(root))
+        if top is not None:
+            for item in walk_directory(root, top):
+                yield item
+
+    def parsed(self, directory, key, parse, flags=None):
+        """
+        Parses the names of the children of `directory` with `parse`, unless they were already parsed for `key`.
+
+        :param key: Name for the kind of parsing, results are stored under it
+        :param parse: Function returning a json serializable result for a name
+        :param flags: Only parse children having any of these flags, None for all children
+        :return: Dict from name to parse result
+        """
+        key = '%s|%s' % (flexget_version, key)
+        with self._lock:
+            results = directory.parsed.get(key)
+            if results is None:
+                # Results of other versions are never used again
+                for old_key in [k for k in directory.parsed if not k.startswith('%s|' % flexget_version)]:
+                    del directory.parsed[old_key]
+                results = directory.parsed[key] = {}
+            missing = [name for name in directory.names(flags) if name not in results]
+            if missing:
+                for name in missing:
+                    results[name] = parse(name)
+                if self._directories.get(directory.path) is directory:
+                    self._dirty.add(directory.path)
+            return dict((name, results[name]) for name in directory.names(flags))
+
+
+index = DirectoryIndex()
+
+
+@event('manager.startup')
+def reset_index(manager):
+    # The listings are loaded from the database of the manager on first use
+    index.clear()
+
+
+@event('manager.execute.completed')
+def save_index(manager, options):
+    # Parse results are stored after the tasks are done with them
+    index.save()
+    log.debug('Directories listed: %s, reused: %s', index.listed, index.reused)
+
+
+@event('manager.db_cleanup')
+def db_cleanup(manager, session):
+    removed = 0
+    for row in session.query(IndexedDirectory).all():
+        if not os.path.isdir(row.path):
+            session.delete(row)
+            removed += 1
+    if removed:
+        log.verbose('Removed %s directories which no longer exist from the index.', removed)
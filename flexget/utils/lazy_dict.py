@@ -1,12 +1,29 @@
 from __future__ import unicode_literals, division, absolute_import
 from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
+import copy
+import datetime
 import logging
 from collections import MutableMapping
 
+from future.utils import PY2
+
+try:
+    # On Python 2 the object from builtins does not have __slots__, LazyDict derives from the native one
+    from __builtin__ import object as native_object
+except ImportError:
+    native_object = object
+
 log = logging.getLogger('lazy_lookup')
 
 
+def mapping_method(name):
+    """:return: The function implementing method `name` in MutableMapping or one of its bases."""
+    for cls in MutableMapping.__mro__[:-1]:
+        if name in vars(cls):
+            return vars(cls)[name]
+
+
 class LazyLookup(object):
     """
     This class stores the information to do a lazy lookup for a LazyDict. An instance is stored as a placeholder value
@@ -50,7 +67,118 @@ class LazyLookup(object):
         return '<LazyLookup(%r)>' % self.func_list
 
 
-class LazyDict(MutableMapping):
+# Values of these types can be shared between stores without copying
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None), datetime.date, datetime.time, datetime.timedelta)
+
+
+class CopyOnWriteStore(dict):
+    """
+    A dict which starts out sharing its values with a read only `base` mapping.
+
+    Values of mutable types are deep copied from the base the first time they are accessed, so changes made to them
+    never leak back into the base, and values which are never accessed are never copied.
+
+    The raw values must never be read with plain dict methods. :meth:`copy` shares them with the new store instead.
+    """
+
+    def __init__(self, base, shared=None):
+        """
+        :param dict base: Mapping to share values with. It must not be modified afterwards.
+        :param shared: Keys of `base` with mutable values, calculated from `base` if not given.
+        """
+        super(CopyOnWriteStore, self).__init__(base)
+        if shared is None:
+            shared = [key for key, value in base.items() if not isinstance(value, IMMUTABLE_TYPES)]
+        self._shared = set(shared)
+
+    def _unshare(self, key):
+        if key in self._shared:
+            self._shared.discard(key)
+            dict.__setitem__(self, key, copy.deepcopy(dict.__getitem__(self, key)))
+
+    def __getitem__(self, key):
+        self._unshare(key)
+        return dict.__getitem__(self, key)
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(store) and {**store} read the values through __getitem__ instead of taking the
+        # raw values (Python 2 always takes them, use copy or items there)
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        self._unshare(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *args):
+        if key in self._shared:
+            self._shared.discard(key)
+            return copy.deepcopy(dict.pop(self, key))
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key, default=None):
+        self._unshare(key)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        if key in self._shared:
+            self._shared.discard(key)
+            value = copy.deepcopy(value)
+        return key, value
+
+    def clear(self):
+        self._shared.clear()
+        dict.clear(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        """:return: A new store sharing the values still shared by this one, they are copied on access by either."""
+        return CopyOnWriteStore(dict((key, dict.__getitem__(self, key)) for key in self), self._shared)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict((key, dict.__getitem__(self, key)) for key in self), memo)
+
+
+class LazyDict(native_object):
+    """
+    Dict which evaluates lazy fields when they are accessed.
+
+    It is registered as a MutableMapping rather than inheriting from it, because the collections ABCs do not have
+    __slots__ on Python 2, and every instance would get a __dict__.
+    """
+    __slots__ = ('store',)
+
+    __contains__ = mapping_method('__contains__')
+    __eq__ = mapping_method('__eq__')
+    keys = mapping_method('keys')
+    items = mapping_method('items')
+    values = mapping_method('values')
+    popitem = mapping_method('popitem')
+    clear = mapping_method('clear')
+    update = mapping_method('update')
+    setdefault = mapping_method('setdefault')
+    if PY2:
+        __ne__ = mapping_method('__ne__')
+        iterkeys = mapping_method('iterkeys')
+        itervalues = mapping_method('itervalues')
+        iteritems = mapping_method('iteritems')
 
     def __init__(self, *args, **kwargs):
         self.store = dict(*args, **kwargs)
@@ -74,8 +202,22 @@ class LazyDict(MutableMapping):
         return item
 
     def __copy__(self):
+        if isinstance(self.store, CopyOnWriteStore):
+            copied = type(self)()
+            copied.store = self.store.copy()
+            return copied
         return type(self)(self.store)
 
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
     copy = __copy__
 
     def get(self, key, default=None, eval_lazy=True):  # pylint: disable=W0221
@@ -129,3 +271,6 @@ class LazyDict(MutableMapping):
         :rtype: bool
         """
         return isinstance(self.store.get(key), LazyLookup)
+
+
+MutableMapping.register(LazyDict)
@@ -0,0 +1,212 @@
+"""
+Sampling profiler for tasks running in the daemon.
+
+While running, a background thread periodically looks at the stacks of the threads which are running task plugins,
+and counts each stack under the task name, phase and plugin. Nothing is measured while the profiler is stopped.
+
+The results can be written in the collapsed stack format used by flamegraph.pl and other flame graph tools, or in the
+speedscope (https://www.speedscope.app) json format.
+"""
+from __future__ import unicode_literals, division, absolute_import
+from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
+
+import io
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flexget.event import add_event_handler, remove_event_handler
+from flexget.utils import json
+
+log = logging.getLogger('profiler')
+
+FORMATS = ['collapsed', 'speedscope']
+
+#: Seconds between samples
+DEFAULT_INTERVAL = 0.01
+
+
+class SamplingProfiler(object):
+    """Samples the stacks of threads running task plugins, grouped by task name, phase and plugin."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.started = None
+        self.stopped = None
+        #: Stack sample counts per task name, stacks are tuples of frame names with the outermost frame first
+        self.samples = {}
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        # Bound methods are created on every access, keep the same ones to remove the handlers again
+        self._handlers = [('task.execute.before_plugin', self.before_plugin),
+                          ('task.execute.after_plugin', self.after_plugin)]
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.started = datetime.now()
+        self._stop_event.clear()
+        for name, handler in self._handlers:
+            add_event_handler(name, handler)
+        self._thread = threading.Thread(target=self._run, name='profiler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        for name, handler in self._handlers:
+            remove_event_handler(name, handler)
+        with self._lock:
+            self._active.clear()
+        self.stopped = datetime.now()
+
+    def before_plugin(self, task, keyword):
+        with self._lock:
+            self._active[threading.current_thread().ident] = (task.name, task.current_phase, keyword)
+
+    def after_plugin(self, task, keyword):
+        with self._lock:
+            self._active.pop(threading.current_thread().ident, None)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Takes one sample of the threads which are currently running a plugin."""
+        with self._lock:
+            active = list(self._active.items())
+        if not active:
+            return
+        frames = sys._current_frames()
+        for ident, (task_name, phase, plugin_name) in active:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.append('plugin: %s' % plugin_name)
+            stack.append('phase: %s' % phase)
+            stack.reverse()
+            counts = self.samples.setdefault(task_name, {})
+            stack = tuple(stack)
+            counts[stack] = counts.get(stack, 0) + 1
+
+    @property
+    def sample_count(self):
+        return sum(sum(counts.values()) for counts in self.samples.values())
+
+    def to_collapsed(self):
+        """
+        :return: Text with one line per distinct stack, frames separated by semicolons and followed by the number of
+            samples. The task name is the outermost frame.
+        """
+        lines = []
+        for task_name, counts in sorted(self.samples.items()):
+            for stack, count in sorted(counts.items()):
+                lines.append('%s %d' % (';'.join(('task: %s' % task_name,) + stack), count))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def to_speedscope(self):
+        """
+        :return: Dict in the speedscope file format, with a profile for every task.
+        """
+        frames = []
+        frame_index = {}
+        profiles = []
+        weight = self.interval * 1000
+        for task_name, counts in sorted(self.samples.items()):
+            samples = []
+            weights = []
+            for stack, count in sorted(counts.items()):
+                indexes = []
+                for name in stack:
+                    if name not in frame_index:
+                        frame_index[name] = len(frames)
+                        frames.append({'name': name})
+                    indexes.append(frame_index[name])
+                samples.append(indexes)
+                weights.append(count * weight)
+            profiles.append({
+                'type': 'sampled',
+                'name': task_name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': 'FlexGet profile %s' % (self.started or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+            'exporter': 'flexget',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': profiles
+        }
+
+    def write(self, directory, formats=FORMATS):
+        """
+        Writes the samples in each of `formats` to a new file in `directory`.
+
+        :return: List of the written file paths.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        base = os.path.join(directory, 'profile-%s' % (self.started or datetime.now()).strftime('%Y%m%d-%H%M%S'))
+        paths = []
+        if 'collapsed' in formats:
+            paths.append(base + '.collapsed.txt')
+            with io.open(paths[-1], 'w', encoding='utf-8') as f:
+                f.write(self.to_collapsed())
+        if 'speedscope' in formats:
+            paths.append(base + '.speedscope.json')
+            with io.open(paths[-1], 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self.to_speedscope()))
+        return paths
+
+
+profiler = None
+
+
+def start_profiler(interval=DEFAULT_INTERVAL):
+    """Starts sampling, unless the profiler is already running. Returns False if it was."""
+    global profiler
+    if profiler is not None and profiler.running:
+        return False
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    log.debug('Profiler started, sampling every %s seconds', interval)
+    return True
+
+
+def stop_profiler(directory, formats=FORMATS):
+    """
+    Stops sampling and writes the results.
+
+    :return: List of the written file paths, or None if the profiler was not running.
+    """
+    global profiler
+    if profiler is None or not profiler.running:
+        return None
+    started = time.time()
+    profiler.stop()
+    paths = profiler.write(directory, formats)
+    log.debug('Wrote %d samples in %.2f seconds', profiler.sample_count, time.time() - started)
+    profiler = None
+    return paths
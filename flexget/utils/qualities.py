@@ -6,6 +6,8 @@ import re
 import copy
 import logging
 
+from flexget.utils.tools import LRUCache
+
 log = logging.getLogger('utils.qualities')
 
 
@@ -33,6 +35,7 @@ class QualityComponent(object):
         # compile regexp
         if regexp is None:
             regexp = re.escape(name)
+        self.pattern = regexp
         self.regexp = re.compile('(?<![^\W_])(' + regexp + ')(?![^\W_])', re.IGNORECASE)
 
     def matches(self, text):
@@ -194,6 +197,30 @@ for items in (_resolutions, _sources, _codecs, _audios):
         _registry[item.name] = item
 
 
+def _combined_regexp(components):
+    """Compiles a single regexp which matches if any of `components` would match."""
+    return re.compile('(?<![^\W_])(?:' + '|'.join('(?:%s)' % c.pattern for c in components) + ')(?![^\W_])',
+                      re.IGNORECASE)
+
+
+# Used to find out in a single pass over the text which component types are present at all, so the per component
+# searches only need to be done for those types
+_type_regexps = [
+    ('resolution', _resolutions, _combined_regexp(_resolutions), False),
+    ('source', _sources, _combined_regexp(_sources), True),
+    ('codec', _codecs, _combined_regexp(_codecs), True),
+    ('audio', _audios, _combined_regexp(_audios), True)
+]
+_any_regexp = _combined_regexp(list(_resolutions) + _sources + _codecs + _audios)
+
+# Parse results by text, as tuples of (clean_text, resolution, source, codec, audio)
+_parse_cache = LRUCache(max_size=10000)
+# Component tuples for canonical quality names given to `get`
+_get_cache = LRUCache(max_size=1000)
+# Parsed Requirements by requirement text
+_requirements_cache = LRUCache(max_size=1000)
+
+
 def all_components():
     return iter(_registry.values())
 
@@ -218,20 +245,38 @@ class Quality(object):
     def parse(self, text):
         """Parses a string to determine the quality in the four component categories.
 
+        Results are cached by text, parsing the same string again only costs a dict lookup.
+
         :param text: The string to parse
         """
         self.text = text
+        cached = _parse_cache.get(text)
+        if cached is None:
+            cached = self._parse(text)
+            _parse_cache[text] = cached
+        self.clean_text, self.resolution, self.source, self.codec, self.audio = cached
+
+    def _parse(self, text):
+        """Does the actual parsing for :meth:`parse`.
+
+        :returns: tuple (clean_text, resolution, source, codec, audio)
+        """
         self.clean_text = text
-        self.resolution = self._find_best(_resolutions, _UNKNOWNS['resolution'], False)
-        self.source = self._find_best(_sources, _UNKNOWNS['source'])
-        self.codec = self._find_best(_codecs, _UNKNOWNS['codec'])
-        self.audio = self._find_best(_audios, _UNKNOWNS['audio'])
+        found = {}
+        if _any_regexp.search(text):
+            for type, qlist, regexp, strip_all in _type_regexps:
+                # The components are searched from the text remaining after stripping the previous types
+                if regexp.search(self.clean_text):
+                    found[type] = self._find_best(qlist, strip_all=strip_all)
+        for type in ('resolution', 'source', 'codec', 'audio'):
+            setattr(self, type, found.get(type) or _UNKNOWNS[type])
         # If any of the matched components have defaults, set them now.
         for component in self.components:
             for default in component.defaults:
                 default = _registry[default]
                 if not getattr(self, default.type):
                     setattr(self, default.type, default)
+        return self.clean_text, self.resolution, self.source, self.codec, self.audio
 
     def _find_best(self, qlist, default=None, strip_all=True):
         """Finds the highest matching quality component from `qlist`"""
@@ -322,18 +367,22 @@ class Quality(object):
 def get(quality_name):
     """Returns a quality object based on canonical quality name."""
 
-    found_components = {}
-    for part in quality_name.lower().split():
-        component = _registry.get(part)
-        if not component:
-            raise ValueError('`%s` is not a valid quality string' % part)
-        if component.type in found_components:
-            raise ValueError('`%s` cannot be defined twice in a quality' % component.type)
-        found_components[component.type] = component
-    if not found_components:
-        raise ValueError('No quality specified')
+    found_components = _get_cache.get(quality_name)
+    if found_components is None:
+        found_components = {}
+        for part in quality_name.lower().split():
+            component = _registry.get(part)
+            if not component:
+                raise ValueError('`%s` is not a valid quality string' % part)
+            if component.type in found_components:
+                raise ValueError('`%s` cannot be defined twice in a quality' % component.type)
+            found_components[component.type] = component
+        if not found_components:
+            raise ValueError('No quality specified')
+        found_components = tuple(found_components.items())
+        _get_cache[quality_name] = found_components
     result = Quality()
-    for type, component in found_components.items():
+    for type, component in found_components:
         setattr(result, type, component)
     return result
 
@@ -352,6 +401,13 @@ class RequirementComponent(object):
         self.acceptable = set()
         self.none_of = set()
 
+    def update(self, other):
+        """Copies the requirements of `other` into this component."""
+        self.min = other.min
+        self.max = other.max
+        self.acceptable = set(other.acceptable)
+        self.none_of = set(other.none_of)
+
     def allows(self, comp, loose=False):
         if comp.type != self.type:
             raise TypeError('Cannot compare %r against %s' % (comp, self.type))
@@ -420,7 +476,18 @@ class Requirements(object):
         self.codec = RequirementComponent('codec')
         self.audio = RequirementComponent('audio')
         if req:
-            self.parse_requirements(req)
+            cached = _requirements_cache.get(req)
+            if cached is None:
+                self.parse_requirements(req)
+                cached = Requirements()
+                cached.text = self.text
+                for component, parsed in zip(cached.components, self.components):
+                    component.update(parsed)
+                _requirements_cache[req] = cached
+            else:
+                self.text = cached.text
+                for component, parsed in zip(self.components, cached.components):
+                    component.update(parsed)
 
     @property
     def components(self):
@@ -4,6 +4,7 @@ from future.moves.urllib.request import urlopen
 from future.moves.urllib.parse import urlparse
 from future.utils import text_to_native_str
 
+import threading
 import time
 import logging
 from datetime import timedelta, datetime
@@ -12,8 +13,13 @@ import requests
 # Allow some request objects to be imported from here instead of requests
 import warnings
 from requests import RequestException
+from requests.adapters import HTTPAdapter
+from requests.utils import select_proxy
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from requests.packages.urllib3.poolmanager import PoolManager
 
-from flexget import __version__ as version
+from flexget import __version__ as version, config_schema
+from flexget.event import event
 from flexget.utils.tools import parse_timedelta, TimedDict, timedelta_total_seconds
 
 # If we use just 'requests' here, we'll get the logger created by requests, rather than our own
@@ -30,6 +36,148 @@ WAIT_TIME = timedelta(seconds=60)
 unresponsive_hosts = TimedDict(WAIT_TIME)
 
 
+# Connection pool defaults, can be changed with the `http_pool` config key
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+# How many hosts connections are kept open to at a time
+MAX_POOLED_HOSTS = 100
+
+
+class HTTPStats(object):
+    """Thread safe counters of requests, new connections and limiter waits per domain."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domains = {}
+        self._local = threading.local()
+
+    def add(self, domain, counter, amount=1):
+        if counter == 'requests':
+            self._local.requests = getattr(self._local, 'requests', 0) + amount
+        with self._lock:
+            counters = self._domains.get(domain)
+            if counters is None:
+                counters = self._domains[domain] = {'requests': 0, 'connections': 0, 'waits': 0, 'wait_time': 0.0}
+            counters[counter] += amount
+
+    def snapshot(self):
+        """
+        :return: Dict of counters per domain, with the ratio of requests which reused an open connection added.
+        """
+        with self._lock:
+            domains = dict((domain, dict(counters)) for domain, counters in self._domains.items())
+        for counters in domains.values():
+            reused = max(counters['requests'] - counters['connections'], 0)
+            counters['reuse_ratio'] = reused / counters['requests'] if counters['requests'] else 0.0
+        return domains
+
+    def thread_requests(self):
+        """
+        :return: Number of requests sent from the calling thread since it started.
+        """
+        return getattr(self._local, 'requests', 0)
+
+    def clear(self):
+        with self._lock:
+            self._domains.clear()
+
+
+http_stats = HTTPStats()
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        http_stats.add(self.host, 'connections')
+        return super(CountingHTTPConnectionPool, self)._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        http_stats.add(self.host, 'connections')
+        return super(CountingHTTPSConnectionPool, self)._new_conn()
+
+
+# Keep-alive connections are pooled per host, and the pools are shared by all sessions in the process
+pool_manager = PoolManager(num_pools=MAX_POOLED_HOSTS, maxsize=DEFAULT_MAX_CONNECTIONS_PER_HOST)
+pool_manager.pool_classes_by_scheme = {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+
+def configure_pool(max_connections_per_host=DEFAULT_MAX_CONNECTIONS_PER_HOST, block=False):
+    """
+    Changes the settings of the shared connection pools. Open connections are dropped if the settings change.
+
+    :param int max_connections_per_host: How many connections are kept open to a single host.
+    :param bool block: If True, requests wait for a free connection once a host has `max_connections_per_host`
+        connections in use, instead of opening extra connections which are not kept open.
+    """
+    settings = {'maxsize': max_connections_per_host, 'block': block}
+    if all(pool_manager.connection_pool_kw.get(key) == value for key, value in settings.items()):
+        return
+    log.debug('Changing http connection pool settings to %s', settings)
+    pool_manager.connection_pool_kw.update(settings)
+    pool_manager.clear()
+
+
+class TLSSettings(object):
+    """Receives the TLS settings `HTTPAdapter.cert_verify` would set on a connection pool."""
+
+    def __init__(self):
+        self.cert_reqs = None
+        self.ca_certs = None
+        self.ca_cert_dir = None
+        self.cert_file = None
+        self.key_file = None
+
+
+class SharedPoolAdapter(HTTPAdapter):
+    """
+    HTTPAdapter which uses the process wide `pool_manager`, so connections are reused across sessions, tasks and
+    daemon runs. Requests are counted in `http_stats`.
+
+    Pools are shared only between requests with the same TLS settings (certificate verification, CA bundle and client
+    certificate), so a session which does not verify certificates never changes the pools of the ones that do.
+    """
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = pool_manager
+        # The verify and cert arguments of the request being sent by each thread, get_connection does not get them
+        self._sending = threading.local()
+
+    def connection_for(self, url, verify=True, cert=None):
+        """
+        :return: The shared connection pool for `url` and the given TLS settings, which are the `verify` and `cert`
+            arguments of requests.
+        """
+        url = urlparse(url).geturl()
+        if not url.lower().startswith('https'):
+            return self.poolmanager.connection_from_url(url)
+        settings = TLSSettings()
+        self.cert_verify(settings, url, verify, cert)
+        return self.poolmanager.connection_from_url(url, pool_kwargs=vars(settings))
+
+    def get_connection(self, url, proxies=None):
+        if select_proxy(url, proxies):
+            # Proxy pools belong to this adapter only
+            return super(SharedPoolAdapter, self).get_connection(url, proxies)
+        verify, cert = getattr(self._sending, 'tls', (True, None))
+        return self.connection_for(url, verify, cert)
+
+    def send(self, request, **kwargs):
+        http_stats.add(urlparse(request.url).hostname, 'requests')
+        self._sending.tls = (kwargs.get('verify', True), kwargs.get('cert'))
+        try:
+            return super(SharedPoolAdapter, self).send(request, **kwargs)
+        finally:
+            del self._sending.tls
+
+    def close(self):
+        # The shared pools outlive the session, only close the proxy pools of this adapter
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
 def is_unresponsive(url):
     """
     Checks if host of given url has timed out within WAIT_TIME
@@ -73,6 +221,8 @@ class TokenBucketLimiter(DomainLimiter):
     # This is just an in memory cache right now, it works for the daemon, and across tasks in a single execution
     # but not for multiple executions via cron. Do we need to store this to db?
     state_cache = {}
+    # Requests to the same domain may be done from several threads, only one of them may take a token at a time
+    lock_cache = {}
 
     def __init__(self, domain, tokens, rate, wait=True):
         """
@@ -86,6 +236,7 @@ class TokenBucketLimiter(DomainLimiter):
         self.wait = wait
         # Restore previous state for this domain, or establish new state cache
         self.state = self.state_cache.setdefault(domain, {'tokens': self.max_tokens, 'last_update': datetime.now()})
+        self.lock = self.lock_cache.setdefault(domain, threading.Lock())
 
     @property
     def tokens(self):
@@ -104,24 +255,39 @@ class TokenBucketLimiter(DomainLimiter):
         self.state['last_update'] = value
 
     def __call__(self):
+        with self.lock:
+            wait = self._reserve_token()
+        if wait <= 0:
+            return
+        # Don't spam console if wait is low
+        if wait < 4:
+            level = log.debug
+        else:
+            level = log.verbose
+        level('Waiting %.2f seconds until next request to %s', wait, self.domain)
+        # Sleep until it is time for the next request, other threads can queue up behind us meanwhile
+        time.sleep(wait)
+        http_stats.add(self.domain, 'waits')
+        http_stats.add(self.domain, 'wait_time', wait)
+
+    def _reserve_token(self):
+        """
+        Takes a token from the bucket, which may leave it in debt.
+
+        :return: Seconds the caller has to wait before it is allowed to do the request.
+        """
         if self.tokens < self.max_tokens:
             regen = (timedelta_total_seconds(datetime.now() - self.last_update) /
                      timedelta_total_seconds(self.rate))
             self.tokens += regen
         self.last_update = datetime.now()
+        wait = 0
         if self.tokens < 1:
             if not self.wait:
                 raise RequestException('Requests to %s have exceeded their limit.' % self.domain)
             wait = timedelta_total_seconds(self.rate) * (1 - self.tokens)
-            # Don't spam console if wait is low
-            if wait < 4:
-                level = log.debug
-            else:
-                level = log.verbose
-            level('Waiting %.2f seconds until next request to %s', wait, self.domain)
-            # Sleep until it is time for the next request
-            time.sleep(wait)
         self.tokens -= 1
+        return wait
 
 
 class TimedLimiter(TokenBucketLimiter):
@@ -177,6 +343,8 @@ class Session(requests.Session):
     def __init__(self, timeout=30, max_retries=1, *args, **kwargs):
         """Set some defaults for our session if not explicitly defined."""
         super(Session, self).__init__(*args, **kwargs)
+        self.mount('https://', SharedPoolAdapter())
+        self.mount('http://', SharedPoolAdapter())
         self.timeout = timeout
         self.stream = True
         self.adapters['http://'].max_retries = max_retries
@@ -284,3 +452,21 @@ def post(url, data=None, **kwargs):
     :param kwargs: Optional arguments that ``request`` takes.
     """
     return request('post', url, data=data, **kwargs)
+
+
+@event('config.register')
+def register_config():
+    config_schema.register_config_key('http_pool', {
+        'type': 'object',
+        'properties': {
+            'max_connections_per_host': {'type': 'integer', 'minimum': 1},
+            'block': {'type': 'boolean'}
+        },
+        'additionalProperties': False,
+        'description': 'Settings for the connection pools shared by all http requests.'
+    })
+
+
+@event('manager.config_updated')
+def apply_pool_config(manager):
+    configure_pool(**manager.config.get('http_pool', {}))
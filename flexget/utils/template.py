@@ -8,23 +8,32 @@ import logging
 import os
 import re
 import locale
-from copy import copy
+import sys
+from collections import Mapping
 from datetime import datetime, date, time
 
 import jinja2.filters
 from jinja2 import (Environment, StrictUndefined, ChoiceLoader, FileSystemLoader, PackageLoader, Template,
-                    TemplateNotFound, TemplateSyntaxError)
+                    TemplateNotFound, TemplateSyntaxError, Undefined)
+from jinja2.runtime import new_context
+from jinja2.utils import concat
 from dateutil import parser as dateutil_parse
 
 from flexget.event import event
-from flexget.utils.lazy_dict import LazyDict
+from flexget.utils.lazy_dict import LazyDict, LazyLookup
 from flexget.utils.pathscrub import pathscrub
+from flexget.utils.tools import LRUCache
 
 log = logging.getLogger('utils.template')
 
 # The environment will be created after the manager has started
 environment = None
 
+#: Compiled templates by source string, shared by all tasks
+template_cache = LRUCache(max_size=1000)
+#: Compiled expressions by source string, shared by all tasks
+expression_cache = LRUCache(max_size=1000)
+
 
 class RenderError(Exception):
     """Error raised when there is a problem with jinja rendering."""
@@ -129,15 +138,65 @@ def filter_default(value, default_value='', boolean=True):
 filter_d = filter_default
 
 
+class RenderContext(Mapping):
+    """
+    Read only view over several mappings, used as template context without copying them.
+
+    Keys are looked up in each of the mappings in order. Lazy fields are only evaluated when a template uses them.
+    """
+    __slots__ = ('maps',)
+
+    def __init__(self, *maps):
+        self.maps = maps
+
+    def __getitem__(self, key):
+        for mapping in self.maps:
+            if key in mapping:
+                item = mapping[key]
+                if isinstance(item, LazyLookup):
+                    return item[key]
+                return item
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in mapping for mapping in self.maps)
+
+    def __iter__(self):
+        seen = set()
+        for mapping in self.maps:
+            for key in mapping:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return len(set().union(*self.maps))
+
+    def __repr__(self):
+        return '<RenderContext(%s)>' % ', '.join(repr(mapping) for mapping in self.maps)
+
+
 # TODO: In Jinja 2.8 we will be able to override the Context class to be used explicitly
 class FlexGetTemplate(Template):
     """Adds lazy lookup support when rendering templates."""
 
     def new_context(self, vars=None, shared=False, locals=None):
+        if isinstance(vars, RenderContext):
+            # Used as the context directly, the template globals are looked up last
+            return new_context(self.environment, self.name, self.blocks, RenderContext(*(vars.maps + (self.globals,))),
+                               True, None, locals)
         context = super(FlexGetTemplate, self).new_context(vars, shared, locals)
         context.parent = LazyDict(context.parent)
         return context
 
+    def render_context(self, context):
+        """Like :meth:`render`, but takes a :class:`RenderContext` and does not copy it."""
+        try:
+            return concat(self.root_render_func(self.new_context(context)))
+        except Exception:
+            exc_info = sys.exc_info()
+        return self.environment.handle_exception(exc_info, True)
+
 
 @event('manager.initialize')
 def make_environment(manager):
@@ -151,6 +210,15 @@ def make_environment(manager):
     for name, filt in list(globals().items()):
         if name.startswith('filter_'):
             environment.filters[name.split('_', 1)[1]] = filt
+    # Templates compiled by a previous environment would keep using it
+    template_cache.clear()
+    expression_cache.clear()
+
+
+@event('manager.execute.completed')
+def log_cache_stats(manager, options):
+    log.debug('Template cache: %s', template_cache.stats())
+    log.debug('Expression cache: %s', expression_cache.stats())
 
 
 def list_templates(extensions=None):
@@ -193,21 +261,41 @@ def get_template(template_name, scope='task'):
         raise ValueError(err)
 
 
+def compile_template(source):
+    """
+    Returns the compiled Template for template string `source`, compiling it only if it is not in the cache yet.
+
+    :raises RenderError: If `source` is not a valid template.
+    """
+    try:
+        return template_cache[source]
+    except KeyError:
+        pass
+    try:
+        template = environment.from_string(source)
+    except TemplateSyntaxError as e:
+        raise RenderError('Error in template syntax: ' + e.message)
+    template_cache[source] = template
+    return template
+
+
 def render(template, context):
     """
     Renders a Template with `context` as its context.
 
     :param template: Template or template string to render.
-    :param context: Context to render the template from.
+    :param context: Context to render the template from. Can be a :class:`RenderContext`.
     :return: The rendered template text.
     """
     if isinstance(template, basestring):
-        try:
-            template = environment.from_string(template)
-        except TemplateSyntaxError as e:
-            raise RenderError('Error in template syntax: ' + e.message)
+        template = compile_template(template)
     try:
-        result = template.render(context)
+        if not isinstance(context, RenderContext):
+            result = template.render(context)
+        elif isinstance(template, FlexGetTemplate):
+            result = template.render_context(context)
+        else:
+            result = template.render(dict((key, context[key]) for key in context))
     except Exception as e:
         error = RenderError('(%s) %s' % (type(e).__name__, e))
         log.debug('Error during rendering: %s', error)
@@ -219,17 +307,16 @@ def render(template, context):
 def render_from_entry(template_string, entry):
     """Renders a Template or template string with an Entry as its context."""
 
-    # Make a copy of the Entry so we can add some more fields
-    variables = copy(entry.store)
-    variables['now'] = datetime.now()
+    # The entry is not copied, the extra fields are looked up from separate dicts
+    variables = {'now': datetime.now()}
+    defaults = {}
     # Add task name to variables, usually it's there because metainfo_task plugin, but not always
     if hasattr(entry, 'task') and entry.task is not None:
-        if 'task' not in variables:
-            variables['task'] = entry.task.name
+        defaults['task'] = entry.task.name
         # Since `task` has different meaning between entry and task scope, the `task_name` field is create to be
         # consistent
         variables['task_name'] = entry.task.name
-    return render(template_string, variables)
+    return render(template_string, RenderContext(variables, entry.store, defaults))
 
 
 def render_from_task(template, task):
@@ -244,14 +331,36 @@ def render_from_task(template, task):
     return render(template, variables)
 
 
+def compile_expression(expression):
+    """
+    Returns the compiled jinja `expression`, compiling it only if it is not in the cache yet.
+
+    :raises TemplateSyntaxError: If `expression` is not a valid expression.
+    """
+    try:
+        return expression_cache[expression]
+    except KeyError:
+        pass
+    compiled_expr = environment.compile_expression(expression)
+    expression_cache[expression] = compiled_expr
+    return compiled_expr
+
+
 def evaluate_expression(expression, context):
     """
     Evaluate a jinja `expression` using a given `context` with support for `LazyDict`s (`Entry`s.)
 
-    :param str expression:  A jinja expression to evaluate
-    :param context: dictlike, supporting LazyDicts
+    :param expression: A jinja expression to evaluate, or one returned by :func:`compile_expression`
+    :param context: dictlike, supporting LazyDicts. A :class:`RenderContext` is used without copying it.
     """
-    compiled_expr = environment.compile_expression(expression)
+    compiled_expr = compile_expression(expression) if isinstance(expression, basestring) else expression
+    if isinstance(context, RenderContext):
+        # Calling the expression would copy the context into a new dict, do what it does without that
+        template_context = compiled_expr._template.new_context(context)
+        for _ in compiled_expr._template.root_render_func(template_context):
+            pass
+        result = template_context.vars['result']
+        return None if isinstance(result, Undefined) else result
     # If we have a LazyDict, grab the underlying store. Our environment supports LazyFields directly
     if isinstance(context, LazyDict):
         context = context.store
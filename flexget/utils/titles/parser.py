@@ -3,6 +3,11 @@ from builtins import *  # noqa pylint: disable=unused-import, redefined-builtin
 
 import re
 
+from flexget.utils.tools import LRUCache
+
+# Compiled ireplace patterns, keyed on (word, not_in_word)
+_replace_patterns = LRUCache(max_size=1000)
+
 
 class TitleParser(object):
     propers = ['proper', 'repack', 'rerip', 'real', 'final']
@@ -43,8 +48,11 @@ class TitleParser(object):
     @staticmethod
     def ireplace(data, old, new, count=0, not_in_word=False):
         """Case insensitive string replace"""
-        old = re.escape(old)
-        if not_in_word:
-            old = TitleParser.re_not_in_word(old)
-        pattern = re.compile(old, re.I)
-        return re.sub(pattern, new, data, count)
+        try:
+            pattern = _replace_patterns[(old, not_in_word)]
+        except KeyError:
+            regexp = re.escape(old)
+            if not_in_word:
+                regexp = TitleParser.re_not_in_word(regexp)
+            pattern = _replace_patterns[(old, not_in_word)] = re.compile(regexp, re.I)
+        return pattern.sub(new, data, count)
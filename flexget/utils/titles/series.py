@@ -13,7 +13,7 @@ from flexget.utils.titles.parser import TitleParser
 from flexget.plugins.parsers import ParseWarning
 from flexget.plugins.parsers.parser_common import default_ignore_prefixes, name_to_re
 from flexget.utils import qualities
-from flexget.utils.tools import ReList
+from flexget.utils.tools import ReList, LRUCache
 
 log = logging.getLogger('seriesparser')
 
@@ -24,6 +24,59 @@ log.setLevel(logging.INFO)
 ID_TYPES = ['ep', 'date', 'sequence', 'id']  # may also be 'special'
 
 
+def _pattern(regexp):
+    return getattr(regexp, 'pattern', regexp)
+
+
+class SeriesParserProfile(object):
+    """
+    The compiled name and identifier regexps for one series configuration.
+
+    Profiles are never modified after creation, so a single one is shared by all :class:`SeriesParser` instances (in
+    any thread) with the same configuration. Use :meth:`get` to obtain them.
+    """
+
+    _cache = LRUCache(max_size=5000)
+
+    def __init__(self, name, alternate_names, ignore_prefixes, name_regexps, custom_regexps):
+        # Set by name_to_re when the name ends with a parenthetical
+        self.strict_name = False
+        self.re_from_name = not name_regexps and bool(name)
+        if self.re_from_name:
+            name_regexps = [name_to_re(n, ignore_prefixes, self) for n in [name] + alternate_names]
+        self.name_regexps = ReList(name_regexps)
+        # Compile everything now, so the lists are never modified while they are shared
+        list(self.name_regexps)
+        self.id_regexps = {}
+        for mode in ID_TYPES:
+            if custom_regexps.get(mode):
+                regexps = ReList(custom_regexps[mode] + getattr(SeriesParser, mode + '_regexps'))
+                list(regexps)
+                self.id_regexps[mode] = regexps
+
+    @classmethod
+    def get(cls, name=None, alternate_names=None, ignore_prefixes=None, name_regexps=None, **custom_regexps):
+        """
+        Get the profile for given configuration, compiling it only if it's not already cached.
+
+        :param name: Series name, name regexps are generated from it if no `name_regexps` are given.
+        :param alternate_names: Other names for the series.
+        :param ignore_prefixes: Prefixes allowed before the name in generated regexps.
+        :param name_regexps: Custom name regexps.
+        :param custom_regexps: Custom identifier regexps given as `<id type>=[regexps]`, eg. ep=['...'].
+        """
+        alternate_names = list(alternate_names or [])
+        ignore_prefixes = list(ignore_prefixes or default_ignore_prefixes)
+        name_regexps = list(name_regexps or [])
+        key = (name, tuple(alternate_names), tuple(ignore_prefixes), tuple(_pattern(r) for r in name_regexps),
+               tuple((mode, tuple(_pattern(r) for r in custom_regexps.get(mode) or [])) for mode in ID_TYPES))
+        try:
+            return cls._cache[key]
+        except KeyError:
+            profile = cls._cache[key] = cls(name, alternate_names, ignore_prefixes, name_regexps, custom_regexps)
+            return profile
+
+
 class SeriesParser(TitleParser):
     """
     Parse series.
@@ -113,17 +166,17 @@ class SeriesParser(TitleParser):
         self.identified_by = identified_by
         # Stores the type of identifier found, 'ep', 'date', 'sequence' or 'special'
         self.id_type = None
-        self.name_regexps = ReList(name_regexps or [])
-        self.re_from_name = False
-        # If custom identifier regexps were provided, prepend them to the appropriate type of built in regexps
-        for mode in ID_TYPES:
-            listname = mode + '_regexps'
-            if locals()[listname]:
-                setattr(self, listname, ReList(locals()[listname] + getattr(SeriesParser, listname)))
+        # If custom identifier regexps were provided, they are prepended to the appropriate type of built in regexps
+        profile = SeriesParserProfile.get(name, self.alternate_names, self.ignore_prefixes, name_regexps,
+                                          ep=ep_regexps, date=date_regexps, sequence=sequence_regexps, id=id_regexps)
+        self.name_regexps = profile.name_regexps
+        self.re_from_name = profile.re_from_name
+        for mode, regexps in profile.id_regexps.items():
+            setattr(self, mode + '_regexps', regexps)
         self.specials = self.specials + [i.lower() for i in (special_ids or [])]
         self.prefer_specials = prefer_specials
         self.assume_special = assume_special
-        self.strict_name = strict_name
+        self.strict_name = strict_name or profile.strict_name
         self.allow_groups = allow_groups or []
         self.allow_seasonless = allow_seasonless
         self.date_dayfirst = date_dayfirst
@@ -220,9 +273,10 @@ class SeriesParser(TitleParser):
 
         # regexp name matching
         if not self.name_regexps:
-            # if we don't have name_regexps, generate one from the name
-            self.name_regexps = ReList(
-                name_to_re(name, self.ignore_prefixes, self) for name in [self.name] + self.alternate_names)
+            # if we don't have name_regexps (name was guessed), generate one from the name
+            profile = SeriesParserProfile.get(self.name, self.alternate_names, self.ignore_prefixes)
+            self.name_regexps = profile.name_regexps
+            self.strict_name = self.strict_name or profile.strict_name
             # With auto regex generation, the first regex group captures the name
             self.re_from_name = True
         # try all specified regexps on this data
@@ -6,6 +6,7 @@ from future.utils import PY2
 
 import logging
 import ast
+import bisect
 import copy
 import hashlib
 import locale
@@ -13,7 +14,8 @@ import operator
 import os
 import re
 import sys
-from collections import MutableMapping, defaultdict
+import threading
+from collections import MutableMapping, OrderedDict, defaultdict
 from datetime import timedelta, datetime
 from pprint import pformat
 
@@ -381,6 +383,140 @@ class TimedDict(MutableMapping):
             self.__class__.__name__, dict(list(zip(self._store, (v[1] for v in list(self._store.values()))))))
 
 
+class LRUCache(MutableMapping):
+    """
+    Acts like a normal dict, but only keeps the `max_size` most recently used keys. Safe to share between threads.
+
+    Lookups are counted in :attr:`hits` and :attr:`misses`, membership tests are not.
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._store.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            # Move to the most recently used end
+            self._store[key] = value
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._store.pop(key, None)
+            self._store[key] = value
+            while len(self._store) > self.max_size:
+                self._store.popitem(last=False)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._store[key]
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def __iter__(self):
+        return iter(list(self._store))
+
+    def __len__(self):
+        return len(self._store)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Returns a dict with current size and hit/miss counts of the cache."""
+        return {'size': len(self), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+    def __repr__(self):
+        return '%s(max_size=%s, size=%s, hits=%s, misses=%s)' % (
+            self.__class__.__name__, self.max_size, len(self), self.hits, self.misses)
+
+
+class LatencyHistogram(object):
+    """
+    Counts durations in seconds into buckets with fixed upper bounds. Safe to share between threads.
+
+    The last bucket counts everything above the largest bound.
+    """
+
+    DEFAULT_BOUNDS = (0.5, 1, 2, 5, 10, 30, 60, 300)
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self._lock = threading.Lock()
+        self.clear()
+
+    def add(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def add_counts(self, counts, total=0.0, maximum=0.0):
+        """Adds the bucket `counts` of another histogram with the same bounds."""
+        with self._lock:
+            for index, count in enumerate(counts):
+                self._counts[index] += count
+                self.count += count
+            self.total += total
+            self.max = max(self.max, maximum)
+
+    @property
+    def counts(self):
+        with self._lock:
+            return list(self._counts)
+
+    def percentile(self, percent):
+        """
+        Returns an estimate of the duration below which `percent` of the durations fall: the upper bound of the bucket
+        it falls in, limited to the longest duration seen.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            count, maximum = self.count, self.max
+        if not count:
+            return 0.0
+        wanted = count * percent / 100.0
+        seen = 0
+        for bound, bucket in zip(self.bounds, counts):
+            seen += bucket
+            if seen >= wanted:
+                return min(bound, maximum)
+        return maximum
+
+    def clear(self):
+        with self._lock:
+            self._counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def to_dict(self):
+        """Returns a dict with count, mean and max of the durations, and a list of buckets with their counts."""
+        with self._lock:
+            counts = list(self._counts)
+            result = {'count': self.count, 'mean': self.total / self.count if self.count else 0.0, 'max': self.max}
+        bounds = list(self.bounds) + [None]
+        result['buckets'] = [{'le': bound, 'count': count} for bound, count in zip(bounds, counts)]
+        return result
+
+    def __repr__(self):
+        return '%s(count=%s, max=%.2f)' % (self.__class__.__name__, self.count, self.max)
+
+
 class BufferQueue(queue.Queue):
     """Used in place of a file-like object to capture text and access it safely from another thread."""
     # Allow access to the Empty error from here